@@ -9,10 +9,18 @@ Usage:
     python run.py eval claude-sonnet-4                # Eval a model (with LLM judge scoring)
     python run.py eval claude-sonnet-4 --ids C01 L02  # Specific prompts
     python run.py eval claude-sonnet-4 --category coding --difficulty hard
+    python run.py eval claude-sonnet-4 --concurrency 8  # Keep 8 prompts in flight
+    python run.py eval claude-sonnet-4 --runs 5       # 5 samples per prompt (variance)
+    python run.py eval claude-sonnet-4 --batch        # Generate and judge via provider batch jobs
+
+    python run.py sweep gpt-4o 'claude-*'             # Eval many models in one scheduled pass
+
+    python run.py loadtest gpt-4o --levels 1 4 16     # Latency/throughput under concurrency
 
     python run.py rejudge                              # Rejudge all models with current judge
     python run.py rejudge gpt-4o                      # Rejudge one model
     python run.py rejudge --force                     # Rejudge even if already scored
+    python run.py rejudge --batch                     # Submit all pending judging as batch jobs
 
     python run.py deepeval                             # Score all models with DeepEval metrics
     python run.py deepeval gpt-4o                     # Score one model
@@ -28,6 +36,7 @@ Usage:
 """
 
 import argparse
+import fnmatch
 import json
 import os
 import sys
@@ -35,19 +44,30 @@ import time
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import yaml
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from scripts.providers import get_provider, sanitize_error
+from scripts import batch, builder, journal, loadtest
+from scripts.cache import CachingProvider, get_response_cache, get_verdict_store
+from scripts.providers import STREAM_TIMING_FIELDS, configure_http, get_provider, sanitize_error
+from scripts.store import export_json, get_results_store, import_json
+from scripts.ratelimit import RateLimitedProvider, endpoint_concurrency, endpoint_key, get_rate_limiter
+from scripts.retry import RetryingProvider, RetryPolicy
 from scripts.checks import check_response
-from scripts.judge import judge_response
+from scripts.judge import aggregate_judge_scores, judge_all
+from scripts.pipeline import Pipeline, Stage
+from scripts.scheduler import Scheduler
+from scripts.snapshot import LatestRuns, masked_mean
 from scripts.dashboard import generate_dashboard
 
 
 RESULTS_DIR = "results"
 EVAL_FILE = "evals/general.json"
+# SQLite ResultsStore when config results.backend is "sqlite"; None means JSON files
+RESULTS_STORE = None
 
 
 # ── Data layer ──
@@ -56,40 +76,73 @@ def model_path(model_name: str) -> str:
     return os.path.join(RESULTS_DIR, f"{model_name}.json")
 
 
+def use_results_backend(config: dict):
+    """Point the data layer at the backend named by config results.backend (json or sqlite)."""
+    global RESULTS_STORE
+    rcfg = config.get("results") or {}
+    if rcfg.get("backend", "json") == "sqlite":
+        RESULTS_STORE = get_results_store(rcfg.get("path", os.path.join(RESULTS_DIR, "results.sqlite")))
+    else:
+        RESULTS_STORE = None
+
+
 def load_model_results(model_name: str) -> dict:
-    path = model_path(model_name)
-    if Path(path).exists():
-        with open(path) as f:
-            return json.load(f)
-    return {
+    """The model's results snapshot with any un-compacted journal entries replayed."""
+    default = {
         "model_name": model_name,
         "created": datetime.now().isoformat(),
         "runs": {},
     }
+    if RESULTS_STORE:
+        return RESULTS_STORE.load_model(model_name) or default
+    return journal.load(model_path(model_name), default=default)
 
 
 def save_model_results(model_name: str, data: dict):
-    os.makedirs(RESULTS_DIR, exist_ok=True)
+    """Rewrite the whole snapshot (folding in and removing the journal)."""
     data["updated"] = datetime.now().isoformat()
-    target = model_path(model_name)
-    tmp = target + ".tmp"
-    try:
-        with open(tmp, "w") as f:
-            json.dump(data, f, indent=2)
-        # Validate before replacing
-        with open(tmp) as f:
-            json.load(f)
-        os.replace(tmp, target)
-    except Exception:
-        if os.path.exists(tmp):
-            os.remove(tmp)
-        raise
+    if RESULTS_STORE:
+        RESULTS_STORE.save_model(model_name, data)
+        return
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    journal.write_snapshot(model_path(model_name), data)
+
+
+def append_model_runs(model_name: str, unsaved: list):
+    """Checkpoint (pid, entry) pairs as journal appends, removing each from unsaved once durable.
+
+    Compacts the journal into the snapshot once it passes journal.COMPACT_BYTES.
+    On failure the remaining pairs stay in unsaved for the next attempt.
+    With the SQLite backend all pairs go in as one transaction instead.
+    """
+    if RESULTS_STORE:
+        RESULTS_STORE.append_runs(model_name, unsaved)
+        unsaved.clear()
+        return
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    size = 0
+    while unsaved:
+        pid, entry = unsaved[0]
+        size = journal.append_run(model_path(model_name), pid, entry)
+        unsaved.pop(0)
+    if size > journal.COMPACT_BYTES:
+        journal.compact(model_path(model_name))
+
+
+def compact_model_results(model_name: str):
+    """Fold the model's run journal back into its snapshot, if it has one."""
+    if not RESULTS_STORE:
+        journal.compact(model_path(model_name))
 
 
 def list_evaluated_models() -> list[str]:
+    if RESULTS_STORE:
+        return RESULTS_STORE.list_models()
     if not Path(RESULTS_DIR).exists():
         return []
-    return sorted(Path(f).stem for f in Path(RESULTS_DIR).glob("*.json") if f.stem != "comparison")
+    stems = {f.stem for f in Path(RESULTS_DIR).glob("*.json") if f.stem != "comparison"}
+    stems |= {f.stem for f in Path(RESULTS_DIR).glob("*" + journal.JOURNAL_SUFFIX)}
+    return sorted(stems)
 
 
 def load_eval(eval_file: str = None) -> list[dict]:
@@ -149,7 +202,10 @@ def load_config(path: str = "config.yaml") -> dict:
         print("Copy config.example.yaml to config.yaml and add your API keys.")
         sys.exit(1)
     with open(path) as f:
-        return yaml.safe_load(f)
+        config = yaml.safe_load(f)
+    use_results_backend(config)
+    configure_http(config.get("http"))
+    return config
 
 
 def filter_prompts(prompts, ids=None, categories=None, difficulty=None):
@@ -170,10 +226,273 @@ def latest_run(model_data: dict, pid: str) -> dict:
     return runs[-1] if runs else {}
 
 
+def stream_default(model_cfg: dict, config: dict) -> dict:
+    """model_cfg with eval.stream (or --stream) applied unless it sets `stream` itself."""
+    if "stream" not in model_cfg and config.get("eval", {}).get("stream"):
+        return {**model_cfg, "stream": True}
+    return model_cfg
+
+
+def build_provider(model_cfg: dict, config: dict):
+    """get_provider() wrapped with the endpoint's shared rate limiter and retries.
+
+    Retries sit outside the limiter so every attempt books its own capacity,
+    and throttles seen by the retry layer slow the shared limiter down. The
+    optional response cache (cache.enabled or --cache) sits outermost.
+    """
+    provider = get_provider(stream_default(model_cfg, config))
+    limiter = get_rate_limiter(model_cfg, config)
+    if limiter:
+        provider = RateLimitedProvider(provider, limiter)
+    provider = RetryingProvider(provider, RetryPolicy.from_config(config), limiter)
+    # Cache hits skip the limiter and retries entirely
+    cache = get_response_cache(config)
+    if cache is not None:
+        provider = CachingProvider(provider, cache, model_cfg, sampled=config["cache"].get("sampled", False))
+    return provider
+
+
+def pace_deepeval(config: dict, requests: int | None = None):
+    """Book one request per G-Eval metric on the evaluator's (first judge's) endpoint limiter.
+
+    requests overrides the metric count, e.g. when some verdicts are cached.
+    """
+    from scripts.deepeval_scorer import DEFAULT_METRICS
+    judges = config.get("judges", [])
+    mcfg = config.get("models", {}).get(judges[0].get("model")) if judges else None
+    limiter = get_rate_limiter(mcfg, config) if mcfg else None
+    if limiter:
+        limiter.wait(requests or len(config.get("deepeval", {}).get("metrics") or DEFAULT_METRICS))
+
+
 # ── eval command ──
 
+def eval_stages(provider, params: dict, model_cfg: dict, judge_providers: dict,
+                deepeval_config: dict | None, workers: dict, parallel_judges: bool = True,
+                verdicts=None, runs: int = 1) -> list[Stage]:
+    """Generation -> auto-check -> judge -> DeepEval stages for one model.
+
+    Jobs are dicts {"pmeta", "label"}; stages fill in "entries" (one run
+    entry per sample, runs per prompt) and buffer log "lines" so concurrent
+    prompts don't interleave their output. Provider errors become API_ERROR
+    entries that later stages pass through. With a verdict store, judges and
+    DeepEval reuse verdicts for unchanged responses.
+    """
+
+    def generate(job):
+        pmeta = job["pmeta"]
+        job["lines"] = []
+        t0 = time.time()
+        try:
+            if runs > 1:
+                samples = provider.complete_n(pmeta["prompt"], params, runs)
+            else:
+                samples = [provider.complete(pmeta["prompt"], params)]
+        except Exception as e:
+            job["entries"] = [{
+                "timestamp": datetime.now().isoformat(),
+                "api_model": model_cfg["model"],
+                "content": "",
+                "latency_s": round(time.time() - t0, 2),
+                "error": sanitize_error(str(e)),
+                "auto_checks": {"flags": ["API_ERROR"], "auto_scores": {}, "passed": False},
+                "judge_scores": {},
+                "judge_score_avg": None,
+                "judge_count": 0,
+            } for _ in range(runs)]
+            job["lines"].append(f"{_job_head(job)} ✗ Error: {sanitize_error(str(e))}")
+            return job
+        job["entries"] = []
+        for content, usage in samples:
+            entry = {
+                "timestamp": datetime.now().isoformat(),
+                "api_model": model_cfg["model"],
+                "content": content,
+                "latency_s": round(time.time() - t0, 2),
+                "input_tokens": usage.get("input_tokens"),
+                "output_tokens": usage.get("output_tokens"),
+                "auto_checks": None,
+                "judge_scores": {},
+                "judge_score_avg": None,
+                "judge_count": 0,
+            }
+            for field in STREAM_TIMING_FIELDS:
+                if usage.get(field) is not None:
+                    entry[field] = usage[field]
+            if usage.get("cached"):
+                entry["cached"] = True
+            if usage.get("batch_id"):
+                entry["batch_id"] = usage["batch_id"]
+            job["entries"].append(entry)
+        if runs > 1:
+            for i, entry in enumerate(job["entries"]):
+                entry["sample"], entry["samples"] = i, runs
+        return job
+
+    def scored(job):
+        """(log prefix, entry) for each entry that got a response."""
+        many = len(job["entries"]) > 1
+        return [(f"  [{i + 1}/{len(job['entries'])}]" if many else "", entry)
+                for i, entry in enumerate(job["entries"]) if not entry.get("error")]
+
+    def check(job):
+        for tag, entry in scored(job):
+            try:
+                auto = entry["auto_checks"] = check_response(job["pmeta"], entry["content"])
+            except Exception as e:
+                # Recorded like a failed request, so one bad response can't stop the run
+                entry["error"] = sanitize_error(f"auto-check failed: {e}")
+                entry["auto_checks"] = {"flags": ["API_ERROR"], "auto_scores": {}, "passed": False}
+                job["lines"].append(f"{_job_head(job)}{tag} ✗ Error: {entry['error']}")
+                continue
+            flag_str = f" ⚠ {', '.join(auto['flags'])}" if auto["flags"] else ""
+            speed = f", TTFT {entry['ttft_s']:.2f}s" if entry.get("ttft_s") is not None else ""
+            if entry.get("tokens_per_s") is not None:
+                speed += f", {entry['tokens_per_s']:.0f} tok/s"
+            took = "batch" if entry.get("batch_id") else f"{entry['latency_s']:.1f}s"
+            job["lines"].append(f"{_job_head(job)}{tag} ✓ {took}, {entry.get('output_tokens') or '?'} tok{speed}{flag_str}")
+        return job
+
+    def judge(job):
+        for tag, entry in scored(job):
+            entry["judge_scores"].update(judge_all(judge_providers, job["pmeta"], entry["content"],
+                                                   entry["auto_checks"], parallel=parallel_judges,
+                                                   verdicts=verdicts))
+            for jname, js in entry["judge_scores"].items():
+                score_str = f"{js['score']}/5" if js["score"] else "failed"
+                job["lines"].append(f"   {tag} Judge ({jname}): {score_str}")
+            entry["judge_score_avg"], entry["judge_count"] = aggregate_judge_scores(entry["judge_scores"])
+        return job
+
+    def deepeval(job):
+        for tag, entry in scored(job):
+            try:
+                from scripts.deepeval_scorer import score_with_deepeval
+                de = score_with_deepeval(job["pmeta"], entry["content"], deepeval_config, verdicts=verdicts,
+                                         pace=lambda n: pace_deepeval(deepeval_config, n))
+                entry["deepeval_scores"] = de["deepeval_scores"]
+                entry["deepeval_avg"] = de["deepeval_avg"]
+                if de["deepeval_avg"] is not None:
+                    job["lines"].append(f"   {tag} DeepEval: {de['deepeval_avg']:.2f} ({', '.join(f'{k}={v:.2f}' for k, v in de['deepeval_scores'].items() if v is not None)})")
+                else:
+                    job["lines"].append(f"   {tag} DeepEval: failed")
+            except Exception as e2:
+                job["lines"].append(f"   {tag} DeepEval error: {e2}")
+        return job
+
+    stages = [Stage("generate", generate, workers["generate"]), Stage("check", check, 1)]
+    if judge_providers:
+        stages.append(Stage("judge", judge, workers["judge"]))
+    # DeepEval scoring (inline during eval if enabled and benchmark allows)
+    if deepeval_config is not None:
+        stages.append(Stage("deepeval", deepeval, workers["deepeval"]))
+    return stages
+
+
+def _job_head(job) -> str:
+    return f"  {job['label']} {job['pmeta']['id']} - {job['pmeta']['subcategory']}..."
+
+
+def stage_workers(config: dict, concurrency: int | None = None) -> dict:
+    """Worker counts per eval stage. Judge and DeepEval default to the generation concurrency."""
+    eval_cfg = config.get("eval", {})
+    gen = max(1, concurrency or eval_cfg.get("concurrency", 1))
+    return {
+        "generate": gen,
+        "judge": max(1, eval_cfg.get("judge_concurrency", gen)),
+        "deepeval": max(1, eval_cfg.get("deepeval_concurrency", gen)),
+    }
+
+
+def enable_stream_flag(config: dict, args) -> dict:
+    """--stream turns on streamed generation (with TTFT / tokens-per-second capture)."""
+    if getattr(args, "stream", False):
+        config["eval"] = {**(config.get("eval") or {}), "stream": True}
+    return config
+
+
+def runs_per_prompt(config: dict, args) -> int:
+    """Samples per prompt: --runs, else eval.runs_per_prompt (default 1)."""
+    return max(1, getattr(args, "runs", None) or config.get("eval", {}).get("runs_per_prompt", 1) or 1)
+
+
+def batch_wait(config: dict) -> dict:
+    """Polling settings for batch jobs from the batch: config section."""
+    bcfg = config.get("batch") or {}
+    return {
+        "poll_s": bcfg.get("poll_interval_s", batch.DEFAULT_POLL_S),
+        "timeout_s": bcfg.get("timeout_s", batch.DEFAULT_TIMEOUT_S),
+        "log": lambda msg: print(f"  {msg}"),
+    }
+
+
+def batch_eval_providers(provider, judge_providers: dict, prompts: list[dict], params: dict,
+                         runs: int, config: dict, verdicts=None):
+    """Run generation, then judging, as provider batch jobs; returns (provider, judges) replaying them.
+
+    Judge prompts depend only on a reply and its auto-checks, so they are
+    known as soon as the generation batch is back. The eval pipeline then
+    runs unchanged against the replays; only DeepEval and judges without a
+    batch API still call out live.
+    """
+    wait = batch_wait(config)
+    replay = batch.batch_generate(provider, prompts, params, runs, **wait)
+    items = []
+    for pmeta in prompts:
+        for content in replay.contents(pmeta["prompt"]):
+            try:
+                checks = check_response(pmeta, content)
+            except Exception:
+                # The pipeline's check stage records this reply as an error; it isn't judged
+                continue
+            items.append((pmeta, content, checks, list(judge_providers)))
+    return replay, batch.batch_judges(judge_providers, items, verdicts, **wait)
+
+
+def enable_cache_flag(config: dict, args) -> dict:
+    """--cache turns the response cache on for this invocation."""
+    if getattr(args, "cache", False):
+        config["cache"] = {**(config.get("cache") or {}), "enabled": True}
+    return config
+
+
+def refresh_dashboard(config: dict, args):
+    """Regenerate the dashboard after a command changed results.
+
+    dashboard.mode (or --no-dashboard / --defer-dashboard) picks how: "sync"
+    rebuilds now, "deferred" queues a debounced background rebuild so a
+    sweep of commands rebuilds once, and "off" skips it.
+    """
+    dcfg = config.get("dashboard") or {}
+    mode = dcfg.get("mode", "sync")
+    if getattr(args, "no_dashboard", False):
+        mode = "off"
+    elif getattr(args, "defer_dashboard", False):
+        mode = "deferred"
+
+    if mode == "off":
+        print("  Dashboard not regenerated (run: python run.py dashboard)")
+    elif mode == "deferred":
+        debounce = dcfg.get("debounce_s", builder.DEFAULT_DEBOUNCE_S)
+        if builder.notify(debounce, build=generate_dashboard) == "queued":
+            print(f"  Dashboard rebuild queued (runs after {debounce:g}s without further changes)")
+    else:
+        path = generate_dashboard()
+        if path:
+            print(f"  Dashboard updated: {path}")
+
+
+def finish_checkpoints(model_name: str, unsaved: list):
+    """Last-chance save of unsaved run entries, then compact the journal into the snapshot."""
+    try:
+        append_model_runs(model_name, unsaved)
+        compact_model_results(model_name)
+    except Exception as e:
+        print(f"  ⚠ Save failed: {e}")
+
+
 def cmd_eval(args):
-    config = load_config(args.config)
+    config = enable_stream_flag(enable_cache_flag(load_config(args.config), args), args)
     model_name = args.model
 
     models_cfg = config.get("models", {})
@@ -209,13 +528,14 @@ def cmd_eval(args):
             return
 
     try:
-        provider = get_provider(model_cfg)
+        provider = build_provider(model_cfg, config)
     except ValueError as e:
         print(f"Error: {e}")
         sys.exit(1)
 
     params = model_cfg.get("params", {})
-    delay = config.get("eval", {}).get("delay_between_calls", 1.0)
+    workers = stage_workers(config, getattr(args, "concurrency", None))
+    runs = runs_per_prompt(config, args)
 
     scoring_flags = benchmark_scoring_flags(config, benchmark)
     skip_judges = scoring_flags["skip_judges"]
@@ -233,8 +553,9 @@ def cmd_eval(args):
             print(f"  Skipping judge {jname} (cannot self-judge)")
             continue
         try:
-            jprov = get_provider(models_cfg[jname])
-            judge_providers[jname] = {"provider": jprov, "params": jcfg.get("params", {})}
+            jprov = build_provider(models_cfg[jname], config)
+            judge_providers[jname] = {"provider": jprov, "params": jcfg.get("params", {}),
+                                      "model": models_cfg[jname].get("model", jname)}
         except ValueError as e:
             print(f"  Warning: could not init judge provider '{jname}': {e}")
 
@@ -243,88 +564,58 @@ def cmd_eval(args):
     if judge_providers:
         print(f"  Judges: {', '.join(judge_providers.keys())}")
     print(f"  Prompts: {len(prompts)}")
+    if runs > 1:
+        print(f"  Runs per prompt: {runs}")
+    if max(workers.values()) > 1:
+        print(f"  Concurrency: generate={workers['generate']} judge={workers['judge']} deepeval={workers['deepeval']}")
     print(f"{'='*60}\n")
 
-    for i, pmeta in enumerate(prompts, 1):
-        pid = pmeta["id"]
-        print(f"  [{i}/{len(prompts)}] {pid} - {pmeta['subcategory']}...", end=" ", flush=True)
-
-        t0 = time.time()
+    verdicts = get_verdict_store(config)
+    if getattr(args, "batch", False):
         try:
-            content, usage = provider.complete(pmeta["prompt"], params)
-            latency = time.time() - t0
-            auto = check_response(pmeta, content)
-
-            entry = {
-                "timestamp": datetime.now().isoformat(),
-                "api_model": model_cfg["model"],
-                "content": content,
-                "latency_s": round(latency, 2),
-                "input_tokens": usage.get("input_tokens"),
-                "output_tokens": usage.get("output_tokens"),
-                "auto_checks": auto,
-                "judge_scores": {},
-                "judge_score_avg": None,
-                "judge_count": 0,
-            }
-
-            flag_str = f" ⚠ {', '.join(auto['flags'])}" if auto["flags"] else ""
-            print(f"✓ {latency:.1f}s, {usage.get('output_tokens', '?')} tok{flag_str}")
-
-            if judge_providers:
-                for jname, jinfo in judge_providers.items():
-                    jr = judge_response(jinfo["provider"], jinfo["params"], pmeta, content, auto)
-                    entry["judge_scores"][jname] = {
-                        "score": jr["judge_score"],
-                        "rationale": jr["judge_rationale"],
-                        "judged_at": datetime.now().isoformat(),
-                    }
-                    score_str = f"{jr['judge_score']}/5" if jr["judge_score"] else "failed"
-                    print(f"    Judge ({jname}): {score_str}")
-                valid = [v["score"] for v in entry["judge_scores"].values() if v["score"] is not None]
-                entry["judge_score_avg"] = round(sum(valid) / len(valid), 2) if valid else None
-                entry["judge_count"] = len(valid)
-
-            # DeepEval scoring (inline during eval if enabled and benchmark allows)
-            deepeval_cfg = config.get("deepeval", {})
-            if deepeval_cfg.get("enabled") and not skip_deepeval:
-                try:
-                    from scripts.deepeval_scorer import score_with_deepeval
-                    de = score_with_deepeval(pmeta, content, config)
-                    entry["deepeval_scores"] = de["deepeval_scores"]
-                    entry["deepeval_avg"] = de["deepeval_avg"]
-                    if de["deepeval_avg"] is not None:
-                        print(f"    DeepEval: {de['deepeval_avg']:.2f} ({', '.join(f'{k}={v:.2f}' for k, v in de['deepeval_scores'].items() if v is not None)})")
-                    else:
-                        print(f"    DeepEval: failed")
-                except Exception as e2:
-                    print(f"    DeepEval error: {e2}")
-
-        except Exception as e:
-            latency = time.time() - t0
-            entry = {
-                "timestamp": datetime.now().isoformat(),
-                "api_model": model_cfg["model"],
-                "content": "",
-                "latency_s": round(latency, 2),
-                "error": sanitize_error(str(e)),
-                "auto_checks": {"flags": ["API_ERROR"], "auto_scores": {}, "passed": False},
-                "judge_scores": {},
-                "judge_score_avg": None,
-                "judge_count": 0,
-            }
-            print(f"✗ Error: {sanitize_error(str(e))}")
-
-        if pid not in model_data["runs"]:
-            model_data["runs"][pid] = []
-        model_data["runs"][pid].append(entry)
+            provider, judge_providers = batch_eval_providers(provider, judge_providers, prompts, params,
+                                                             runs, config, verdicts)
+        except batch.BatchError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print()
+
+    deepeval_enabled = config.get("deepeval", {}).get("enabled") and not skip_deepeval
+    stages = eval_stages(provider, params, model_cfg, judge_providers,
+                         config if deepeval_enabled else None, workers,
+                         parallel_judges=config.get("eval", {}).get("parallel_judges", True),
+                         verdicts=verdicts, runs=runs)
+
+    def commit(job):
+        for line in job["lines"]:
+            print(line)
+        for entry in job["entries"]:
+            model_data["runs"].setdefault(job["pmeta"]["id"], []).append(entry)
+            unsaved.append((job["pmeta"]["id"], entry))
         try:
-            save_model_results(model_name, model_data)
+            append_model_runs(model_name, unsaved)
         except Exception as e:
             print(f"  ⚠ Save failed (will retry next prompt): {e}")
 
-        if i < len(prompts):
-            time.sleep(delay)
+    # Stages overlap across prompts, but results are committed in prompt order
+    # so the run history and checkpoint file look exactly like a sequential run.
+    # Each commit is one journal append; the snapshot is rewritten once at the end.
+    jobs = ({"pmeta": p, "label": f"[{i}/{len(prompts)}]"} for i, p in enumerate(prompts, 1))
+    pending, nxt, unsaved = {}, 0, []
+    try:
+        for idx, job in Pipeline(stages).run(jobs):
+            pending[idx] = job
+            while nxt in pending:
+                commit(pending.pop(nxt))
+                nxt += 1
+    except KeyboardInterrupt:
+        # Keep whatever already finished in order; jobs past a gap are dropped
+        while nxt in pending:
+            commit(pending.pop(nxt))
+            nxt += 1
+        raise
+    finally:
+        finish_checkpoints(model_name, unsaved)
 
     flagged = sum(
         1 for p in prompts
@@ -338,10 +629,231 @@ def cmd_eval(args):
     print(f"  Results: {model_path(model_name)}")
     print(f"\n  Next step: python run.py compare")
 
-    # Auto-regenerate dashboard
-    path = generate_dashboard()
-    if path:
-        print(f"  Dashboard updated: {path}")
+    refresh_dashboard(config, args)
+
+
+# ── sweep command ──
+
+def resolve_models(patterns: list[str], models_cfg: dict) -> list[str]:
+    """Configured model names matching any of patterns (names or globs), in config order."""
+    return [name for name in models_cfg if any(fnmatch.fnmatchcase(name, pat) for pat in patterns)]
+
+
+def cmd_sweep(args):
+    """Evaluate many models in one process with a single scheduler.
+
+    Config, prompts, judge providers and caches are set up once. Every
+    (model, prompt) job goes through one pipeline, and generation is handed
+    out across endpoints with a per-endpoint cap on requests in flight
+    (rate_limits.<endpoint>.concurrency, default --concurrency /
+    eval.concurrency), so models on different endpoints run side by side.
+    """
+    config = enable_stream_flag(enable_cache_flag(load_config(args.config), args), args)
+    models_cfg = config.get("models", {})
+    benchmark = getattr(args, "benchmark", None)
+
+    model_names = resolve_models(args.models, models_cfg)
+    unmatched = [pat for pat in args.models if not resolve_models([pat], models_cfg)]
+    if unmatched:
+        print(f"  Warning: no configured model matches {', '.join(unmatched)}")
+    if not model_names:
+        print("No models to sweep.")
+        sys.exit(1)
+
+    scoring_flags = benchmark_scoring_flags(config, benchmark)
+    skipped = [m for m in model_names if m in scoring_flags["skip_models"]]
+    if skipped:
+        print(f"  Skipping {', '.join(skipped)}: excluded from '{benchmark}' benchmark via skip_models")
+    model_names = [m for m in model_names if m not in skipped]
+
+    prompts = filter_prompts(load_benchmark_prompts(config, benchmark), args.ids, args.category, args.difficulty)
+    if not prompts:
+        print("No prompts match your filters.")
+        sys.exit(1)
+
+    # One set of judge providers for the whole sweep; self-judging is excluded per model
+    judges_cfg = [] if scoring_flags["skip_judges"] else config.get("judges", [])
+    judge_providers = {}
+    for jcfg in judges_cfg:
+        jname = jcfg.get("model")
+        if not jname or jname not in models_cfg:
+            print(f"  Warning: judge model '{jname}' not found in config, skipping")
+            continue
+        try:
+            jprov = build_provider(models_cfg[jname], config)
+            judge_providers[jname] = {"provider": jprov, "params": jcfg.get("params", {}),
+                                      "model": models_cfg[jname].get("model", jname)}
+        except ValueError as e:
+            print(f"  Warning: could not init judge provider '{jname}': {e}")
+
+    default_cap = max(1, getattr(args, "concurrency", None) or config.get("eval", {}).get("concurrency", 1))
+    sched = Scheduler(default_cap=default_cap)
+    deepeval_enabled = config.get("deepeval", {}).get("enabled") and not scoring_flags["skip_deepeval"]
+    parallel_judges = config.get("eval", {}).get("parallel_judges", True)
+    verdicts = get_verdict_store(config)
+    runs = runs_per_prompt(config, args)
+    sweep = {}
+
+    for model_name in model_names:
+        model_cfg = models_cfg[model_name]
+        model_data = load_model_results(model_name)
+        todo = prompts if args.rerun else [p for p in prompts if p["id"] not in model_data["runs"]]
+        if not todo:
+            print(f"  {model_name}: nothing new to run")
+            continue
+        try:
+            provider = build_provider(model_cfg, config)
+        except ValueError as e:
+            print(f"  Warning: skipping {model_name}: {e}")
+            continue
+        key = endpoint_key(model_cfg)
+        sched.caps[key] = endpoint_concurrency(model_cfg, config, default_cap)
+        applicable = {jn: jp for jn, jp in judge_providers.items() if jn != model_name}
+        # Only the stage functions are used: the sweep pipeline sizes its own workers
+        stages = eval_stages(provider, model_cfg.get("params", {}), model_cfg, applicable,
+                             config if deepeval_enabled else None, stage_workers(config),
+                             parallel_judges=parallel_judges, verdicts=verdicts, runs=runs)
+        sweep[model_name] = {"data": model_data, "prompts": todo, "unsaved": [], "pending": {}, "next": 0,
+                             "stages": {s.name: s.fn for s in stages}}
+        for i, p in enumerate(todo):
+            sched.add(key, {"model": model_name, "key": key, "seq": i, "pmeta": p,
+                            "label": f"[{i + 1}/{len(todo)}] {model_name}"})
+
+    if not sweep:
+        print("Nothing new to run.")
+        return
+
+    workers = stage_workers(config, sched.capacity)
+    print(f"\n{'='*60}")
+    print(f"  Sweep: {len(sweep)} models, {sched.pending()} prompts")
+    if runs > 1:
+        print(f"  Runs per prompt: {runs}")
+    if judge_providers:
+        print(f"  Judges: {', '.join(judge_providers.keys())}")
+    print("  Endpoints: " + ", ".join(f"{key.split('|')[0]} (x{sched.cap(key)})" for key in sched.caps))
+    print(f"{'='*60}\n")
+
+    def dispatch(name):
+        def fn(job):
+            stage = sweep[job["model"]]["stages"].get(name)
+            if name == "generate":
+                try:
+                    return stage(job)
+                finally:
+                    sched.release(job["key"])
+            return stage(job) if stage else job
+        return fn
+
+    names = ["generate", "check"]
+    if judge_providers:
+        names.append("judge")
+    if deepeval_enabled:
+        names.append("deepeval")
+    pipeline = Pipeline([Stage(name, dispatch(name), workers.get(name, 1)) for name in names])
+
+    def commit(job):
+        state = sweep[job["model"]]
+        for line in job["lines"]:
+            print(line)
+        for entry in job["entries"]:
+            state["data"]["runs"].setdefault(job["pmeta"]["id"], []).append(entry)
+            state["unsaved"].append((job["pmeta"]["id"], entry))
+        try:
+            append_model_runs(job["model"], state["unsaved"])
+        except Exception as e:
+            print(f"  ⚠ Save failed for {job['model']} (will retry next prompt): {e}")
+
+    # Each model's results are committed in its own prompt order, as in cmd_eval
+    try:
+        for _, job in pipeline.run(sched.jobs()):
+            state = sweep[job["model"]]
+            state["pending"][job["seq"]] = job
+            while state["next"] in state["pending"]:
+                commit(state["pending"].pop(state["next"]))
+                state["next"] += 1
+    except KeyboardInterrupt:
+        # As in cmd_eval: only each model's contiguous prefix is committed
+        for state in sweep.values():
+            while state["next"] in state["pending"]:
+                commit(state["pending"].pop(state["next"]))
+                state["next"] += 1
+        raise
+    finally:
+        for model_name, state in sweep.items():
+            finish_checkpoints(model_name, state["unsaved"])
+
+    print(f"\n  Done:")
+    for model_name, state in sweep.items():
+        latest = [latest_run(state["data"], p["id"]) for p in state["prompts"]]
+        flagged = sum(1 for r in latest if r.get("auto_checks", {}).get("flags"))
+        judged = sum(1 for r in latest if r.get("judge_score_avg") is not None)
+        print(f"    {model_name}: {len(state['prompts'])} prompts, {flagged} auto-flagged, {judged} judge-scored")
+    print(f"\n  Next step: python run.py compare")
+
+    refresh_dashboard(config, args)
+
+
+# ── loadtest command ──
+
+def cmd_loadtest(args):
+    """Step an endpoint through concurrency levels and store the latency/throughput curve.
+
+    Requests go straight to the provider: no rate limiter, retries or
+    response cache, since those would hide exactly the queueing and errors
+    a load curve is meant to show.
+    """
+    config = enable_stream_flag(load_config(args.config), args)
+    model_name = args.model
+    models_cfg = config.get("models", {})
+    if model_name not in models_cfg:
+        print(f"Model '{model_name}' not in config.yaml")
+        print(f"Available: {', '.join(models_cfg.keys())}")
+        sys.exit(1)
+    model_cfg = stream_default(models_cfg[model_name], config)
+
+    prompts = filter_prompts(load_benchmark_prompts(config, getattr(args, "benchmark", None)),
+                             args.ids, args.category, args.difficulty)
+    if not prompts:
+        print("No prompts match your filters.")
+        sys.exit(1)
+
+    try:
+        provider = get_provider(model_cfg)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    lcfg = config.get("loadtest") or {}
+    levels = args.levels or lcfg.get("levels", loadtest.DEFAULT_LEVELS)
+    requests = args.requests or lcfg.get("requests_per_level", loadtest.DEFAULT_REQUESTS_PER_LEVEL)
+    stop = lcfg.get("stop_error_rate", loadtest.DEFAULT_STOP_ERROR_RATE)
+
+    print(f"\n{'='*60}")
+    print(f"  Load test: {model_name} ({model_cfg['model']})")
+    print(f"  Levels: {', '.join(map(str, levels))} concurrent, {requests} requests each")
+    print(f"  Prompts: {len(prompts)} (cycled){', streamed' if getattr(provider, 'stream', False) else ''}")
+    print(f"{'='*60}\n")
+
+    def log(level):
+        ttft = f"  ttft p50 {level['ttft_p50']:.2f}s" if level.get("ttft_p50") is not None else ""
+        p50, p95, p99 = (level[f"latency_p{q}"] for q in loadtest.PERCENTILES)
+        lat = f"p50 {p50:.2f}s  p95 {p95:.2f}s  p99 {p99:.2f}s" if p50 is not None else "no successful requests"
+        print(f"  x{level['concurrency']:<4} {lat}  {level['tokens_per_s'] or 0:.0f} tok/s  "
+              f"errors {level['error_rate']:.0%}{ttft}")
+
+    curve = loadtest.run_curve(provider, prompts, model_cfg.get("params", {}), levels, requests, stop, log=log)
+    curve["api_model"] = model_cfg["model"]
+    curve["streamed"] = bool(getattr(provider, "stream", False))
+    if curve.get("stopped_early"):
+        print(f"\n  Stopped after x{curve['levels'][-1]['concurrency']}: error rate above {stop:.0%}")
+
+    with journal.locked(model_path(model_name)):
+        model_data = load_model_results(model_name)
+        model_data.setdefault("loadtests", []).append(curve)
+        save_model_results(model_name, model_data)
+    print(f"\n  Results: {model_path(model_name)} (loadtests)")
+
+    refresh_dashboard(config, args)
 
 
 # ── compare command ──
@@ -383,33 +895,24 @@ def cmd_compare(args):
     print(header)
     print("─" * len(header))
 
+    snap = LatestRuns(models, pids)
+    present = snap.present
+    has_score = present & ~np.isnan(snap.judge_score_avg)
+    scored_n = has_score.sum(axis=1)
+    totals = present.sum(axis=1)
+    flagged_n = (present & snap.flagged).sum(axis=1)
+    avg_scores = np.nan_to_num(masked_mean(snap.judge_score_avg, present, axis=1))
+    avg_latency = np.nan_to_num(masked_mean(snap.latency, present, axis=1))
+    avg_tokens = np.nan_to_num(masked_mean(snap.output_tokens, present, axis=1))
+    deepeval_avgs = masked_mean(snap.deepeval_avg, present, axis=1)
+
     leaderboard = []
-    for name, data in models.items():
-        scores, latencies, tokens = [], [], []
-        de_avgs = []
-        flagged = 0
-        for pid in pids:
-            run = latest_run(data, pid)
-            if not run:
-                continue
-            if run.get("judge_score_avg") is not None:
-                scores.append(run["judge_score_avg"])
-            if run.get("auto_checks", {}).get("flags"):
-                flagged += 1
-            latencies.append(run.get("latency_s", 0))
-            tokens.append(run.get("output_tokens", 0) or 0)
-            de_avg = run.get("deepeval_avg")
-            if de_avg is not None:
-                de_avgs.append(de_avg)
-
-        total = sum(1 for pid in pids if latest_run(data, pid))
-        avg_s = sum(scores) / len(scores) if scores else 0
-        avg_l = sum(latencies) / len(latencies) if latencies else 0
-        avg_t = sum(tokens) / len(tokens) if tokens else 0
-        deepeval_avg = sum(de_avgs) / len(de_avgs) if de_avgs else None
+    for m, name in enumerate(snap.models):
+        avg_s = float(avg_scores[m])
+        deepeval_avg = None if np.isnan(deepeval_avgs[m]) else float(deepeval_avgs[m])
 
         # Composite score
-        normalized_judge = (avg_s - 1) / 4 if scores else None
+        normalized_judge = (avg_s - 1) / 4 if scored_n[m] else None
         if normalized_judge is not None and deepeval_avg is not None:
             composite = round(judge_weight * normalized_judge + deepeval_weight * deepeval_avg, 4)
         elif normalized_judge is not None:
@@ -419,7 +922,8 @@ def cmd_compare(args):
         else:
             composite = None
 
-        leaderboard.append((name, avg_s, len(scores), total, flagged, avg_l, avg_t, composite))
+        leaderboard.append((name, avg_s, int(scored_n[m]), int(totals[m]), int(flagged_n[m]),
+                            float(avg_latency[m]), float(avg_tokens[m]), composite))
 
     leaderboard.sort(key=lambda x: (x[2] > 0, x[7] or 0), reverse=True)
 
@@ -442,30 +946,23 @@ def cmd_compare(args):
         print("─" * len(ch))
 
         for cat in categories:
-            cat_pids = [p["id"] for p in prompts if p["category"] == cat]
+            in_cat = np.array([p["category"] == cat for p in prompts])
+            cat_avg = masked_mean(snap.judge_score_avg, present & in_cat, axis=1)
             row = f"{cat:<22}"
             for name, *_ in leaderboard:
-                data = models[name]
-                sc = [
-                    latest_run(data, pid).get("judge_score_avg")
-                    for pid in cat_pids
-                    if latest_run(data, pid) and latest_run(data, pid).get("judge_score_avg") is not None
-                ]
-                row += f" {(f'{sum(sc)/len(sc):.2f}' if sc else ', '):>{cw}}"
+                sc = cat_avg[snap.models.index(name)]
+                row += f" {(f'{sc:.2f}' if not np.isnan(sc) else ', '):>{cw}}"
             print(row)
 
     # Flags
     print(f"\n{'─'*70}")
     print("NOTABLE FLAGS\n")
     any_flags = False
-    for pid in pids:
-        row_flags = {}
-        for name in [n for n, *_ in leaderboard]:
-            run = latest_run(models[name], pid)
-            if run:
-                fl = run.get("auto_checks", {}).get("flags", [])
-                if fl:
-                    row_flags[name] = fl
+    order = [snap.models.index(n) for n, *_ in leaderboard]
+    for p, pid in enumerate(pids):
+        row_flags = {
+            snap.models[m]: snap.run(m, p)["auto_checks"]["flags"] for m in order if snap.flagged[m, p]
+        }
         if row_flags:
             any_flags = True
             meta = prompts_by_id.get(pid, {})
@@ -479,17 +976,24 @@ def cmd_compare(args):
     if args.save:
         os.makedirs(RESULTS_DIR, exist_ok=True)
         path = os.path.join(RESULTS_DIR, "comparison.md")
-        _save_comparison_md(path, leaderboard, models, prompts, prompts_by_id)
+        _save_comparison_md(path, leaderboard, snap, prompts, prompts_by_id)
         print(f"\nReport saved: {path}")
 
 
 def cmd_models(args):
+    if Path(args.config).exists():
+        load_config(args.config)
     models = list_evaluated_models()
     if not models:
         print("No models evaluated yet.")
         return
 
     print(f"\nEvaluated models ({len(models)}):\n")
+    if RESULTS_STORE:
+        # Indexed counts over latest runs, no documents loaded
+        for m in RESULTS_STORE.model_counts():
+            print(f"  {m['name']:<30} {m['prompts']:>2} prompts, {m['judged']:>2} judged, {m['de_scored']:>2} deepeval  (updated: {m['updated'][:10]})")
+        return
     for name in models:
         data = load_model_results(name)
         total = len(data["runs"])
@@ -515,7 +1019,7 @@ def cmd_prompts(args):
         print(f"  {p['id']:<6} {cat:<24} {p['difficulty']:<8} {short}")
 
 
-def _save_comparison_md(path, leaderboard, models, prompts, prompts_by_id):
+def _save_comparison_md(path, leaderboard, snap, prompts, prompts_by_id):
     lines = [
         "# LLM Comparison Report",
         f"*Generated: {datetime.now().isoformat()}*\n",
@@ -533,7 +1037,7 @@ def _save_comparison_md(path, leaderboard, models, prompts, prompts_by_id):
         pid = p["id"]
         lines.append(f"### {pid} - {p['subcategory']} ({p['difficulty']})\n")
         for name, *_ in leaderboard:
-            run = latest_run(models[name], pid)
+            run = snap.run(snap.models.index(name), snap.pids.index(pid))
             if not run:
                 continue
             score = run.get("judge_score_avg", ", ")
@@ -549,8 +1053,52 @@ def _save_comparison_md(path, leaderboard, models, prompts, prompts_by_id):
         f.write("\n".join(lines))
 
 
+DEFAULT_AUTO_CHECKS = {"flags": [], "auto_scores": {}, "passed": True}
+
+
+def rejudge_source(model_name: str, judge_names, force: bool = False) -> tuple[dict, dict | None]:
+    """One model's results to rejudge, plus {pid: judges missing} when the store can tell.
+
+    On the SQLite backend (without force) the judge_scores index finds the
+    prompts whose latest run lacks a score and only latest runs are loaded;
+    a model with nothing missing isn't loaded at all (pending is {}). On
+    JSON files the whole document is loaded and pending is None, so
+    rejudge_targets() scans it.
+    """
+    if RESULTS_STORE is None or force:
+        return load_model_results(model_name), None
+    pending = {}
+    for jname in judge_names:
+        for _, pid in RESULTS_STORE.missing_judge_scores(jname, models=[model_name]):
+            pending.setdefault(pid, []).append(jname)
+    if not pending:
+        return {"model_name": model_name, "runs": {}}, pending
+    return RESULTS_STORE.load_latest(model_name), pending
+
+
+def rejudge_targets(model_data: dict, prompts_by_id: dict, judge_names, force: bool = False,
+                    pending: dict | None = None):
+    """(pid, latest run, prompt meta, judges still to score it) for each stored response.
+
+    Errored runs and prompts no longer in the benchmark are skipped. A judge
+    is still needed unless it already has a score (always, with force);
+    pending (from rejudge_source) answers that from the store's index instead.
+    """
+    for pid, runs in model_data.get("runs", {}).items():
+        if not runs or runs[-1].get("error") or pid not in prompts_by_id:
+            continue
+        run = runs[-1]
+        if pending is not None:
+            needed = [jname for jname in judge_names if jname in pending.get(pid, ())]
+        else:
+            scored = run.get("judge_scores") or {}
+            needed = [jname for jname in judge_names
+                      if force or jname not in scored or scored[jname].get("score") is None]
+        yield pid, run, prompts_by_id[pid], needed
+
+
 def cmd_rejudge(args):
-    config = load_config(args.config)
+    config = enable_cache_flag(load_config(args.config), args)
     models_cfg = config.get("models", {})
 
     benchmark_arg = getattr(args, "benchmark", None)
@@ -570,8 +1118,9 @@ def cmd_rejudge(args):
         if args.judge and jname != args.judge:
             continue
         try:
-            jprov = get_provider(models_cfg[jname])
-            judge_providers[jname] = {"provider": jprov, "params": jcfg.get("params", {})}
+            jprov = build_provider(models_cfg[jname], config)
+            judge_providers[jname] = {"provider": jprov, "params": jcfg.get("params", {}),
+                                      "model": models_cfg[jname].get("model", jname)}
         except ValueError as e:
             print(f"  Warning: could not init judge provider '{jname}': {e}")
 
@@ -595,7 +1144,8 @@ def cmd_rejudge(args):
     benchmark = getattr(args, "benchmark", None)
     prompts = load_benchmark_prompts(config, benchmark)
     prompts_by_id = {p["id"]: p for p in prompts}
-    delay = config.get("eval", {}).get("delay_between_calls", 1.0)
+    parallel_judges = config.get("eval", {}).get("parallel_judges", True)
+    verdicts = get_verdict_store(config)
 
     print(f"\n{'='*60}")
     print(f"  Rejudging with: {', '.join(judge_providers.keys())}")
@@ -603,6 +1153,25 @@ def cmd_rejudge(args):
     print(f"  Force: {args.force}")
     print(f"{'='*60}\n")
 
+    loaded = {}
+    if getattr(args, "batch", False):
+        # Every (response, judge) pair still to score, across all models, goes out first
+        items = []
+        for model_name in model_names:
+            applicable = [jn for jn in judge_providers if jn != model_name]
+            loaded[model_name] = rejudge_source(model_name, applicable, args.force)
+            model_data, pending = loaded[model_name]
+            for pid, run, pmeta, judges_needed in rejudge_targets(model_data, prompts_by_id,
+                                                                   applicable, args.force, pending):
+                if judges_needed:
+                    items.append((pmeta, run["content"], run.get("auto_checks", DEFAULT_AUTO_CHECKS), judges_needed))
+        try:
+            judge_providers = batch.batch_judges(judge_providers, items, verdicts, **batch_wait(config))
+        except batch.BatchError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print()
+
     total_judged = 0
     total_skipped = 0
     total_errors = 0
@@ -614,112 +1183,83 @@ def cmd_rejudge(args):
             print(f"  Skipping {model_name} (all judges excluded due to self-judge)")
             continue
 
-        model_data = load_model_results(model_name)
+        model_data, pending = loaded.pop(model_name, None) or rejudge_source(model_name, applicable_judges,
+                                                                             args.force)
+        if pending == {}:
+            print(f"  Skipping {model_name} (no missing judge scores)")
+            continue
         if not model_data["runs"]:
             print(f"  Skipping {model_name} (no results)")
             continue
 
-        pids = list(model_data["runs"].keys())
         changed = False
         judges_needed_by_pid = {}
 
-        for pid in pids:
-            runs = model_data.get("runs", {}).get(pid, [])
-            if not runs:
-                continue
-            run = runs[-1]
-            if run.get("error"):
-                continue
-
-            pmeta = prompts_by_id.get(pid)
-            if not pmeta:
-                continue
-
+        for pid, run, pmeta, judges_needed in rejudge_targets(model_data, prompts_by_id,
+                                                               applicable_judges, args.force, pending):
             # Ensure judge_scores dict exists on the latest run
             if "judge_scores" not in run:
                 run["judge_scores"] = {}
 
-            # Determine which judges need to score this prompt
-            judges_needed = []
-            for jname in applicable_judges:
-                if not args.force and jname in run["judge_scores"] and run["judge_scores"][jname].get("score") is not None:
-                    total_skipped += 1
-                    continue
-                judges_needed.append(jname)
-
+            total_skipped += len(applicable_judges) - len(judges_needed)
             if not judges_needed:
                 continue
 
             judges_needed_by_pid[pid] = judges_needed
-            auto_checks = run.get("auto_checks", {"flags": [], "auto_scores": {}, "passed": True})
-
-            for jname in judges_needed:
-                jinfo = applicable_judges[jname]
-                print(f"    {model_name}/{pid} judge={jname}...", end=" ", flush=True)
-
-                try:
-                    jr = judge_response(jinfo["provider"], jinfo["params"], pmeta, run["content"], auto_checks)
-
-                    run["judge_scores"][jname] = {
-                        "score": jr["judge_score"],
-                        "rationale": jr["judge_rationale"],
-                        "judged_at": datetime.now().isoformat(),
-                    }
-
-                    score_str = f"{jr['judge_score']}/5" if jr["judge_score"] else "failed"
-                    print(f"{score_str}")
-                    if jr["judge_score"] is not None:
-                        total_judged += 1
-                    else:
-                        total_errors += 1
-                    changed = True
-                except Exception as e:
-                    print(f"error: {e}")
+            auto_checks = run.get("auto_checks", DEFAULT_AUTO_CHECKS)
+
+            # All needed judges score this response at once
+            needed = {jname: applicable_judges[jname] for jname in judges_needed}
+            scores = judge_all(needed, pmeta, run["content"], auto_checks, parallel=parallel_judges,
+                               verdicts=verdicts)
+            for jname, js in scores.items():
+                run["judge_scores"][jname] = js
+                score_str = f"{js['score']}/5" if js["score"] else "failed"
+                if js.get("cached"):
+                    score_str += " (cached)"
+                print(f"    {model_name}/{pid} judge={jname}... {score_str}")
+                if js["score"] is not None:
+                    total_judged += 1
+                else:
                     total_errors += 1
-
-                time.sleep(delay)
+                changed = True
 
             # Recompute aggregates after all judges scored this prompt
-            valid = [v["score"] for v in run["judge_scores"].values() if v["score"] is not None]
-            run["judge_score_avg"] = round(sum(valid) / len(valid), 2) if valid else None
-            run["judge_count"] = len(valid)
+            run["judge_score_avg"], run["judge_count"] = aggregate_judge_scores(run["judge_scores"])
 
         if changed:
             try:
                 # Re-read file to avoid clobbering scores written by concurrent processes
-                fresh_data = load_model_results(model_name)
-                for pid in model_data["runs"]:
-                    fresh_runs = fresh_data.get("runs", {}).get(pid, [])
-                    if not fresh_runs:
-                        continue
-                    fresh_run = fresh_runs[-1]
-                    if "judge_scores" not in fresh_run:
-                        fresh_run["judge_scores"] = {}
-                    # Merge our judge scores into the fresh data
-                    source_run = model_data["runs"][pid][-1]
-                    for jname, jdata in source_run.get("judge_scores", {}).items():
-                        if jname in judges_needed_by_pid.get(pid, []):
-                            fresh_run["judge_scores"][jname] = jdata
-                    # Recompute aggregates
-                    valid = [v["score"] for v in fresh_run["judge_scores"].values() if isinstance(v, dict) and v.get("score") is not None]
-                    fresh_run["judge_score_avg"] = round(sum(valid) / len(valid), 2) if valid else None
-                    fresh_run["judge_count"] = len(valid)
-                save_model_results(model_name, fresh_data)
+                with journal.locked(model_path(model_name)):
+                    fresh_data = load_model_results(model_name)
+                    for pid in model_data["runs"]:
+                        fresh_runs = fresh_data.get("runs", {}).get(pid, [])
+                        if not fresh_runs:
+                            continue
+                        fresh_run = fresh_runs[-1]
+                        if "judge_scores" not in fresh_run:
+                            fresh_run["judge_scores"] = {}
+                        # Merge our judge scores into the fresh data
+                        source_run = model_data["runs"][pid][-1]
+                        for jname, jdata in source_run.get("judge_scores", {}).items():
+                            if jname in judges_needed_by_pid.get(pid, []):
+                                fresh_run["judge_scores"][jname] = jdata
+                        # Recompute aggregates
+                        fresh_run["judge_score_avg"], fresh_run["judge_count"] = aggregate_judge_scores(fresh_run["judge_scores"])
+                    save_model_results(model_name, fresh_data)
             except Exception as e:
                 print(f"    Save failed: {e}")
 
     print(f"\n  Done: {total_judged} judged, {total_skipped} skipped, {total_errors} errors")
 
-    # Auto-regenerate dashboard
-    path = generate_dashboard()
-    if path:
-        print(f"  Dashboard updated: {path}")
+    refresh_dashboard(config, args)
 
 
 def cmd_deepeval(args):
     from scripts.deepeval_scorer import score_with_deepeval
 
-    config = load_config(args.config)
+    config = enable_cache_flag(load_config(args.config), args)
+    verdicts = get_verdict_store(config)
 
     # Determine which models to score
     if args.models:
@@ -745,8 +1285,6 @@ def cmd_deepeval(args):
         prompts_by_id = {p["id"]: p for p in prompts}
     filter_pids = set(prompts_by_id.keys()) if args.ids else None
 
-    delay = config.get("eval", {}).get("delay_between_calls", 1.0)
-
     print(f"\n{'='*60}")
     print(f"  DeepEval Scoring")
     print(f"  Models: {len(model_names)}")
@@ -784,6 +1322,7 @@ def cmd_deepeval(args):
 
         print(f"  {model_name}: scoring {len(to_score)}/{len(pids)} prompts...")
 
+        unsaved = []
         for i, pid in enumerate(to_score, 1):
             run = latest_run(model_data, pid)
             pmeta = prompts_by_id.get(pid)
@@ -794,7 +1333,8 @@ def cmd_deepeval(args):
             print(f"    [{i}/{len(to_score)}] {pid}...", end=" ", flush=True)
 
             try:
-                de = score_with_deepeval(pmeta, run["content"], config)
+                de = score_with_deepeval(pmeta, run["content"], config, verdicts=verdicts,
+                                         pace=lambda n: pace_deepeval(config, n))
 
                 # Append a new run entry with DeepEval scores, preserving everything else
                 entry = {
@@ -813,6 +1353,7 @@ def cmd_deepeval(args):
                 }
 
                 model_data["runs"][pid].append(entry)
+                unsaved.append((pid, entry))
 
                 if de["deepeval_avg"] is not None:
                     parts = ", ".join(f"{k}={v:.2f}" for k, v in de["deepeval_scores"].items() if v is not None)
@@ -826,25 +1367,22 @@ def cmd_deepeval(args):
                 total_errors += 1
 
             try:
-                save_model_results(model_name, model_data)
+                append_model_runs(model_name, unsaved)
             except Exception as e:
                 print(f"    ⚠ Save failed (will retry next prompt): {e}")
-
-            if i < len(to_score):
-                time.sleep(delay)
+        finish_checkpoints(model_name, unsaved)
 
     print(f"\n  Done: {total_scored} scored, {total_skipped} skipped, {total_errors} errors")
 
-    # Auto-regenerate dashboard
-    path = generate_dashboard()
-    if path:
-        print(f"  Dashboard updated: {path}")
+    refresh_dashboard(config, args)
 
 
 def cmd_migrate_judges(args):
     """Migrate result files from single-judge to multi-judge format."""
     import shutil
 
+    if Path(args.config).exists():
+        load_config(args.config)
     models = list_evaluated_models()
     if not models:
         print("No result files found.")
@@ -853,10 +1391,14 @@ def cmd_migrate_judges(args):
     # Back up all result files before modifying
     backup_dir = os.path.join(RESULTS_DIR, "backup")
     os.makedirs(backup_dir, exist_ok=True)
-    for model in models:
-        src = model_path(model)
-        dst = os.path.join(backup_dir, f"{model}.json")
-        shutil.copy2(src, dst)
+    if RESULTS_STORE:
+        export_json(RESULTS_STORE, backup_dir, models)
+    else:
+        for model in models:
+            compact_model_results(model)
+            src = model_path(model)
+            dst = os.path.join(backup_dir, f"{model}.json")
+            shutil.copy2(src, dst)
     print(f"Backed up {len(models)} result files to {backup_dir}/")
 
     total_migrated = 0
@@ -909,6 +1451,19 @@ def cmd_migrate_judges(args):
     print(f"\nDone: {total_migrated} entries migrated, {total_skipped} skipped")
 
 
+def cmd_db(args):
+    """Copy results between the JSON files in RESULTS_DIR and the SQLite store."""
+    config = load_config(args.config)
+    rcfg = config.get("results") or {}
+    store = get_results_store(args.path or rcfg.get("path", os.path.join(RESULTS_DIR, "results.sqlite")))
+    if args.action == "import":
+        names = import_json(store, RESULTS_DIR, args.models or None)
+        print(f"Imported {len(names)} models from {RESULTS_DIR}/ into {store.path}")
+    else:
+        names = export_json(store, RESULTS_DIR, args.models or None)
+        print(f"Exported {len(names)} models from {store.path} to {RESULTS_DIR}/")
+
+
 def cmd_dashboard(args):
     path = generate_dashboard(args.output if hasattr(args, "output") else None)
     if path:
@@ -934,6 +1489,39 @@ def main():
     p.add_argument("--difficulty", nargs="+")
     p.add_argument("--benchmark", default=None, help="Benchmark: general, causal, or all (default: general)")
     p.add_argument("--rerun", action="store_true", help="Re-run already evaluated prompts")
+    p.add_argument("--concurrency", type=int, default=None, help="Prompts in flight at once (default: eval.concurrency or 1)")
+    p.add_argument("--runs", type=int, default=None, help="Samples per prompt, stored as sibling runs (default: eval.runs_per_prompt or 1)")
+    p.add_argument("--cache", action="store_true", help="Replay/store temperature-0 replies in the response cache")
+    p.add_argument("--stream", action="store_true", help="Stream replies and record time-to-first-token and tokens/sec")
+    p.add_argument("--batch", action="store_true", help="Generate and judge through provider batch jobs (anthropic/openai), polling until done")
+    p.add_argument("--no-dashboard", action="store_true", help="Don't regenerate the dashboard afterwards")
+    p.add_argument("--defer-dashboard", action="store_true", help="Queue a debounced background dashboard rebuild instead")
+
+    p = sub.add_parser("sweep", aliases=["eval-all"], help="Run eval against many models in one scheduled pass")
+    p.add_argument("models", nargs="+", help="Model names or globs, e.g. 'claude-*' (quote globs)")
+    p.add_argument("--ids", nargs="+")
+    p.add_argument("--category", nargs="+")
+    p.add_argument("--difficulty", nargs="+")
+    p.add_argument("--benchmark", default=None, help="Benchmark: general, causal, or all (default: general)")
+    p.add_argument("--rerun", action="store_true", help="Re-run already evaluated prompts")
+    p.add_argument("--concurrency", type=int, default=None, help="Requests in flight per endpoint unless rate_limits sets concurrency (default: eval.concurrency or 1)")
+    p.add_argument("--runs", type=int, default=None, help="Samples per prompt, stored as sibling runs (default: eval.runs_per_prompt or 1)")
+    p.add_argument("--cache", action="store_true", help="Replay/store temperature-0 replies in the response cache")
+    p.add_argument("--stream", action="store_true", help="Stream replies and record time-to-first-token and tokens/sec")
+    p.add_argument("--no-dashboard", action="store_true", help="Don't regenerate the dashboard afterwards")
+    p.add_argument("--defer-dashboard", action="store_true", help="Queue a debounced background dashboard rebuild instead")
+
+    p = sub.add_parser("loadtest", help="Measure latency and throughput at stepped concurrency")
+    p.add_argument("model")
+    p.add_argument("--levels", nargs="+", type=int, default=None, help="Concurrency levels (default: loadtest.levels or 1 2 4 8 16)")
+    p.add_argument("--requests", type=int, default=None, help="Requests per level (default: loadtest.requests_per_level or 32)")
+    p.add_argument("--ids", nargs="+")
+    p.add_argument("--category", nargs="+")
+    p.add_argument("--difficulty", nargs="+")
+    p.add_argument("--benchmark", default=None, help="Benchmark: general, causal, or all (default: general)")
+    p.add_argument("--stream", action="store_true", help="Stream replies to also record time-to-first-token")
+    p.add_argument("--no-dashboard", action="store_true", help="Don't regenerate the dashboard afterwards")
+    p.add_argument("--defer-dashboard", action="store_true", help="Queue a debounced background dashboard rebuild instead")
 
     p = sub.add_parser("compare", help="Compare models")
     p.add_argument("models", nargs="*")
@@ -955,22 +1543,34 @@ def main():
     p.add_argument("models", nargs="*", help="Models to rejudge (default: all)")
     p.add_argument("--judge", default=None, help="Target a specific judge model (default: all configured judges)")
     p.add_argument("--force", action="store_true", help="Rejudge even if already scored by current judge")
+    p.add_argument("--cache", action="store_true", help="Reuse stored verdicts for unchanged responses (and cache judge replies)")
+    p.add_argument("--batch", action="store_true", help="Submit all pending judging as one batch job per judge, polling until done")
+    p.add_argument("--no-dashboard", action="store_true", help="Don't regenerate the dashboard afterwards")
+    p.add_argument("--defer-dashboard", action="store_true", help="Queue a debounced background dashboard rebuild instead")
     p.add_argument("--benchmark", default=None, help="Benchmark: general, causal, or all (default: general)")
 
     p = sub.add_parser("deepeval", help="Score stored responses with DeepEval metrics")
     p.add_argument("models", nargs="*", help="Models to score (default: all)")
     p.add_argument("--ids", nargs="+", help="Only score specific prompt IDs")
     p.add_argument("--force", action="store_true", help="Re-score even if already has DeepEval scores")
+    p.add_argument("--cache", action="store_true", help="Reuse stored DeepEval verdicts for unchanged responses")
+    p.add_argument("--no-dashboard", action="store_true", help="Don't regenerate the dashboard afterwards")
+    p.add_argument("--defer-dashboard", action="store_true", help="Queue a debounced background dashboard rebuild instead")
     p.add_argument("--benchmark", default=None, help="Benchmark: general, causal, or all (default: general)")
 
     p = sub.add_parser("migrate-judges", help="Migrate results from single-judge to multi-judge format")
 
+    p = sub.add_parser("db", help="Import/export results between JSON files and the SQLite store")
+    p.add_argument("action", choices=["import", "export"])
+    p.add_argument("models", nargs="*", help="Models to copy (default: all)")
+    p.add_argument("--path", default=None, help="SQLite file (default: results.path or results/results.sqlite)")
+
     p = sub.add_parser("dashboard", help="Generate HTML dashboard")
     p.add_argument("--output", default=None, help="Output file path")
     p.add_argument("--open", action="store_true", help="Open in browser")
 
     args = parser.parse_args()
-    cmds = {"eval": cmd_eval, "compare": cmd_compare, "models": cmd_models, "prompts": cmd_prompts, "rejudge": cmd_rejudge, "deepeval": cmd_deepeval, "migrate-judges": cmd_migrate_judges, "dashboard": cmd_dashboard}
+    cmds = {"eval": cmd_eval, "sweep": cmd_sweep, "eval-all": cmd_sweep, "loadtest": cmd_loadtest, "compare": cmd_compare, "models": cmd_models, "prompts": cmd_prompts, "rejudge": cmd_rejudge, "deepeval": cmd_deepeval, "migrate-judges": cmd_migrate_judges, "db": cmd_db, "dashboard": cmd_dashboard}
     fn = cmds.get(args.command)
     if fn:
         fn(args)
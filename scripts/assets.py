@@ -0,0 +1,92 @@
+"""Static-site asset writing: content-hashed names and precompressed variants.
+
+JSON payloads are written as <stem>.<hash>.json, so a host can cache them
+forever and a regeneration only changes the URL of payloads whose bytes
+changed. Every written file also gets .gz and .br siblings (brotli is
+optional) for hosts that serve precompressed files.
+"""
+
+import gzip
+import hashlib
+import os
+import re
+
+try:
+    import brotli
+except ImportError:  # .br variants are skipped
+    brotli = None
+
+
+HASH_LEN = 10
+COMPRESSED_SUFFIXES = (".gz", ".br")
+# Brotli's top quality costs seconds per MB; large payloads use 9 (within ~20%)
+BROTLI_MAX_QUALITY_BYTES = 256 * 1024
+
+
+def hashed_name(relpath: str, data: bytes) -> str:
+    """"data/judges.json" -> "data/judges.<hash>.json" for these bytes."""
+    root, ext = os.path.splitext(relpath)
+    return f"{root}.{hashlib.sha256(data).hexdigest()[:HASH_LEN]}{ext}"
+
+
+def write_if_changed(path: str, data: bytes) -> bool:
+    """Write data to path unless the file already holds exactly these bytes.
+
+    Returns True if the file was written. Unchanged files keep their mtime,
+    so git and file watchers see nothing.
+    """
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return True
+
+
+def write_asset(out_dir: str, relpath: str, data: bytes, hashed: bool = False) -> str:
+    """Write data (plus .gz/.br) under out_dir if changed; returns the path, relative to out_dir.
+
+    Variants are only recompressed when the bytes changed (or are missing).
+    A hashed asset that already exists is not even read: same name, same bytes.
+    """
+    if hashed:
+        relpath = hashed_name(relpath, data)
+    path = os.path.join(out_dir, relpath)
+    if hashed and os.path.exists(path):
+        changed = False
+    else:
+        changed = write_if_changed(path, data)
+    # mtime=0 keeps the .gz bytes a function of the content alone
+    variants = {".gz": lambda: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = lambda: brotli.compress(data, quality=11 if len(data) <= BROTLI_MAX_QUALITY_BYTES else 9)
+    for suffix, compress in variants.items():
+        if changed or not os.path.exists(path + suffix):
+            with open(path + suffix, "wb") as f:
+                f.write(compress())
+    return relpath
+
+
+def prune_hashed(out_dir: str, relpath: str, keep: str | None = None):
+    """Remove earlier hashed generations of relpath (and their variants), except keep.
+
+    Without keep, every generation goes.
+    """
+    root, ext = os.path.splitext(relpath)
+    directory = os.path.join(out_dir, os.path.dirname(root))
+    pattern = re.compile(
+        re.escape(os.path.basename(root)) + r"\.[0-9a-f]{%d}" % HASH_LEN + re.escape(ext)
+        + "(" + "|".join(re.escape(s) for s in COMPRESSED_SUFFIXES) + ")?$"
+    )
+    keep_base = os.path.basename(keep) if keep else None
+    if not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        if pattern.match(name) and not (keep_base and name.startswith(keep_base)):
+            os.remove(os.path.join(directory, name))
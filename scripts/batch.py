@@ -0,0 +1,338 @@
+"""Batch-API submission: generation and judging as asynchronous provider batch jobs.
+
+Anthropic Message Batches and the OpenAI Batch API take thousands of
+requests in one submission, finish them within a day at reduced cost and
+outside the per-request rate limits. run_batches() submits one job per
+provider, polls until every job has finished and returns the replies in
+request order.
+
+The eval and rejudge commands don't consume those replies directly: a
+ReplayProvider serves them through the ordinary complete() interface, so
+the unchanged pipeline (auto-checks, judge_all, verdict store, journal)
+turns them into exactly the run entries a live run would have written.
+"""
+
+import json
+import time
+from abc import ABC, abstractmethod
+
+import httpx
+
+from scripts.judge import _cached_verdict, _verdict_key, build_judge_prompt
+from scripts.providers import AnthropicProvider, HTTPProvider, OpenAIProvider, Provider, sanitize_error
+
+
+DEFAULT_POLL_S = 30
+DEFAULT_TIMEOUT_S = 24 * 3600
+# openai_compatible hosts share OpenAIProvider but rarely offer /files + /batches
+OPENAI_BATCH_HOST = "api.openai.com"
+
+
+class BatchError(Exception):
+    """A batch job could not be submitted, failed as a whole, or did not finish in time."""
+
+
+class BatchAPI(ABC):
+    """One provider's batch endpoints.
+
+    Request bodies are the provider's own _request() bodies and replies go
+    through its _parse(), so a batched call is the same call made later.
+    """
+
+    def __init__(self, provider: HTTPProvider):
+        self.provider = provider
+        self.client = provider.client
+
+    @abstractmethod
+    def submit(self, bodies: dict[str, dict]) -> str:
+        """Create a job for {custom_id: request body}; returns the batch id."""
+        ...
+
+    def status(self, batch_id: str) -> dict:
+        resp = self.client.get(self.status_url(batch_id))
+        resp.raise_for_status()
+        return resp.json()
+
+    @abstractmethod
+    def status_url(self, batch_id: str) -> str:
+        ...
+
+    @abstractmethod
+    def finished(self, status: dict) -> bool:
+        ...
+
+    @abstractmethod
+    def progress(self, status: dict) -> str:
+        """Short status line for the poll log."""
+        ...
+
+    @abstractmethod
+    def results(self, status: dict) -> dict:
+        """{custom_id: (content, usage) or the Exception that request ended in}."""
+        ...
+
+    def _jsonl(self, url: str):
+        resp = self.client.get(url)
+        resp.raise_for_status()
+        for line in resp.text.splitlines():
+            if line.strip():
+                yield json.loads(line)
+
+    def _reply(self, body: dict):
+        try:
+            return self.provider._parse(body)
+        except ValueError as e:
+            return e
+
+
+class AnthropicBatch(BatchAPI):
+    """Message Batches: POST /v1/messages/batches, results as JSONL at results_url."""
+
+    def submit(self, bodies: dict[str, dict]) -> str:
+        resp = self.client.post("/v1/messages/batches", json={
+            "requests": [{"custom_id": cid, "params": body} for cid, body in bodies.items()],
+        })
+        resp.raise_for_status()
+        return resp.json()["id"]
+
+    def status_url(self, batch_id: str) -> str:
+        return f"/v1/messages/batches/{batch_id}"
+
+    def finished(self, status: dict) -> bool:
+        return status.get("processing_status") == "ended"
+
+    def progress(self, status: dict) -> str:
+        counts = status.get("request_counts") or {}
+        done = sum(v for k, v in counts.items() if k != "processing")
+        return f"{status.get('processing_status')} {done}/{done + counts.get('processing', 0)}"
+
+    def results(self, status: dict) -> dict:
+        out = {}
+        for line in self._jsonl(status["results_url"]):
+            result = line.get("result") or {}
+            if result.get("type") == "succeeded":
+                out[line["custom_id"]] = self._reply(result.get("message") or {})
+            else:
+                # errored: {"error": {"type": "error", "error": {"message"}}}; canceled / expired: none
+                error = result.get("error") or {}
+                detail = (error.get("error") or error).get("message")
+                out[line["custom_id"]] = RuntimeError(
+                    f"batch request {result.get('type', 'failed')}" + (f": {detail}" if detail else ""))
+        return out
+
+
+class OpenAIBatch(BatchAPI):
+    """Batch API: JSONL upload to /files, POST /batches, output and error files."""
+
+    ENDPOINT = "/v1/chat/completions"
+    FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+    def submit(self, bodies: dict[str, dict]) -> str:
+        lines = "".join(json.dumps({"custom_id": cid, "method": "POST", "url": self.ENDPOINT, "body": body}) + "\n"
+                        for cid, body in bodies.items())
+        # Built standalone: the client's default JSON content type would hide the multipart boundary
+        upload = httpx.Request("POST", "/files", data={"purpose": "batch"},
+                               files={"file": ("batch.jsonl", lines.encode("utf-8"), "application/jsonl")})
+        resp = self.client.post("/files", content=upload.read(),
+                                headers={"Content-Type": upload.headers["Content-Type"]})
+        resp.raise_for_status()
+        resp = self.client.post("/batches", json={
+            "input_file_id": resp.json()["id"],
+            "endpoint": self.ENDPOINT,
+            "completion_window": "24h",
+        })
+        resp.raise_for_status()
+        return resp.json()["id"]
+
+    def status_url(self, batch_id: str) -> str:
+        return f"/batches/{batch_id}"
+
+    def finished(self, status: dict) -> bool:
+        return status.get("status") in self.FINAL_STATUSES
+
+    def progress(self, status: dict) -> str:
+        counts = status.get("request_counts") or {}
+        return f"{status.get('status')} {counts.get('completed', 0) + counts.get('failed', 0)}/{counts.get('total', '?')}"
+
+    def results(self, status: dict) -> dict:
+        if status.get("status") == "failed" and not status.get("output_file_id"):
+            errors = (status.get("errors") or {}).get("data") or []
+            raise BatchError(f"batch {status.get('id')} failed: "
+                             + ("; ".join(e.get("message", "") for e in errors) or "no reason given"))
+        out = {}
+        # An expired job still returns what finished; the rest are reported missing
+        for file_id in (status.get("output_file_id"), status.get("error_file_id")):
+            if not file_id:
+                continue
+            for line in self._jsonl(f"/files/{file_id}/content"):
+                response = line.get("response") or {}
+                body = response.get("body") or {}
+                if line.get("error") or response.get("status_code") != 200:
+                    error = line.get("error") or body.get("error") or {}
+                    out[line["custom_id"]] = RuntimeError(
+                        f"batch request failed ({response.get('status_code', 'no status')}): {error.get('message', error)}")
+                else:
+                    out[line["custom_id"]] = self._reply(body)
+        return out
+
+
+def batch_api(provider) -> BatchAPI | None:
+    """The batch endpoints behind a (possibly wrapped) provider, or None if it has none.
+
+    Rate limiting, retries and the response cache are per-request wrappers
+    and don't apply to a batch job, so they are unwrapped. OpenAI-compatible
+    hosts other than OpenAI itself get None.
+    """
+    while not isinstance(provider, HTTPProvider) and getattr(provider, "inner", None) is not None:
+        provider = provider.inner
+    if isinstance(provider, AnthropicProvider):
+        return AnthropicBatch(provider)
+    if isinstance(provider, OpenAIProvider) and provider.client.base_url.host == OPENAI_BATCH_HOST:
+        return OpenAIBatch(provider)
+    return None
+
+
+def run_batches(jobs: list[tuple[BatchAPI, list[tuple[str, dict]]]], poll_s: float = DEFAULT_POLL_S,
+                timeout_s: float = DEFAULT_TIMEOUT_S, log=None, sleep=time.sleep) -> list[tuple[str, list]]:
+    """Submit one batch per (api, [(prompt, params), ...]) job and wait for all of them.
+
+    Returns (batch id, replies) per job, replies in request order, each
+    (content, usage) or the Exception the request ended in. Raises
+    BatchError if a job can't be submitted, fails outright, or is still
+    running after timeout_s (its id is in the message; nothing is ingested).
+    """
+    log = log or (lambda msg: None)
+    submitted = []
+    for api, requests in jobs:
+        bodies = {f"req-{i}": api.provider._request(prompt, params)[1]["json"]
+                  for i, (prompt, params) in enumerate(requests)}
+        try:
+            batch_id = api.submit(bodies)
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            raise BatchError(f"could not submit batch to {api.provider.model}: {sanitize_error(str(e))}") from e
+        log(f"submitted batch {batch_id}: {len(bodies)} request(s) to {api.provider.model}")
+        submitted.append((api, batch_id, list(bodies)))
+
+    deadline = time.monotonic() + timeout_s
+    statuses = {}
+    while True:
+        for api, batch_id, _ in submitted:
+            if batch_id in statuses:
+                continue
+            try:
+                status = api.status(batch_id)
+            except httpx.HTTPError as e:
+                # A failed poll is not a failed job; ask again next round
+                log(f"batch {batch_id}: poll failed ({sanitize_error(str(e))})")
+                continue
+            log(f"batch {batch_id}: {api.progress(status)}")
+            if api.finished(status):
+                statuses[batch_id] = status
+        if len(statuses) == len(submitted):
+            break
+        if time.monotonic() >= deadline:
+            waiting = [batch_id for _, batch_id, _ in submitted if batch_id not in statuses]
+            raise BatchError(f"batch(es) {', '.join(waiting)} still running after {timeout_s:g}s")
+        sleep(poll_s)
+
+    out = []
+    for api, batch_id, custom_ids in submitted:
+        try:
+            replies = api.results(statuses[batch_id])
+        except httpx.HTTPError as e:
+            raise BatchError(f"could not fetch results of batch {batch_id}: {sanitize_error(str(e))}") from e
+        missing = RuntimeError(f"no result in batch {batch_id}")
+        out.append((batch_id, [replies.get(cid, missing) for cid in custom_ids]))
+    return out
+
+
+class ReplayProvider(Provider):
+    """Serves batch replies through complete(), keyed by prompt text.
+
+    Every call for a prompt gets the same reply (complete_n() the first n);
+    a request that failed in the batch raises its error here instead.
+    """
+
+    def __init__(self, model: str, replies: dict[str, list]):
+        self.model = model
+        self.replies = replies
+
+    def _take(self, prompt: str, n: int) -> list[tuple[str, dict]]:
+        if prompt not in self.replies:
+            raise RuntimeError(f"prompt was not part of the {self.model} batch")
+        replies = self.replies[prompt][:n]
+        for reply in replies:
+            if isinstance(reply, Exception):
+                raise reply
+        return replies
+
+    def complete(self, prompt: str, params: dict) -> tuple[str, dict]:
+        return self._take(prompt, 1)[0]
+
+    def complete_n(self, prompt: str, params: dict, n: int) -> list[tuple[str, dict]]:
+        return self._take(prompt, n)
+
+    def contents(self, prompt: str) -> list[str]:
+        """Reply texts for prompt; empty if its call would raise."""
+        try:
+            return [content for content, _ in self._take(prompt, len(self.replies.get(prompt, [])))]
+        except Exception:
+            return []
+
+
+def _replay(api: BatchAPI, keys: list[str], batch_id: str, replies: list) -> ReplayProvider:
+    served = {}
+    for key, reply in zip(keys, replies):
+        if not isinstance(reply, Exception):
+            content, usage = reply
+            reply = (content, {**usage, "batch_id": batch_id})
+        served.setdefault(key, []).append(reply)
+    return ReplayProvider(api.provider.model, served)
+
+
+def batch_generate(provider, prompts: list[dict], params: dict, runs: int = 1, **wait) -> ReplayProvider:
+    """Generate runs replies per prompt in one batch job; returns them as a ReplayProvider.
+
+    Replies' usage carries "batch_id". Prompts with identical text are sent once.
+    """
+    api = batch_api(provider)
+    if api is None:
+        raise BatchError(f"{getattr(provider, 'model', provider)} has no batch API (anthropic and openai only)")
+    keys = [text for text in dict.fromkeys(p["prompt"] for p in prompts) for _ in range(runs)]
+    [(batch_id, replies)] = run_batches([(api, [(text, params) for text in keys])], **wait)
+    return _replay(api, keys, batch_id, replies)
+
+
+def batch_judges(judges: dict, items: list[tuple[dict, str, dict, list[str]]], verdicts=None, **wait) -> dict:
+    """Send every pending judge call as one batch job per judge.
+
+    items are (prompt_meta, response, auto_checks, judge names). Returns
+    judges with each batched judge's provider swapped for a ReplayProvider,
+    so judge_all() then scores exactly as it would live. Verdicts already
+    in the store aren't resubmitted; judges without a batch API (or with
+    nothing to do) keep their live provider.
+    """
+    pending = {}
+    for pmeta, response, auto_checks, names in items:
+        for name in names:
+            jinfo = judges[name]
+            if verdicts is not None:
+                key = _verdict_key(jinfo.get("model", name), jinfo["params"], pmeta, response, auto_checks)
+                if _cached_verdict(verdicts, key):
+                    continue
+            pending.setdefault(name, {})[build_judge_prompt(pmeta, response, auto_checks)] = None
+
+    jobs, names = [], []
+    for name, prompts in pending.items():
+        api = batch_api(judges[name]["provider"])
+        if api is None:
+            continue
+        jobs.append((api, [(prompt, judges[name]["params"]) for prompt in prompts]))
+        names.append(name)
+    if not jobs:
+        return judges
+
+    judges = dict(judges)
+    for name, (api, requests), (batch_id, replies) in zip(names, jobs, run_batches(jobs, **wait)):
+        judges[name] = {**judges[name], "provider": _replay(api, [p for p, _ in requests], batch_id, replies)}
+    return judges
@@ -0,0 +1,115 @@
+"""Debounced background dashboard rebuilds.
+
+Commands that change results call notify() instead of regenerating the
+dashboard themselves. That records the change by touching a pending stamp
+and makes sure one detached builder process is running. The builder waits
+until no change has been recorded for the debounce window, then
+regenerates once. A scripted sweep of 40 `run.py eval` calls therefore
+rebuilds once, shortly after the last one, instead of 40 times.
+
+Run directly (python -m scripts.builder [debounce_s]) to drain any pending
+rebuild in the foreground.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: no builder lock, notify() builds synchronously
+    fcntl = None
+
+
+PENDING_FILE = os.path.join(".cache", "dashboard.pending")
+LOCK_FILE = os.path.join(".cache", "dashboard.lock")
+LOG_FILE = os.path.join(".cache", "dashboard.log")
+DEFAULT_DEBOUNCE_S = 30
+
+
+def _build():
+    from scripts.dashboard import generate_dashboard
+    return generate_dashboard()
+
+
+def _try_lock(fh) -> bool:
+    try:
+        fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+
+
+def builder_running() -> bool:
+    """True if a builder currently holds the lock."""
+    if not os.path.exists(LOCK_FILE):
+        return False
+    with open(LOCK_FILE, "a") as fh:
+        if not _try_lock(fh):
+            return True
+        fcntl.flock(fh, fcntl.LOCK_UN)
+    return False
+
+
+def spawn_builder(debounce_s: float):
+    """Start a detached builder in the current directory, logging to LOG_FILE."""
+    with open(LOG_FILE, "a") as log:
+        subprocess.Popen(
+            [sys.executable, "-m", "scripts.builder", str(debounce_s)],
+            stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+
+def notify(debounce_s: float = DEFAULT_DEBOUNCE_S, build=None) -> str:
+    """Record that results changed and make sure a builder will pick it up.
+
+    Returns "queued", or "built" where there is no builder lock and the
+    rebuild ran right here.
+    """
+    if fcntl is None:
+        (build or _build)()
+        return "built"
+    os.makedirs(os.path.dirname(PENDING_FILE), exist_ok=True)
+    # Touch first: a builder about to exit re-checks the stamp after unlocking
+    with open(PENDING_FILE, "a"):
+        os.utime(PENDING_FILE)
+    if not builder_running():
+        spawn_builder(debounce_s)
+    return "queued"
+
+
+def run_builder(debounce_s: float = DEFAULT_DEBOUNCE_S, build=None, sleep=time.sleep) -> int:
+    """Rebuild once per quiet window until nothing is pending; returns the number of builds.
+
+    Exits straight away if another builder holds the lock.
+    """
+    build = build or _build
+    builds = 0
+    os.makedirs(os.path.dirname(LOCK_FILE), exist_ok=True)
+    while True:
+        with open(LOCK_FILE, "a") as fh:
+            if fcntl and not _try_lock(fh):
+                return builds
+            while True:
+                try:
+                    quiet = time.time() - os.path.getmtime(PENDING_FILE)
+                except FileNotFoundError:
+                    break
+                if quiet < debounce_s:
+                    sleep(debounce_s - quiet)
+                    continue
+                # Consume before building: changes recorded during the build queue another one
+                os.remove(PENDING_FILE)
+                build()
+                builds += 1
+        # A notify() that saw our lock just before we released it left a stamp behind
+        if not os.path.exists(PENDING_FILE):
+            return builds
+
+
+if __name__ == "__main__":
+    debounce = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DEBOUNCE_S
+    n = run_builder(debounce)
+    print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} dashboard builder: {n} rebuild(s)")
@@ -0,0 +1,250 @@
+"""Content-addressed on-disk caches for provider calls and scoring verdicts.
+
+Responses are keyed by a hash of (provider type, endpoint, api model, params,
+prompt), so a temperature-0 rerun, a repeated judge prompt or a resumed
+sweep replays instantly instead of hitting the network. Judge and DeepEval
+verdicts are keyed by (judge, rubric version, prompt metadata, response), so
+rejudging only pays for pairs that have actually changed. Both are stored in
+SQLite (stdlib, safe across threads and processes); the response cache adds
+a TTL and size-bounded least-recently-used eviction.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from scripts.providers import STREAM_TIMING_FIELDS, Provider
+
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "responses.sqlite")
+DEFAULT_VERDICT_PATH = os.path.join(".cache", "verdicts.sqlite")
+
+
+def _digest(*parts) -> str:
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def response_key(model_cfg: dict, params: dict, prompt: str) -> str:
+    return _digest(
+        model_cfg.get("provider", ""),
+        model_cfg.get("base_url", ""),
+        model_cfg.get("region", ""),
+        model_cfg.get("model", ""),
+        params,
+        hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+    )
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def prompt_meta_hash(prompt_meta: dict) -> str:
+    """Hash of the prompt fields a grader sees (prompt, ideal answer, criteria)."""
+    return _digest(prompt_meta.get("prompt", ""), prompt_meta.get("ideal", ""), prompt_meta.get("criteria", []))
+
+
+def verdict_key(kind: str, judge: str, rubric, prompt_meta: dict, response: str, *extra) -> str:
+    """Key for a stored verdict; rubric is any JSON-serialisable rubric text or version."""
+    return _digest(kind, judge, rubric, prompt_meta_hash(prompt_meta), content_hash(response), *extra)
+
+
+class ResponseCache:
+    """SQLite-backed LRU cache of (content, usage) replies."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int | None = None,
+                 max_entries: int | None = None, ttl_s: float | None = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses(last_used)")
+        self._db.commit()
+
+    @classmethod
+    def from_config(cls, config: dict) -> "ResponseCache | None":
+        cfg = config.get("cache", {}) or {}
+        if not cfg.get("enabled"):
+            return None
+        max_mb = cfg.get("max_size_mb", 500)
+        ttl_h = cfg.get("ttl_hours")
+        return cls(
+            path=cfg.get("path", DEFAULT_CACHE_PATH),
+            max_bytes=int(max_mb * 1024 * 1024) if max_mb else None,
+            max_entries=cfg.get("max_entries"),
+            ttl_s=ttl_h * 3600 if ttl_h else None,
+        )
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row and self.ttl_s and now - row[1] > self.ttl_s:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value):
+        blob = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob.encode("utf-8")), now, now),
+            )
+            self._evict(now)
+            self._db.commit()
+
+    def _evict(self, now: float):
+        if self.ttl_s:
+            self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_s,))
+        if self.max_entries:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+        if self.max_bytes:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                doomed = []
+                for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY last_used ASC"):
+                    if total <= self.max_bytes:
+                        break
+                    doomed.append((key,))
+                    total -= size
+                self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_caches: dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(config: dict) -> ResponseCache | None:
+    """Process-wide ResponseCache for config's cache section, or None if disabled."""
+    cfg = config.get("cache", {}) or {}
+    if not cfg.get("enabled"):
+        return None
+    path = cfg.get("path", DEFAULT_CACHE_PATH)
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = ResponseCache.from_config(config)
+        return _caches[path]
+
+
+def get_verdict_store(config: dict) -> ResponseCache | None:
+    """Process-wide verdict store, on whenever the cache is enabled unless cache.verdicts is false.
+
+    Verdicts never expire or get evicted: the key already changes whenever
+    the judge, rubric, prompt or response does.
+    """
+    cfg = config.get("cache", {}) or {}
+    if not cfg.get("enabled") or cfg.get("verdicts") is False:
+        return None
+    path = cfg.get("verdict_path", DEFAULT_VERDICT_PATH)
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = ResponseCache(path)
+        return _caches[path]
+
+
+def is_deterministic(params: dict) -> bool:
+    return params.get("temperature") == 0
+
+
+class CachingProvider(Provider):
+    """Wraps a provider with a ResponseCache lookup.
+
+    Only deterministic (temperature 0) calls are cached unless sampled=True,
+    since replaying a sampled reply would silently defeat --rerun. Cache hits
+    are marked with usage["cached"] = True.
+    """
+
+    def __init__(self, inner: Provider, cache: ResponseCache, model_cfg: dict, sampled: bool = False):
+        self.inner = inner
+        self.cache = cache
+        self.model_cfg = model_cfg
+        self.sampled = sampled
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+    @property
+    def native_n(self) -> bool:
+        return getattr(self.inner, "native_n", False)
+
+    def _key(self, prompt: str, params: dict, sample: int = 0) -> str | None:
+        if not self.sampled and not is_deterministic(params):
+            return None
+        # Sample 0 shares its key with single-run calls; later samples get their own slot
+        return response_key(self.model_cfg, {**params, "_sample": sample} if sample else params, prompt)
+
+    def _hit(self, key):
+        cached = self.cache.get(key) if key else None
+        if cached is None:
+            return None
+        # A replay has no serving timings of its own
+        usage = {k: v for k, v in cached["usage"].items() if k not in STREAM_TIMING_FIELDS}
+        return cached["content"], {**usage, "cached": True}
+
+    def complete(self, prompt: str, params: dict) -> tuple[str, dict]:
+        key = self._key(prompt, params)
+        hit = self._hit(key)
+        if hit:
+            return hit
+        content, usage = self.inner.complete(prompt, params)
+        if key:
+            self.cache.put(key, {"content": content, "usage": usage})
+        return content, usage
+
+    def complete_n(self, prompt: str, params: dict, n: int) -> list[tuple[str, dict]]:
+        keys = [self._key(prompt, params, i) for i in range(max(1, n))]
+        if keys[0] is None:
+            return self.inner.complete_n(prompt, params, n)
+        samples = [self._hit(key) for key in keys]
+        missing = [i for i, hit in enumerate(samples) if hit is None]
+        if missing:
+            fresh = self.inner.complete_n(prompt, params, len(missing))
+            for i, (content, usage) in zip(missing, fresh):
+                self.cache.put(keys[i], {"content": content, "usage": usage})
+                samples[i] = (content, usage)
+        return samples
+
+    async def acomplete(self, prompt: str, params: dict) -> tuple[str, dict]:
+        key = self._key(prompt, params)
+        hit = self._hit(key)
+        if hit:
+            return hit
+        content, usage = await self.inner.acomplete(prompt, params)
+        if key:
+            self.cache.put(key, {"content": content, "usage": usage})
+        return content, usage
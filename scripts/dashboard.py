@@ -1,20 +1,33 @@
 """Generate a self-contained HTML dashboard from eval results."""
 
+import hashlib
 import html as html_mod
 import json
 import math
 import os
+import pickle
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import yaml
 
+from scripts import journal, stream
+from scripts.assets import prune_hashed, write_asset, write_if_changed
+from scripts.snapshot import LatestRuns, masked_mean
+from scripts.store import get_results_store
+
 RESULTS_DIR = "results"
 EVAL_FILE = "evals/general.json"
 DOCS_DIR = "docs"
 DASHBOARD_FILE = os.path.join(DOCS_DIR, "index.html")
 CONFIG_FILE = "config.yaml"
+# Per-model stats summaries, relative to RESULTS_DIR. Bump the version when
+# summarize_model / summarize_causal_model change shape or meaning.
+STATS_CACHE_FILE = os.path.join(".cache", "stats.json")
+STATS_CACHE_VERSION = 6
 
 # SEO base URL. Swap in a custom domain here + add docs/CNAME when moving off *.github.io.
 GITHUB_PAGES_BASE = "https://mark-allwyn.github.io/BenchPress"
@@ -134,18 +147,21 @@ def _slug_seo(slug: str) -> str:
     return _seo_head_html(slug, title, desc)
 
 
-def write_seo_assets(out_dir: str) -> None:
-    """Write robots.txt, sitemap.xml, favicon.svg alongside the generated HTML."""
+def write_seo_assets(out_dir: str, lastmod: str | None = None) -> None:
+    """Write robots.txt, sitemap.xml, favicon.svg alongside the generated HTML.
+
+    lastmod (YYYY-MM-DD, default today) is the sitemap's last-modified date.
+    Files are only rewritten when their content changes.
+    """
     os.makedirs(out_dir, exist_ok=True)
-    today = datetime.now().strftime("%Y-%m-%d")
+    today = lastmod or datetime.now().strftime("%Y-%m-%d")
 
     robots = (
         "User-agent: *\n"
         "Allow: /\n"
         f"Sitemap: {GITHUB_PAGES_BASE}/sitemap.xml\n"
     )
-    with open(os.path.join(out_dir, "robots.txt"), "w") as f:
-        f.write(robots)
+    write_if_changed(os.path.join(out_dir, "robots.txt"), robots.encode("utf-8"))
 
     pages = ["index.html", "generalist.html", "causal.html",
              "companies.html", "categories.html", "judges.html",
@@ -171,8 +187,7 @@ def write_seo_assets(out_dir: str) -> None:
         f"{urls_xml}"
         '</urlset>\n'
     )
-    with open(os.path.join(out_dir, "sitemap.xml"), "w") as f:
-        f.write(sitemap)
+    write_if_changed(os.path.join(out_dir, "sitemap.xml"), sitemap.encode("utf-8"))
 
     # Minimal inline SVG favicon: dark rounded square with a bar-chart mark.
     favicon = (
@@ -184,8 +199,7 @@ def write_seo_assets(out_dir: str) -> None:
         '<rect x="24" y="14" width="4" height="12" fill="#f59e0b"/>'
         '</svg>'
     )
-    with open(os.path.join(out_dir, "favicon.svg"), "w") as f:
-        f.write(favicon)
+    write_if_changed(os.path.join(out_dir, "favicon.svg"), favicon.encode("utf-8"))
 
 
 def load_config():
@@ -196,18 +210,139 @@ def load_config():
     return {}
 
 
+def _result_files():
+    """Model result snapshots, skipping comparison.json and *.pre-* historical backups.
+
+    A model whose first run is still only in its journal is listed by the
+    snapshot path it will be compacted to.
+    """
+    root = Path(RESULTS_DIR)
+    stems = {f.stem for f in root.glob("*.json")} | {f.stem for f in root.glob("*" + journal.JOURNAL_SUFFIX)}
+    return sorted(root / f"{stem}.json" for stem in stems
+                  if stem != "comparison" and ".pre-" not in stem)
+
+
+# The parts of a run that stats read; response text and judge rationales are skipped
+SUMMARY_RUN_SPEC = {
+    "error": None,
+    "latency_s": None,
+    "output_tokens": None,
+    "ttft_s": None,
+    "itl_s": None,
+    "tokens_per_s": None,
+    "auto_checks": None,
+    "judge_scores": {"*": {"score": None}},
+    "judge_score_avg": None,
+    "judge_count": None,
+    "deepeval_scores": None,
+    "deepeval_avg": None,
+}
+
+
+def _load_result_file(f):
+    """Latest run per prompt (SUMMARY_RUN_SPEC fields), including un-compacted journal entries."""
+    try:
+        return stream.load_latest(str(f), SUMMARY_RUN_SPEC)
+    except (ValueError, IOError) as e:
+        print(f"  Warning: skipping corrupt result file {f.name}: {e}")
+        return None
+
+
 def load_all_results():
-    """Load all model result files. Skips comparison.json and *.pre-* historical backups."""
+    """Load all model result files (latest runs only). Skips comparison.json and *.pre-* historical backups."""
     models = {}
-    for f in sorted(Path(RESULTS_DIR).glob("*.json")):
-        if f.stem == "comparison" or ".pre-" in f.stem:
+    for f in _result_files():
+        data = _load_result_file(f)
+        if data is not None:
+            models[f.stem] = data
+    return models
+
+
+def _fingerprint(path):
+    """(mtime, size) of the snapshot and of its journal, if present."""
+    fp = []
+    for p in (str(path), journal.journal_path(str(path))):
+        try:
+            st = os.stat(p)
+            fp += [st.st_mtime_ns, st.st_size]
+        except FileNotFoundError:
+            fp += [None, None]
+    return fp
+
+
+def _read_stats_cache(path):
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != STATS_CACHE_VERSION:
+        return {}
+    entries = cache.get("models", {})
+    for entry in entries.values():
+        # JSON turns the integer score buckets into strings
+        row = entry["summary"]["row"]
+        row["score_dist"] = {int(k): v for k, v in row["score_dist"].items()}
+    return entries
+
+
+def _write_stats_cache(path, entries):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"version": STATS_CACHE_VERSION, "models": entries}, f)
+    os.replace(tmp, path)
+
+
+def load_model_summaries(prompts, causal_prompts=None, composite_config=None, models_cfg=None, store=None):
+    """Per-model summaries for every results file, recomputing only what changed.
+
+    Each entry is cached in RESULTS_DIR/.cache/stats.json with the model's
+    fingerprint (mtime and size of its snapshot and journal) and a hash of the
+    inputs that shape it (prompt sets, composite weights, the model's
+    config). Unchanged models are served
+    from the cache without loading their results file, so regenerating the
+    dashboard after one eval costs O(changed models).
+
+    With a SQLite ResultsStore the fingerprint is the model's write version
+    and only its latest runs are read.
+
+    Returns {name: {"summary": summarize_model(...), "causal": row or None}}.
+    """
+    models_cfg = models_cfg or {}
+    cache_path = os.path.join(RESULTS_DIR, STATS_CACHE_FILE)
+    cached = _read_stats_cache(cache_path)
+    inputs = json.dumps([prompts, causal_prompts, composite_config], sort_keys=True, default=str)
+
+    entries = {}
+    dirty = False
+    sources = [(name, None) for name in store.list_models()] if store else [(f.stem, f) for f in _result_files()]
+    for name, f in sources:
+        fingerprint = store.fingerprint(name) if store else _fingerprint(f)
+        context = hashlib.sha256(
+            (inputs + json.dumps(models_cfg.get(name), sort_keys=True, default=str)).encode("utf-8")
+        ).hexdigest()
+        entry = cached.get(name)
+        if entry and entry["fingerprint"] == fingerprint and entry["context"] == context:
+            entries[name] = entry
             continue
+        data = store.load_latest(name) if store else _load_result_file(f)
+        if data is None:
+            continue
+        entries[name] = {
+            "fingerprint": fingerprint,
+            "context": context,
+            "summary": summarize_model(name, data, prompts, composite_config, models_cfg.get(name)),
+            "causal": summarize_causal_model(name, data, causal_prompts, models_cfg.get(name)) if causal_prompts else None,
+        }
+        dirty = True
+
+    if dirty or set(entries) != set(cached):
         try:
-            with open(f) as fh:
-                models[f.stem] = json.load(fh)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"  Warning: skipping corrupt result file {f.name}: {e}")
-    return models
+            _write_stats_cache(cache_path, entries)
+        except OSError as e:
+            print(f"  Warning: could not write stats cache: {e}")
+    return entries
 
 
 def load_prompts(eval_file=None):
@@ -221,263 +356,264 @@ def latest_run(model_data, pid):
     return runs[-1] if runs else {}
 
 
-def compute_stats(models, prompts, judge_models=None, composite_config=None, models_cfg=None):
-    """Compute all stats needed for the dashboard."""
+def _judge_order(valid):
+    """Judge columns with any score in valid (prompt x judge), in first-scored order."""
+    if not valid.any():
+        return []
+    first = valid.argmax(axis=0)
+    return sorted(np.flatnonzero(valid.any(axis=0)), key=lambda j: (first[j], j))
+
+
+def _composite(judge_weight, deepeval_weight, norm_judge, deepeval):
+    """Weighted judge/DeepEval composite, falling back to whichever is available."""
+    if norm_judge is not None and deepeval is not None:
+        return round(judge_weight * norm_judge + deepeval_weight * deepeval, 4)
+    if norm_judge is not None:
+        return round(norm_judge, 4)
+    if deepeval is not None:
+        return round(deepeval, 4)
+    return None
+
+
+def summarize_model(name, data, prompts, composite_config=None, model_cfg=None):
+    """Per-model part of compute_stats: everything that depends on one results file.
+
+    Returns {"row": leaderboard entry, "flags": {pid: flags},
+    "prompt_results": {pid: per-prompt entry}, "judge_scores": [[pid, judge,
+    score, deepeval_avg], ...]}. Summaries are what generate_dashboard caches
+    per model, so only changed files need loading and re-aggregating.
+    """
     judge_weight = (composite_config or {}).get("judge_weight", 0.5)
     deepeval_weight = (composite_config or {}).get("deepeval_weight", 0.5)
-    models_cfg = models_cfg or {}
+    mcfg = model_cfg or {}
     pids = [p["id"] for p in prompts]
     categories = sorted(set(p["category"] for p in prompts))
     cat_pids = {c: [p["id"] for p in prompts if p["category"] == c] for c in categories}
     difficulties = ["easy", "medium", "hard"]
     diff_pids = {d: [p["id"] for p in prompts if p["difficulty"] == d] for d in difficulties}
 
-    leaderboard = []
-    for name, data in models.items():
-        latencies, tokens, errors = [], [], 0
-        flagged = 0
-        de_scores_all = {"correctness": [], "coherence": [], "instruction_following": []}
-        de_avgs = []
-        runs_cache = {pid: latest_run(data, pid) for pid in pids}
-
-        # Per-judge score breakdown (compute first - used for avg_score)
-        judge_breakdown = {}
-        judge_cat_breakdown = {cat: {} for cat in categories}
-        judge_diff_breakdown = {d: {} for d in difficulties}
-        pid_to_cat = {p["id"]: p["category"] for p in prompts}
-        pid_to_diff = {p["id"]: p["difficulty"] for p in prompts}
-
-        for pid in pids:
-            run = runs_cache[pid]
-            if not run:
-                continue
-            if run.get("error"):
-                errors += 1
-                continue
-            if run.get("auto_checks", {}).get("flags"):
-                flagged += 1
-            latencies.append(run.get("latency_s", 0))
-            tokens.append(run.get("output_tokens", 0) or 0)
-            # DeepEval scores
-            de = run.get("deepeval_scores", {})
-            for metric_key in de_scores_all:
-                val = de.get(metric_key)
-                if val is not None:
-                    de_scores_all[metric_key].append(val)
-            de_avg = run.get("deepeval_avg")
-            if de_avg is not None:
-                de_avgs.append(de_avg)
-            # Collect per-judge scores (global, per-category, per-difficulty)
-            for jname, jdata in run.get("judge_scores", {}).items():
-                if jdata.get("score") is not None:
-                    sc = jdata["score"]
-                    judge_breakdown.setdefault(jname, []).append(sc)
-                    cat = pid_to_cat.get(pid)
-                    if cat:
-                        judge_cat_breakdown[cat].setdefault(jname, []).append(sc)
-                    diff = pid_to_diff.get(pid)
-                    if diff:
-                        judge_diff_breakdown[diff].setdefault(jname, []).append(sc)
-
-        judge_averages = {}
-        for jname, jscores in judge_breakdown.items():
-            judge_averages[jname] = round(sum(jscores) / len(jscores), 2) if jscores else None
-
-        # Count scorable prompts (non-error runs)
-        scorable = sum(1 for pid in pids if runs_cache[pid] and not runs_cache[pid].get("error"))
-
-        # Only include judges with complete coverage (scored every scorable prompt)
-        complete_judges = {
-            jname: javg for jname, javg in judge_averages.items()
-            if javg is not None and len(judge_breakdown[jname]) >= scorable
-        }
+    snap = LatestRuns({name: data}, pids)
+    present, ok = snap.present[0], snap.ok[0]
+    scores = snap.judge[0]  # (prompt, judge)
+    valid = ~np.isnan(scores) & ok[:, None]
+    cat_masks = {c: np.isin(pids, cat_pids[c]) for c in categories}
+    diff_masks = {d: np.isin(pids, diff_pids[d]) for d in difficulties}
+
+    errors = int((present & snap.error[0]).sum())
+    flagged = int((ok & snap.flagged[0]).sum())
+    latencies = snap.latency[0][ok & ~np.isnan(snap.latency[0])]
+    tokens = snap.output_tokens[0][ok]
+
+    # Per-judge score breakdown (compute first - used for avg_score)
+    judge_counts = valid.sum(axis=0)
+    judge_averages = {
+        snap.judges[j]: round(float(scores[valid[:, j], j].mean()), 2) for j in _judge_order(valid)
+    }
+
+    # Count scorable prompts (non-error runs)
+    scorable = int(ok.sum())
+
+    # Only include judges with complete coverage (scored every scorable prompt)
+    complete_idx = [j for j in _judge_order(valid) if judge_counts[j] >= scorable]
+    complete_judges = {snap.judges[j]: judge_averages[snap.judges[j]] for j in complete_idx}
+
+    # avg_score = mean of complete judges only (fair comparison)
+    cj_values = list(complete_judges.values())
+    avg_s = sum(cj_values) / len(cj_values) if cj_values else 0
+    scored_count = scorable
+
+    total = int(present.sum())
+    avg_l = float(latencies.mean()) if latencies.size else 0
+    avg_t = float(tokens.mean()) if tokens.size else 0
+    median_l = float(np.sort(latencies)[latencies.size // 2]) if latencies.size else 0
+
+    # Serving speed from streamed runs (None if the model was never streamed)
+    def streamed(values, digits):
+        mean = masked_mean(values, ok)
+        return None if np.isnan(mean) else round(float(mean), digits)
+    ttfts = snap.ttft[0][ok & ~np.isnan(snap.ttft[0])]
+    avg_ttft = streamed(snap.ttft[0], 2)
+    median_ttft = round(float(np.median(ttfts)), 2) if ttfts.size else None
+    avg_itl_ms = streamed(snap.itl[0] * 1000, 1)
+    avg_tps = streamed(snap.tokens_per_s[0], 1)
+
+    # Judge agreement (std dev) - only from complete judges
+    if len(cj_values) >= 2:
+        mean_ja = sum(cj_values) / len(cj_values)
+        judge_std_dev = round((sum((x - mean_ja) ** 2 for x in cj_values) / len(cj_values)) ** 0.5, 2)
+    else:
+        judge_std_dev = None
+
+    def group_scores(mask):
+        """Judge mean, DeepEval mean and composite for the prompts in mask."""
+        # Only include judges that scored every scorable prompt in the group
+        gvalid = valid & mask[:, None]
+        need = int((ok & mask).sum())
+        ja_vals = [float(scores[gvalid[:, j], j].mean()) for j in _judge_order(gvalid) if gvalid[:, j].sum() >= need]
+        judge = round(sum(ja_vals) / len(ja_vals), 2) if ja_vals else None
+        de = masked_mean(snap.deepeval_avg[0], present & mask)
+        de = None if np.isnan(de) else round(float(de), 2)
+        nj = (judge - 1) / 4 if judge is not None else None
+        return judge, de, _composite(judge_weight, deepeval_weight, nj, de)
+
+    # Category and difficulty scores: mean of complete judges only per group
+    cat_scores, cat_deepeval, cat_composite = {}, {}, {}
+    for cat in categories:
+        cat_scores[cat], cat_deepeval[cat], cat_composite[cat] = group_scores(cat_masks[cat])
+    diff_scores, diff_deepeval, diff_composite = {}, {}, {}
+    for d in difficulties:
+        diff_scores[d], diff_deepeval[d], diff_composite[d] = group_scores(diff_masks[d])
+
+    # Judge vs DeepEval divergence (complete judges only)
+    # For each prompt, compute mean of complete judges' scores, normalize, compare to deepeval
+    cj_mean = masked_mean(scores[:, complete_idx], valid[:, complete_idx], axis=1)
+    div_rows = ok & ~np.isnan(snap.deepeval_avg[0]) & ~np.isnan(cj_mean)
+    divergences = np.abs((cj_mean[div_rows] - 1) / 4 - snap.deepeval_avg[0][div_rows])
+    avg_divergence = round(float(divergences.mean()), 4) if divergences.size else None
+
+    # Score distribution from complete judges only (integer 1-5)
+    buckets = np.clip(np.round(scores[:, complete_idx][valid[:, complete_idx]]), 1, 5).astype(int)
+    counts = np.bincount(buckets, minlength=6)
+    dist = {b: int(counts[b]) for b in range(1, 6)}
+
+    # Efficiency = score / log2(avg_tokens) - rewards high scores with fewer tokens
+    if avg_s > 0 and avg_t > 1:
+        efficiency = round(avg_s / math.log2(avg_t), 2)
+    else:
+        efficiency = 0
 
-        # avg_score = mean of complete judges only (fair comparison)
-        cj_values = list(complete_judges.values())
-        avg_s = sum(cj_values) / len(cj_values) if cj_values else 0
-        scored_count = scorable
+    # DeepEval averages
+    de_avg_all = masked_mean(snap.deepeval_avg[0], ok)
+    deepeval_avg = None if np.isnan(de_avg_all) else round(float(de_avg_all), 4)
+    deepeval_metrics = {}
+    for metric_key in ("correctness", "coherence", "instruction_following"):
+        val = masked_mean(snap.metric(metric_key)[0], ok)
+        deepeval_metrics[metric_key] = None if np.isnan(val) else round(float(val), 4)
 
-        total = sum(1 for pid in pids if runs_cache[pid])
-        avg_l = sum(latencies) / len(latencies) if latencies else 0
-        avg_t = sum(tokens) / len(tokens) if tokens else 0
-        median_l = sorted(latencies)[len(latencies) // 2] if latencies else 0
+    # Composite score: weighted average of normalized judge (0-1) and deepeval avg (0-1)
+    normalized_judge = (avg_s - 1) / 4 if cj_values else None
+    composite_score = _composite(judge_weight, deepeval_weight, normalized_judge, deepeval_avg)
 
-        # Judge agreement (std dev) - only from complete judges
-        if len(cj_values) >= 2:
-            mean_ja = sum(cj_values) / len(cj_values)
-            judge_std_dev = round((sum((x - mean_ja) ** 2 for x in cj_values) / len(cj_values)) ** 0.5, 2)
-        else:
-            judge_std_dev = None
-
-        # Category scores: mean of complete judges only per category
-        cat_scores = {}
-        cat_deepeval = {}
-        cat_composite = {}
-        cat_scorable = {cat: sum(1 for pid in cat_pids[cat] if runs_cache[pid] and not runs_cache[pid].get("error")) for cat in categories}
-        for cat in categories:
-            # Only include judges that scored every scorable prompt in this category
-            cat_ja_vals = []
-            for jname, jscores in judge_cat_breakdown[cat].items():
-                if jscores and len(jscores) >= cat_scorable[cat]:
-                    cat_ja_vals.append(sum(jscores) / len(jscores))
-            cat_scores[cat] = round(sum(cat_ja_vals) / len(cat_ja_vals), 2) if cat_ja_vals else None
-            # DeepEval per-category average
-            cat_de = [
-                runs_cache[pid].get("deepeval_avg")
-                for pid in cat_pids[cat]
-                if runs_cache[pid] and runs_cache[pid].get("deepeval_avg") is not None
-            ]
-            cat_deepeval[cat] = round(sum(cat_de) / len(cat_de), 2) if cat_de else None
-            # Per-category composite
-            cat_nj = (cat_scores[cat] - 1) / 4 if cat_scores[cat] is not None else None
-            cat_da = cat_deepeval[cat]
-            if cat_nj is not None and cat_da is not None:
-                cat_composite[cat] = round(judge_weight * cat_nj + deepeval_weight * cat_da, 4)
-            elif cat_nj is not None:
-                cat_composite[cat] = round(cat_nj, 4)
-            elif cat_da is not None:
-                cat_composite[cat] = round(cat_da, 4)
-            else:
-                cat_composite[cat] = None
-
-        # Difficulty scores: mean of complete judges only per difficulty
-        diff_scores = {}
-        diff_deepeval = {}
-        diff_composite = {}
-        diff_scorable = {d: sum(1 for pid in diff_pids[d] if runs_cache[pid] and not runs_cache[pid].get("error")) for d in difficulties}
-        for d in difficulties:
-            diff_ja_vals = []
-            for jname, jscores in judge_diff_breakdown[d].items():
-                if jscores and len(jscores) >= diff_scorable[d]:
-                    diff_ja_vals.append(sum(jscores) / len(jscores))
-            diff_scores[d] = round(sum(diff_ja_vals) / len(diff_ja_vals), 2) if diff_ja_vals else None
-            d_de = [
-                runs_cache[pid].get("deepeval_avg")
-                for pid in diff_pids[d]
-                if runs_cache[pid] and runs_cache[pid].get("deepeval_avg") is not None
-            ]
-            diff_deepeval[d] = round(sum(d_de) / len(d_de), 2) if d_de else None
-            d_nj = (diff_scores[d] - 1) / 4 if diff_scores[d] is not None else None
-            d_da = diff_deepeval[d]
-            if d_nj is not None and d_da is not None:
-                diff_composite[d] = round(judge_weight * d_nj + deepeval_weight * d_da, 4)
-            elif d_nj is not None:
-                diff_composite[d] = round(d_nj, 4)
-            elif d_da is not None:
-                diff_composite[d] = round(d_da, 4)
-            else:
-                diff_composite[d] = None
-
-        # Judge vs DeepEval divergence (complete judges only)
-        # For each prompt, compute mean of complete judges' scores, normalize, compare to deepeval
-        divergences = []
-        for pid in pids:
-            run = runs_cache[pid]
-            if run and not run.get("error"):
-                da = run.get("deepeval_avg")
-                if da is None:
-                    continue
-                cj_scores = []
-                for jname in complete_judges:
-                    jdata = run.get("judge_scores", {}).get(jname)
-                    if jdata and jdata.get("score") is not None:
-                        cj_scores.append(jdata["score"])
-                if cj_scores:
-                    js_mean = sum(cj_scores) / len(cj_scores)
-                    divergences.append(abs((js_mean - 1) / 4 - da))
-        avg_divergence = round(sum(divergences) / len(divergences), 4) if divergences else None
-
-        # Score distribution from complete judges only (integer 1-5)
-        dist = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-        for jname, jscores in judge_breakdown.items():
-            if jname in complete_judges:
-                for s in jscores:
-                    bucket = max(1, min(5, round(s)))
-                    dist[bucket] = dist.get(bucket, 0) + 1
-
-        # Efficiency = score / log2(avg_tokens) - rewards high scores with fewer tokens
-        if avg_s > 0 and avg_t > 1:
-            efficiency = round(avg_s / math.log2(avg_t), 2)
-        else:
-            efficiency = 0
-
-        # DeepEval averages
-        deepeval_avg = round(sum(de_avgs) / len(de_avgs), 4) if de_avgs else None
-        deepeval_metrics = {}
-        for metric_key, vals in de_scores_all.items():
-            deepeval_metrics[metric_key] = round(sum(vals) / len(vals), 4) if vals else None
-
-        # Composite score: weighted average of normalized judge (0-1) and deepeval avg (0-1)
-        normalized_judge = (avg_s - 1) / 4 if cj_values else None
-        if normalized_judge is not None and deepeval_avg is not None:
-            composite_score = round(judge_weight * normalized_judge + deepeval_weight * deepeval_avg, 4)
-        elif normalized_judge is not None:
-            composite_score = round(normalized_judge, 4)
-        elif deepeval_avg is not None:
-            composite_score = round(deepeval_avg, 4)
-        else:
-            composite_score = None
-
-        # Count prompts with non-None deepeval scores
-        de_scored = sum(
-            1 for pid in pids
-            if runs_cache[pid]
-            and not runs_cache[pid].get("error")
-            and runs_cache[pid].get("deepeval_scores")
-            and any(v is not None for v in runs_cache[pid]["deepeval_scores"].values())
-        )
+    # Count prompts with non-None deepeval scores
+    de_scored = int((ok & ~np.isnan(snap.deepeval[0]).all(axis=1)).sum())
 
+    row = {
+        "name": name,
         # Inject company and launch_date from config
-        mcfg = models_cfg.get(name, {})
-        company = mcfg.get("company", "Unknown")
-        launch_date = mcfg.get("launch_date")
-
-        leaderboard.append({
-            "name": name,
-            "company": company,
-            "launch_date": launch_date,
-            "last_updated": data.get("updated"),
-            "avg_score": round(avg_s, 2),
-            "scored": scored_count,
-            "de_scored": de_scored,
-            "total": total,
-            "errors": errors,
-            "flagged": flagged,
-            "avg_latency": round(avg_l, 1),
-            "median_latency": round(median_l, 1),
-            "avg_tokens": round(avg_t, 0),
-            "efficiency": efficiency,
-            "cat_scores": cat_scores,
-            "score_dist": dist,
-            "deepeval_avg": deepeval_avg,
-            "deepeval_metrics": deepeval_metrics,
-            "cat_deepeval": cat_deepeval,
-            "composite_score": composite_score,
-            "cat_composite": cat_composite,
-            "diff_scores": diff_scores,
-            "diff_deepeval": diff_deepeval,
-            "diff_composite": diff_composite,
-            "avg_divergence": avg_divergence,
-            "judge_averages": judge_averages,
-            "judge_std_dev": judge_std_dev,
-        })
+        "company": mcfg.get("company", "Unknown"),
+        "launch_date": mcfg.get("launch_date"),
+        "last_updated": data.get("updated"),
+        "avg_score": round(avg_s, 2),
+        "scored": scored_count,
+        "de_scored": de_scored,
+        "total": total,
+        "errors": errors,
+        "flagged": flagged,
+        "avg_latency": round(avg_l, 1),
+        "median_latency": round(median_l, 1),
+        "avg_ttft": avg_ttft,
+        "median_ttft": median_ttft,
+        "avg_itl_ms": avg_itl_ms,
+        "avg_tps": avg_tps,
+        "streamed": int(ttfts.size),
+        "loadtest": _latest_loadtest(data),
+        "avg_tokens": round(avg_t, 0),
+        "efficiency": efficiency,
+        "cat_scores": cat_scores,
+        "score_dist": dist,
+        "deepeval_avg": deepeval_avg,
+        "deepeval_metrics": deepeval_metrics,
+        "cat_deepeval": cat_deepeval,
+        "composite_score": composite_score,
+        "cat_composite": cat_composite,
+        "diff_scores": diff_scores,
+        "diff_deepeval": diff_deepeval,
+        "diff_composite": diff_composite,
+        "avg_divergence": avg_divergence,
+        "judge_averages": judge_averages,
+        "judge_std_dev": judge_std_dev,
+    }
+
+    # Per-prompt flags, prompt-level results and raw judge scores feed the
+    # cross-model tables in aggregate_stats()
+    flags = {}
+    prompt_results = {}
+    judge_scores = []
+    for pid, run in zip(pids, snap.runs[0]):
+        if not run:
+            continue
+        fl = [f for f in run.get("auto_checks", {}).get("flags", [])
+              if not f.startswith("API_ERROR") and f != "EMPTY_RESPONSE"]
+        if fl:
+            flags[pid] = fl
+        if run.get("error"):
+            prompt_results[pid] = {
+                "judge_score": None,
+                "deepeval_avg": None,
+                "latency_s": 0,
+                "error": True,
+                "flags": [],
+            }
+            continue
+        prompt_results[pid] = {
+            "judge_score": run.get("judge_score_avg"),
+            "judge_scores": {j: {"score": js.get("score")} for j, js in run.get("judge_scores", {}).items()},
+            "judge_count": run.get("judge_count", 0),
+            "deepeval_avg": run.get("deepeval_avg"),
+            "latency_s": round(run.get("latency_s", 0), 1),
+            "error": False,
+            "flags": run.get("auto_checks", {}).get("flags", []),
+        }
+        for jname, jdata in run.get("judge_scores", {}).items():
+            if jdata.get("score") is not None:
+                judge_scores.append([pid, jname, jdata["score"], run.get("deepeval_avg")])
+
+    return {"row": row, "flags": flags, "prompt_results": prompt_results, "judge_scores": judge_scores}
+
+
+# Per-level fields of a stored load curve that the dashboard charts
+LOADTEST_LEVEL_FIELDS = ("concurrency", "latency_p50", "latency_p95", "latency_p99",
+                         "error_rate", "tokens_per_s", "ttft_p50")
+
+
+def _latest_loadtest(data: dict) -> dict | None:
+    """The model's most recent `run.py loadtest` curve, trimmed to what the chart uses."""
+    curves = data.get("loadtests") or []
+    if not curves:
+        return None
+    curve = curves[-1]
+    return {
+        "timestamp": curve.get("timestamp"),
+        "streamed": curve.get("streamed", False),
+        "levels": [{k: level.get(k) for k in LOADTEST_LEVEL_FIELDS} for level in curve.get("levels", [])],
+    }
+
 
+def compute_stats(models, prompts, judge_models=None, composite_config=None, models_cfg=None):
+    """Compute all stats needed for the dashboard."""
+    models_cfg = models_cfg or {}
+    summaries = {
+        name: summarize_model(name, data, prompts, composite_config, models_cfg.get(name))
+        for name, data in models.items()
+    }
+    return aggregate_stats(summaries, prompts, judge_models=judge_models)
+
+
+def aggregate_stats(summaries, prompts, judge_models=None):
+    """Combine per-model summaries (see summarize_model) into the dashboard stats."""
+    pids = [p["id"] for p in prompts]
+    categories = sorted(set(p["category"] for p in prompts))
+    difficulties = ["easy", "medium", "hard"]
+
+    leaderboard = [s["row"] for s in summaries.values()]
     leaderboard.sort(key=lambda x: (x["scored"] > 0, x["composite_score"] or 0), reverse=True)
 
     # Per-prompt flags
     flags = []
-    for pid in pids:
-        p = next(p for p in prompts if p["id"] == pid)
-        row = {}
-        for name in models:
-            run = latest_run(models[name], pid)
-            if run:
-                fl = [f for f in run.get("auto_checks", {}).get("flags", [])
-                      if not f.startswith("API_ERROR") and f != "EMPTY_RESPONSE"]
-                if fl:
-                    row[name] = fl
+    for p in prompts:
+        row = {name: s["flags"][p["id"]] for name, s in summaries.items() if p["id"] in s["flags"]}
         if row:
-            flags.append({"id": pid, "subcategory": p["subcategory"], "models": row})
+            flags.append({"id": p["id"], "subcategory": p["subcategory"], "models": row})
 
     companies = sorted(set(m.get("company", "Unknown") for m in leaderboard))
 
@@ -490,28 +626,9 @@ def compute_stats(models, prompts, judge_models=None, composite_config=None, mod
             "subcategory": p["subcategory"],
             "difficulty": p["difficulty"],
             "prompt_text": p["prompt"][:200],
-            "models": {},
+            "models": {name: s["prompt_results"][p["id"]]
+                       for name, s in summaries.items() if p["id"] in s["prompt_results"]},
         }
-        for name, data in models.items():
-            run = latest_run(data, p["id"])
-            if run and not run.get("error"):
-                pr["models"][name] = {
-                    "judge_score": run.get("judge_score_avg"),
-                    "judge_scores": run.get("judge_scores", {}),
-                    "judge_count": run.get("judge_count", 0),
-                    "deepeval_avg": run.get("deepeval_avg"),
-                    "latency_s": round(run.get("latency_s", 0), 1),
-                    "error": False,
-                    "flags": run.get("auto_checks", {}).get("flags", []),
-                }
-            elif run and run.get("error"):
-                pr["models"][name] = {
-                    "judge_score": None,
-                    "deepeval_avg": None,
-                    "latency_s": 0,
-                    "error": True,
-                    "flags": [],
-                }
         prompt_results.append(pr)
 
     # --- Per-judge global aggregations ---
@@ -526,46 +643,37 @@ def compute_stats(models, prompts, judge_models=None, composite_config=None, mod
     # For pairwise: prompt_key -> {judge: score}
     prompt_judge_map = {}  # (model, pid) -> {judge: score}
 
-    for name, data in models.items():
-        for pid in pids:
-            run = latest_run(data, pid)
-            if not run or run.get("error"):
-                continue
+    for name, summary in summaries.items():
+        for pid, jname, sc, de_avg in summary["judge_scores"]:
             p_info = prompt_lookup.get(pid, {})
             cat = p_info.get("category", "")
             diff = p_info.get("difficulty", "")
-            de_avg = run.get("deepeval_avg")
 
-            for jname, jdata in run.get("judge_scores", {}).items():
-                sc = jdata.get("score")
-                if sc is None:
-                    continue
+            # Global
+            judge_all_scores.setdefault(jname, []).append(sc)
 
-                # Global
-                judge_all_scores.setdefault(jname, []).append(sc)
+            # By category
+            judge_cat_scores.setdefault(jname, {}).setdefault(cat, []).append(sc)
 
-                # By category
-                judge_cat_scores.setdefault(jname, {}).setdefault(cat, []).append(sc)
+            # By difficulty
+            judge_diff_scores.setdefault(jname, {}).setdefault(diff, []).append(sc)
 
-                # By difficulty
-                judge_diff_scores.setdefault(jname, {}).setdefault(diff, []).append(sc)
+            # By model
+            judge_model_scores.setdefault(jname, {}).setdefault(name, []).append(sc)
 
-                # By model
-                judge_model_scores.setdefault(jname, {}).setdefault(name, []).append(sc)
+            # Score distribution
+            if jname not in judge_score_dists:
+                judge_score_dists[jname] = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
+            judge_score_dists[jname][sc] = judge_score_dists[jname].get(sc, 0) + 1
 
-                # Score distribution
-                if jname not in judge_score_dists:
-                    judge_score_dists[jname] = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-                judge_score_dists[jname][sc] = judge_score_dists[jname].get(sc, 0) + 1
-
-                # DeepEval divergence per judge
-                if de_avg is not None:
-                    norm_sc = (sc - 1) / 4
-                    judge_deepeval_divs.setdefault(jname, []).append(abs(norm_sc - de_avg))
+            # DeepEval divergence per judge
+            if de_avg is not None:
+                norm_sc = (sc - 1) / 4
+                judge_deepeval_divs.setdefault(jname, []).append(abs(norm_sc - de_avg))
 
-                # Pairwise map
-                key = (name, pid)
-                prompt_judge_map.setdefault(key, {})[jname] = sc
+            # Pairwise map
+            key = (name, pid)
+            prompt_judge_map.setdefault(key, {})[jname] = sc
 
     # judge_global: each judge's global average
     judge_global = {}
@@ -593,28 +701,33 @@ def compute_stats(models, prompts, judge_models=None, composite_config=None, mod
         for mname, scores in models_map.items():
             judge_by_model[jname][mname] = round(sum(scores) / len(scores), 2)
 
-    # judge_pairwise: pairwise agreement between judges (matrix form)
+    # judge_pairwise: pairwise agreement between judges (matrix form), from a
+    # dense (model·prompt x judge) score matrix with NaN where a judge is missing
     all_judges = sorted(judge_all_scores.keys())
+    col = {jname: j for j, jname in enumerate(all_judges)}
+    score_matrix = np.full((len(prompt_judge_map), len(all_judges)), np.nan)
+    for row, jscores in enumerate(prompt_judge_map.values()):
+        for jname, sc in jscores.items():
+            score_matrix[row, col[jname]] = sc
+    scored = ~np.isnan(score_matrix)
+    overlap = scored.T.astype(int) @ scored.astype(int)  # (judge, judge) prompts both scored
+    abs_diff = np.abs(score_matrix[:, :, None] - score_matrix[:, None, :])
+    diff_sums = np.nansum(abs_diff, axis=0)
+    agree_counts = (abs_diff <= 1).sum(axis=0)  # NaN compares False
+
     judge_pairwise = {}
     judge_pairwise_matrix = {}  # (ja, jb) -> {avg_diff, agree_pct, n}
-    for i, ja in enumerate(all_judges):
-        for jb in all_judges:
-            if ja == jb:
+    for a, ja in enumerate(all_judges):
+        for b, jb in enumerate(all_judges):
+            if a == b:
                 judge_pairwise_matrix[(ja, jb)] = {"avg_diff": 0, "agree_pct": 100, "n": 0, "self": True}
                 continue
-            diffs_list = []
-            agree_count = 0
-            for key, jscores in prompt_judge_map.items():
-                if ja in jscores and jb in jscores:
-                    diff_val = abs(jscores[ja] - jscores[jb])
-                    diffs_list.append(diff_val)
-                    if diff_val <= 1:
-                        agree_count += 1
-            if diffs_list:
+            n = int(overlap[a, b])
+            if n:
                 judge_pairwise_matrix[(ja, jb)] = {
-                    "avg_diff": round(sum(diffs_list) / len(diffs_list), 2),
-                    "agree_pct": round(100 * agree_count / len(diffs_list)),
-                    "n": len(diffs_list),
+                    "avg_diff": round(float(diff_sums[a, b]) / n, 2),
+                    "agree_pct": round(100 * int(agree_counts[a, b]) / n),
+                    "n": n,
                     "self": False,
                 }
                 if ja < jb:
@@ -654,7 +767,7 @@ def compute_stats(models, prompts, judge_models=None, composite_config=None, mod
         "companies": companies,
         "flags": flags,
         "total_prompts": len(pids),
-        "total_models": len(models),
+        "total_models": len(summaries),
         "judge_models": judge_models or [],
         "generated": datetime.now().isoformat(),
         "difficulties": difficulties,
@@ -671,6 +784,74 @@ def compute_stats(models, prompts, judge_models=None, composite_config=None, mod
     }
 
 
+# data.json carries what every page needs for first paint; these sections are
+# written to separate shards under data/ and fetched only by the pages that use them
+DATA_SHARDS = {
+    "judges": [
+        "judge_global", "judge_by_category", "judge_by_difficulty", "judge_by_model",
+        "judge_pairwise", "judge_pairwise_matrix", "judge_score_distributions", "judge_vs_deepeval",
+    ],
+}
+
+# Rendered into the pages server-side and read by no page script, so they
+# are left out of the published payloads altogether
+SERVER_ONLY_KEYS = ("prompt_results", "biggest_disagreements", "flags")
+# Shards earlier builds wrote for those keys; removed from docs/data/ on the next build
+RETIRED_SHARDS = ("prompt_results", "disagreements", "flags")
+
+
+# How pages load the summary; generate_dashboard points it at the hashed file
+DATA_FETCH = "fetch('./data.json')"
+
+
+def _write_json_asset(out_dir, relpath, payload, alias=False):
+    """Write payload under its content-hashed name, dropping older generations.
+
+    alias=True also writes it under relpath itself. Returns the hashed path.
+    """
+    data = json.dumps(payload).encode("utf-8")
+    name = write_asset(out_dir, relpath, data, hashed=True)
+    prune_hashed(out_dir, relpath, keep=name)
+    if alias:
+        write_asset(out_dir, relpath, data)
+    return name
+
+
+def _pin_generated(path, payload):
+    """Reuse the "generated" timestamp of the payload at path if nothing else changed.
+
+    With the timestamp pinned, a regeneration that changes no numbers renders
+    byte-identical pages and payloads, so nothing on disk is rewritten.
+    Returns True if it was pinned.
+    """
+    try:
+        with open(path) as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if not isinstance(previous, dict) or "generated" not in previous:
+        return False
+    current = json.loads(json.dumps({k: v for k, v in payload.items() if k != "generated"}))
+    if {k: v for k, v in previous.items() if k != "generated"} != current:
+        return False
+    payload["generated"] = previous["generated"]
+    return True
+
+
+def split_stats(stats):
+    """Split stats into the data.json summary and {shard name: payload}.
+
+    The summary lists each shard's path (relative to the docs directory)
+    under "shards", which is how pages find them. SERVER_ONLY_KEYS go in
+    neither.
+    """
+    sharded = {key for keys in DATA_SHARDS.values() for key in keys}
+    summary = {k: v for k, v in stats.items() if k not in sharded and k not in SERVER_ONLY_KEYS}
+    summary["shards"] = {name: f"data/{name}.json" for name in DATA_SHARDS}
+    shards = {name: {k: stats[k] for k in keys if k in stats} for name, keys in DATA_SHARDS.items()}
+    return summary, shards
+
+
 def generate_html(stats, causal_stats=None):
     """Generate the full HTML dashboard."""
     # Inject causal accuracy into leaderboard entries
@@ -678,7 +859,6 @@ def generate_html(stats, causal_stats=None):
         causal_by_name = {m["name"]: m["accuracy"] for m in causal_stats["leaderboard"]}
         for m in stats["leaderboard"]:
             m["causal_accuracy"] = causal_by_name.get(m["name"])
-    data_json = json.dumps(stats)
 
     return f"""<!DOCTYPE html>
 <html lang="en">
@@ -2016,7 +2196,16 @@ def _leaderboard_row(i, m):
             detail_bars += f'<div style="display:flex;align-items:center;gap:0.5rem;margin-bottom:0.25rem"><span style="min-width:120px;font-size:0.75rem;color:var(--text2)">{jn}</span><div style="flex:1;max-width:200px;height:6px;background:var(--border);border-radius:3px;overflow:hidden"><div style="width:{bar_pct:.0f}%;height:100%;background:{bar_color};border-radius:3px"></div></div><span style="font-size:0.75rem;font-weight:600;color:{bar_color};min-width:3rem">{jv:.2f}/5</span></div>'
     # Chevron hint for expandable rows (shown next to judge score)
     chevron = '<span style="font-size:0.55rem;color:var(--text2);margin-left:3px;vertical-align:middle;transition:transform 0.2s" title="Click to see per-judge scores">&#9660;</span>' if detail_bars else ''
-    detail_row = f'<tr class="judge-detail-row" data-parent="{safe_name}" style="display:none;background:var(--surface2)"><td></td><td colspan="10" style="padding:0.6rem 0.75rem"><div style="font-size:0.7rem;text-transform:uppercase;letter-spacing:0.05em;color:var(--text2);margin-bottom:0.4rem">Per-Judge Scores</div>{detail_bars}</td></tr>' if detail_bars else ''
+    detail_row = f'<tr class="judge-detail-row" data-parent="{safe_name}" style="display:none;background:var(--surface2)"><td></td><td colspan="12" style="padding:0.6rem 0.75rem"><div style="font-size:0.7rem;text-transform:uppercase;letter-spacing:0.05em;color:var(--text2);margin-bottom:0.4rem">Per-Judge Scores</div>{detail_bars}</td></tr>' if detail_bars else ''
+
+    # Streaming speed: only models evaluated with --stream have it
+    ttft, tps = m.get("avg_ttft"), m.get("avg_tps")
+    ttft_str = f"{ttft:.2f}s" if ttft is not None else "-"
+    tps_str = f"{tps:.0f}" if tps is not None else "-"
+    ttft_data = f"{ttft}" if ttft is not None else "0"
+    tps_data = f"{tps}" if tps is not None else "0"
+    itl = m.get("avg_itl_ms")
+    ttft_tip = f' title="Median {m.get("median_ttft"):.2f}s, {itl:.0f} ms between tokens over {m.get("streamed", 0)} streamed runs"' if ttft is not None and itl is not None else ""
 
     # Per-row "as-of" date so users can see how fresh each evaluation is. Stored
     # as ISO timestamp; render as "Apr 27" if available.
@@ -2029,7 +2218,7 @@ def _leaderboard_row(i, m):
         except (ValueError, TypeError):
             pass
 
-    return f"""<tr class="model-row" data-rank="{i+1}" data-name="{safe_name}" data-company="{safe_company}" data-composite="{comp_data}" data-score="{m['avg_score']}" data-deepeval="{de_data}" data-causal="{causal_data}" data-errors="{m['errors']}" data-flags="{m['flagged']}" data-latency="{m['avg_latency']}" data-tokens="{m['avg_tokens']}" style="cursor:pointer">
+    return f"""<tr class="model-row" data-rank="{i+1}" data-name="{safe_name}" data-company="{safe_company}" data-composite="{comp_data}" data-score="{m['avg_score']}" data-deepeval="{de_data}" data-causal="{causal_data}" data-errors="{m['errors']}" data-flags="{m['flagged']}" data-latency="{m['avg_latency']}" data-ttft="{ttft_data}" data-tps="{tps_data}" data-tokens="{m['avg_tokens']}" style="cursor:pointer">
       <td><span class="rank {rank_cls}">{i+1}</span></td>
       <td style="font-weight:600">{safe_name}{asof_str}</td>
       <td style="color:var(--text2);font-size:0.8rem"><span class="company-dot" style="background:{company_clr}"></span>{safe_company}</td>
@@ -2040,6 +2229,8 @@ def _leaderboard_row(i, m):
       <td class="num">{errors_badge}</td>
       <td class="num col-detail">{flags_badge}</td>
       <td class="num col-detail">{m['avg_latency']:.1f}s</td>
+      <td class="num col-detail"{ttft_tip}>{ttft_str}</td>
+      <td class="num col-detail">{tps_str}</td>
       <td class="num col-detail">{m['avg_tokens']:.0f}</td>
     </tr>
     {detail_row}"""
@@ -2081,7 +2272,6 @@ def _flag_item(flag):
 
 def generate_categories_html(stats):
     """Generate the categories detail page."""
-    data_json = json.dumps(stats)
     categories = stats["categories"]
 
     # One-line summary of what each category measures, surfaced above each chart.
@@ -2451,8 +2641,6 @@ cats.forEach(cat => {{
 
 def generate_companies_html(stats):
     """Generate the companies analytics page."""
-    data_json = json.dumps(stats)
-
     # Build per-company model tables (server-side)
     company_models = {}
     for m in stats["leaderboard"]:
@@ -3992,8 +4180,6 @@ def generate_methodology_html(stats):
 
 def generate_judges_html(stats):
     """Generate the judges analysis page."""
-    data_json = json.dumps(stats)
-
     judge_global = stats.get("judge_global", {})
     judge_by_category = stats.get("judge_by_category", {})
     judge_by_difficulty = stats.get("judge_by_difficulty", {})
@@ -4457,6 +4643,8 @@ a{{color:#6c72ff}}</style></head>
 
 <script type="module">
 const DATA = await (await fetch('./data.json')).json();
+// Judge tables live in their own shard (see DATA.shards)
+Object.assign(DATA, await (await fetch('./' + DATA.shards.judges)).json());
 const COLORS = [
   '#6c72ff', '#4ecdc4', '#f97316', '#22c55e', '#ec4899',
   '#eab308', '#8b5cf6', '#06b6d4', '#ef4444', '#84cc16'
@@ -4659,83 +4847,93 @@ const judges = Object.keys(DATA.judge_global || {{}}).sort();
 </html>"""
 
 
+CAUSAL_VARIANTS = ["base", "trap", "transfer", "numeric", "analyst"]
+
+
+def summarize_causal_model(name, data, prompts, model_cfg=None):
+    """One model's causal leaderboard row (the per-model part of compute_causal_stats)."""
+    bundles = sorted(set(p.get("bundle_id", "") for p in prompts))
+    variants = CAUSAL_VARIANTS
+    correct = 0
+    total_answered = 0
+    invalid = 0
+    errors = 0
+    variant_correct = {v: 0 for v in variants}
+    variant_total = {v: 0 for v in variants}
+    bundle_scores = {}
+
+    for p in prompts:
+        pid = p["id"]
+        runs = data.get("runs", {}).get(pid, [])
+        run = runs[-1] if runs else {}
+        if not run:
+            continue
+        if run.get("error"):
+            errors += 1
+            continue
+        total_answered += 1
+        auto = run.get("auto_checks", {}).get("auto_scores", {})
+        extracted = auto.get("extracted_answer")
+        if extracted is None:
+            invalid += 1
+            continue
+        is_correct = auto.get("correct", 0) == 1
+        if is_correct:
+            correct += 1
+        v = p.get("variant", "")
+        if v in variant_total:
+            variant_total[v] += 1
+            if is_correct:
+                variant_correct[v] += 1
+        bid = p.get("bundle_id", "")
+        if bid:
+            bundle_scores.setdefault(bid, {"correct": 0, "total": 0})
+            bundle_scores[bid]["total"] += 1
+            if is_correct:
+                bundle_scores[bid]["correct"] += 1
+
+    valid = total_answered - invalid
+    accuracy = round(correct / valid, 4) if valid else 0
+    variant_accuracy = {}
+    for v in variants:
+        variant_accuracy[v] = round(variant_correct[v] / variant_total[v], 4) if variant_total[v] else None
+    bundle_consistency = {}
+    for b in bundles:
+        bs = bundle_scores.get(b, {"correct": 0, "total": 0})
+        bundle_consistency[b] = {"correct": bs["correct"], "total": bs["total"]}
+
+    mcfg = model_cfg or {}
+    return {
+        "name": name,
+        "company": mcfg.get("company", "Unknown"),
+        "model_type": mcfg.get("type", "unknown"),
+        "accuracy": accuracy,
+        "correct": correct,
+        "valid": valid,
+        "total": total_answered,
+        "invalid": invalid,
+        "errors": errors,
+        "variant_accuracy": variant_accuracy,
+        "bundle_consistency": bundle_consistency,
+    }
+
+
 def compute_causal_stats(models, prompts, models_cfg=None):
     """Compute stats for the causal reasoning benchmark with bundle/variant structure."""
     models_cfg = models_cfg or {}
     if not prompts:
         return None
+    rows = {name: summarize_causal_model(name, data, prompts, models_cfg.get(name)) for name, data in models.items()}
+    return aggregate_causal_stats(rows, prompts)
 
-    bundles = sorted(set(p.get("bundle_id", "") for p in prompts))
-    variants = ["base", "trap", "transfer", "numeric", "analyst"]
-    bundle_pids = {b: [p["id"] for p in prompts if p.get("bundle_id") == b] for b in bundles}
-    variant_pids = {v: [p["id"] for p in prompts if p.get("variant") == v] for v in variants}
-
-    leaderboard = []
-    for name, data in models.items():
-        correct = 0
-        total_answered = 0
-        invalid = 0
-        errors = 0
-        variant_correct = {v: 0 for v in variants}
-        variant_total = {v: 0 for v in variants}
-        bundle_scores = {}
-
-        for p in prompts:
-            pid = p["id"]
-            runs = data.get("runs", {}).get(pid, [])
-            run = runs[-1] if runs else {}
-            if not run:
-                continue
-            if run.get("error"):
-                errors += 1
-                continue
-            total_answered += 1
-            auto = run.get("auto_checks", {}).get("auto_scores", {})
-            extracted = auto.get("extracted_answer")
-            if extracted is None:
-                invalid += 1
-                continue
-            is_correct = auto.get("correct", 0) == 1
-            if is_correct:
-                correct += 1
-            v = p.get("variant", "")
-            if v in variant_total:
-                variant_total[v] += 1
-                if is_correct:
-                    variant_correct[v] += 1
-            bid = p.get("bundle_id", "")
-            if bid:
-                bundle_scores.setdefault(bid, {"correct": 0, "total": 0})
-                bundle_scores[bid]["total"] += 1
-                if is_correct:
-                    bundle_scores[bid]["correct"] += 1
-
-        valid = total_answered - invalid
-        accuracy = round(correct / valid, 4) if valid else 0
-        variant_accuracy = {}
-        for v in variants:
-            variant_accuracy[v] = round(variant_correct[v] / variant_total[v], 4) if variant_total[v] else None
-        bundle_consistency = {}
-        for b in bundles:
-            bs = bundle_scores.get(b, {"correct": 0, "total": 0})
-            bundle_consistency[b] = {"correct": bs["correct"], "total": bs["total"]}
-
-        mcfg = models_cfg.get(name, {})
-        leaderboard.append({
-            "name": name,
-            "company": mcfg.get("company", "Unknown"),
-            "model_type": mcfg.get("type", "unknown"),
-            "accuracy": accuracy,
-            "correct": correct,
-            "valid": valid,
-            "total": total_answered,
-            "invalid": invalid,
-            "errors": errors,
-            "variant_accuracy": variant_accuracy,
-            "bundle_consistency": bundle_consistency,
-        })
 
-    leaderboard = [m for m in leaderboard if m["total"] > 0]
+def aggregate_causal_stats(rows, prompts):
+    """Combine per-model causal rows (see summarize_causal_model) into causal stats."""
+    if not prompts:
+        return None
+    bundles = sorted(set(p.get("bundle_id", "") for p in prompts))
+    variants = list(CAUSAL_VARIANTS)
+    leaderboard = [m for m in rows.values() if m["total"] > 0]
     leaderboard.sort(key=lambda x: x["accuracy"], reverse=True)
 
     return {
@@ -4976,11 +5174,26 @@ Chart.defaults.font.family = "-apple-system, sans-serif";
 </html>"""
 
 
+def _loadtest_card(lb):
+    """Load-curve charts for models with a stored `run.py loadtest`; empty if none have one."""
+    tested = [m["name"] for m in lb if m.get("loadtest")]
+    if not tested:
+        return ""
+    return f"""<!-- Load curves: latency and throughput under concurrency -->
+  <div class="card" style="margin-top:1rem">
+    <h2>Load Curves <span class="info-tip" data-info="From run.py loadtest: eval prompts replayed at stepped concurrency straight against each endpoint (no rate limiting or retries). Hover a point for p50/p95/p99 latency and error rate.">?</span></h2>
+    <p style="color:var(--text2);font-size:0.85rem;margin:-0.5rem 0 1rem">{len(tested)} model(s) load-tested. Tail latency and aggregate output tokens/sec per concurrency level.</p>
+    <div class="grid-2">
+      <div class="chart-container"><canvas id="loadLatencyChart"></canvas></div>
+      <div class="chart-container"><canvas id="loadThroughputChart"></canvas></div>
+    </div>
+  </div>"""
+
+
 def generate_generalist_html(stats):
     """Generate the Generalist benchmark detail page. Owns the full leaderboard,
     DeepEval breakdown, difficulty curve, score distribution, efficiency chart,
     and auto-check flags. Mirrors the structure of generate_causal_html()."""
-    data_json = json.dumps(stats)
     lb = stats["leaderboard"]
     total_models = stats["total_models"]
     total_prompts = stats["total_prompts"]
@@ -5096,6 +5309,8 @@ def generate_generalist_html(stats):
     <div class="chart-container"><canvas id="efficiencyChart"></canvas></div>
   </div>
 
+{_loadtest_card(lb)}
+
   <!-- Full leaderboard (the deep-dive table) -->
   <div class="card">
     <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:0.6rem;flex-wrap:wrap;gap:0.5rem">
@@ -5130,6 +5345,8 @@ def generate_generalist_html(stats):
             <th class="num" data-sort="errors" data-type="num"><span class="info-tip" data-info="API failures (rate limits, 4xx/5xx, timeouts).">Errors</span></th>
             <th class="num col-detail" data-sort="flags" data-type="num"><span class="info-tip" data-info="Auto-check heuristic flags (sycophancy, hallucination, format violations).">Flags</span></th>
             <th class="num col-detail" data-sort="latency" data-type="num">Avg Latency</th>
+            <th class="num col-detail" data-sort="ttft" data-type="num"><span class="info-tip" data-info="Time to first token, from streamed runs (eval --stream).">TTFT</span></th>
+            <th class="num col-detail" data-sort="tps" data-type="num"><span class="info-tip" data-info="Decode speed after the first token, from streamed runs (eval --stream).">Tok/s</span></th>
             <th class="num col-detail" data-sort="tokens" data-type="num">Avg Tokens</th>
           </tr>
         </thead>
@@ -5236,6 +5453,40 @@ new Chart(document.getElementById('efficiencyChart'), {{
   options: {{ responsive: true, maintainAspectRatio: false, plugins: {{ legend: {{ display: false }} }}, scales: {{ y: {{ beginAtZero: true, title: {{ display: true, text: 'Efficiency (avg judge / log2 tokens)' }} }}, x: {{ ticks: {{ maxRotation: 45, font: {{ size: 11 }} }} }} }} }}
 }});
 
+// Load curves (only rendered when some model has a loadtest)
+(function () {{
+  const latEl = document.getElementById('loadLatencyChart');
+  if (!latEl) return;
+  const tested = lb.filter(m => m.loadtest && m.loadtest.levels.length);
+  const series = (field) => tested.map((m, i) => ({{
+    label: m.name,
+    data: m.loadtest.levels.filter(l => l[field] != null).map(l => ({{ x: l.concurrency, y: l[field], level: l }})),
+    borderColor: COLORS[i % COLORS.length], backgroundColor: COLORS[i % COLORS.length] + '66',
+    tension: 0.2, pointRadius: 3,
+  }}));
+  const tooltip = {{
+    callbacks: {{
+      label: ctx => {{
+        const l = ctx.raw.level;
+        const lat = l.latency_p50 != null ? `p50 ${{l.latency_p50.toFixed(2)}}s, p95 ${{l.latency_p95.toFixed(2)}}s, p99 ${{l.latency_p99.toFixed(2)}}s` : 'no successes';
+        return `${{ctx.dataset.label}} x${{l.concurrency}}: ${{lat}}, ${{Math.round(l.tokens_per_s || 0)}} tok/s, ${{(l.error_rate * 100).toFixed(0)}}% errors`;
+      }}
+    }}
+  }};
+  const xScale = {{ type: 'logarithmic', title: {{ display: true, text: 'Concurrent requests' }}, ticks: {{ callback: v => Number.isInteger(Math.log2(v)) ? v : '' }} }};
+  const legend = {{ position: 'bottom', labels: {{ boxWidth: 12, padding: 12, font: {{ size: 11 }} }} }};
+  new Chart(latEl, {{
+    type: 'line',
+    data: {{ datasets: series('latency_p95') }},
+    options: {{ responsive: true, maintainAspectRatio: false, plugins: {{ legend, tooltip }}, scales: {{ x: xScale, y: {{ beginAtZero: true, title: {{ display: true, text: 'p95 latency (s)' }} }} }} }}
+  }});
+  new Chart(document.getElementById('loadThroughputChart'), {{
+    type: 'line',
+    data: {{ datasets: series('tokens_per_s') }},
+    options: {{ responsive: true, maintainAspectRatio: false, plugins: {{ legend, tooltip }}, scales: {{ x: xScale, y: {{ beginAtZero: true, title: {{ display: true, text: 'Aggregate output tokens/sec' }} }} }} }}
+  }});
+}})();
+
 // Difficulty chart
 const top5 = lb.slice(0, 5);
 const diffs = ['easy','medium','hard'];
@@ -5277,21 +5528,60 @@ document.querySelectorAll('details').forEach(d => {{
 </html>"""
 
 
+# Page file -> renderer(stats, causal_stats)
+PAGES = {
+    "index.html": lambda stats, causal_stats: generate_html(stats, causal_stats=causal_stats),
+    "categories.html": lambda stats, causal_stats: generate_categories_html(stats),
+    "companies.html": lambda stats, causal_stats: generate_companies_html(stats),
+    "methodology.html": lambda stats, causal_stats: generate_methodology_html(stats),
+    "judges.html": lambda stats, causal_stats: generate_judges_html(stats),
+    "causal.html": lambda stats, causal_stats: generate_causal_html(causal_stats, stats),
+    "generalist.html": lambda stats, causal_stats: generate_generalist_html(stats),
+}
+
+_render_state = {}
+
+
+def _init_render_worker(payload):
+    _render_state.update(pickle.loads(payload))
+
+
+def _render_page(filename):
+    return PAGES[filename](_render_state["stats"], _render_state["causal_stats"])
+
+
+def render_pages(stats, causal_stats=None, workers=1):
+    """Render every page in PAGES; returns {filename: html}.
+
+    With workers > 1 the pages render concurrently in a process pool. Stats
+    are pickled once and handed to each worker at startup rather than sent
+    with every page.
+    """
+    if workers <= 1:
+        return {name: render(stats, causal_stats) for name, render in PAGES.items()}
+    payload = pickle.dumps({"stats": stats, "causal_stats": causal_stats})
+    with ProcessPoolExecutor(max_workers=min(workers, len(PAGES)),
+                             initializer=_init_render_worker, initargs=(payload,)) as pool:
+        return dict(zip(PAGES, pool.map(_render_page, PAGES)))
+
+
 def generate_dashboard(output_path=None):
     """Main entry point - generate dashboard HTML files."""
     if output_path is None:
         output_path = DASHBOARD_FILE
 
-    if not Path(RESULTS_DIR).exists():
+    config = load_config()
+    rcfg = config.get("results") or {}
+    store = None
+    if rcfg.get("backend", "json") == "sqlite":
+        store = get_results_store(rcfg.get("path", os.path.join(RESULTS_DIR, "results.sqlite")))
+    elif not Path(RESULTS_DIR).exists():
         print("No results directory found.")
         return None
-
-    models = load_all_results()
-    if not models:
+    elif not _result_files():
         print("No model results found.")
         return None
 
-    config = load_config()
     judges_cfg = config.get("judges", [])
     judge_models = [j["model"] for j in judges_cfg]
 
@@ -5301,22 +5591,30 @@ def generate_dashboard(output_path=None):
     prompts = load_prompts(general_file)
     composite_config = config.get("composite", {})
     models_cfg = config.get("models", {})
-    stats = compute_stats(models, prompts, judge_models=judge_models, composite_config=composite_config, models_cfg=models_cfg)
 
     # Causal benchmark (optional)
     causal_file = benchmarks.get("causal") if benchmarks else None
+    causal_prompts = load_prompts(causal_file) if causal_file and Path(causal_file).exists() else None
+
+    entries = load_model_summaries(prompts, causal_prompts, composite_config=composite_config,
+                                   models_cfg=models_cfg, store=store)
+    if not entries:
+        print("No model results found.")
+        return None
+
+    stats = aggregate_stats({n: e["summary"] for n, e in entries.items()}, prompts, judge_models=judge_models)
+
     causal_stats = None
-    if causal_file and Path(causal_file).exists():
-        causal_prompts = load_prompts(causal_file)
+    if causal_prompts is not None:
         skip_causal = set(
             (config.get("eval", {}).get("benchmark_scoring", {}).get("causal", {}) or {})
             .get("skip_models", []) or []
         )
-        causal_models = {n: d for n, d in models.items() if n not in skip_causal}
-        causal_stats = compute_causal_stats(causal_models, causal_prompts, models_cfg=models_cfg)
+        causal_rows = {n: e["causal"] for n, e in entries.items() if n not in skip_causal}
+        causal_stats = aggregate_causal_stats(causal_rows, causal_prompts)
         if causal_stats is not None:
             # Annotate skipped models so the causal page can show them with reasons
-            causal_stats["skipped"] = sorted([m for m in skip_causal if m in models])
+            causal_stats["skipped"] = sorted([m for m in skip_causal if m in entries])
 
     # Ensure output directory exists
     out_dir = os.path.dirname(output_path)
@@ -5332,57 +5630,37 @@ def generate_dashboard(output_path=None):
             m["causal_accuracy"] = causal_by_name.get(m["name"])
 
     # Shared dataset for the 5 leaderboard pages. Pages fetch this on load instead
-    # of inlining ~6 MB into every HTML file. Cuts each page from 6.8 MB to ~50 KB.
-    data_json_path = os.path.join(out_dir or ".", "data.json")
-    with open(data_json_path, "w") as f:
-        json.dump(stats, f)
-    causal_data_path = os.path.join(out_dir or ".", "causal-data.json")
-    with open(causal_data_path, "w") as f:
-        json.dump(causal_stats or {}, f)
-
-    # Main dashboard
-    html = generate_html(stats, causal_stats=causal_stats)
-    with open(output_path, "w") as f:
-        f.write(html)
-
-    # Categories page
-    cat_path = os.path.join(out_dir or ".", "categories.html")
-    cat_html = generate_categories_html(stats)
-    with open(cat_path, "w") as f:
-        f.write(cat_html)
-
-    # Companies page
-    companies_path = os.path.join(out_dir or ".", "companies.html")
-    companies_html = generate_companies_html(stats)
-    with open(companies_path, "w") as f:
-        f.write(companies_html)
-
-    # Methodology page
-    meth_path = os.path.join(out_dir or ".", "methodology.html")
-    meth_html = generate_methodology_html(stats)
-    with open(meth_path, "w") as f:
-        f.write(meth_html)
-
-    # Judges page
-    judges_path = os.path.join(out_dir or ".", "judges.html")
-    judges_html = generate_judges_html(stats)
-    with open(judges_path, "w") as f:
-        f.write(judges_html)
-
-    # Causal reasoning page
-    causal_path = os.path.join(out_dir or ".", "causal.html")
-    causal_html = generate_causal_html(causal_stats, stats)
-    with open(causal_path, "w") as f:
-        f.write(causal_html)
-
-    # Generalist (general benchmark) detail page
-    gen_path = os.path.join(out_dir or ".", "generalist.html")
-    gen_html = generate_generalist_html(stats)
-    with open(gen_path, "w") as f:
-        f.write(gen_html)
+    # of inlining it into every HTML file. Only the summary is fetched up front;
+    # the judge tables are a shard that judges.html fetches. Per-prompt results,
+    # disagreements and flags are rendered into the HTML and not published.
+    # Payloads get content-hashed names (cacheable forever); data.json is also
+    # kept under its plain name for external readers. No page fetches
+    # causal-data.json, so it is written under its plain name only.
+    # Everything is written only if its bytes changed (see scripts/assets.py).
+    docs = out_dir or "."
+    summary, shards = split_stats(stats)
+    for name, payload in shards.items():
+        summary["shards"][name] = _write_json_asset(docs, summary["shards"][name], payload)
+    for name in RETIRED_SHARDS:
+        prune_hashed(docs, f"data/{name}.json")
+    # Shards are compared by their hashed names, so this holds only if no number moved
+    if _pin_generated(os.path.join(docs, "data.json"), summary):
+        stats["generated"] = summary["generated"]
+    data_name = _write_json_asset(docs, "data.json", summary, alias=True)
+    if causal_stats:
+        _pin_generated(os.path.join(docs, "causal-data.json"), causal_stats)
+    write_asset(docs, "causal-data.json", json.dumps(causal_stats or {}).encode("utf-8"))
+    prune_hashed(docs, "causal-data.json")
+
+    workers = (config.get("dashboard") or {}).get("workers", 1)
+    for filename, page in render_pages(stats, causal_stats, workers).items():
+        if filename == "index.html":
+            filename = os.path.basename(output_path)
+        page = page.replace(DATA_FETCH, f"fetch('./{data_name}')")
+        write_asset(docs, filename, page.encode("utf-8"))
 
     # Static SEO assets: robots.txt, sitemap.xml, favicon.svg
-    write_seo_assets(out_dir or ".")
+    write_seo_assets(docs, lastmod=stats["generated"][:10])
 
     return output_path
 
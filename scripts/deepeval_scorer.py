@@ -4,6 +4,8 @@ Uses DeepEval's G-Eval metrics to provide correctness, coherence, and
 instruction-following scores alongside the existing LLM judge.
 """
 
+from scripts.cache import verdict_key
+
 
 def _lazy_imports():
     """Import deepeval lazily so the module doesn't break when deepeval isn't installed."""
@@ -12,6 +14,30 @@ def _lazy_imports():
     return GEval, LLMTestCase, LLMTestCaseParams
 
 
+DEFAULT_METRICS = ["correctness", "coherence", "instruction_following"]
+
+METRIC_STEPS = {
+    "correctness": [
+        "Check whether the facts in 'actual output' contradict any facts in 'expected output'",
+        "Heavily penalize omission of important detail",
+        "Vague language or differing opinions are acceptable",
+        "Penalize hallucinated facts or fabricated references",
+    ],
+    "coherence": [
+        "Evaluate whether the response has a clear logical flow",
+        "Check that the response is well-structured and complete",
+        "Assess whether complex ideas are presented clearly",
+        "Identify any contradictions or confusing sections",
+    ],
+    "instruction_following": [
+        "Check whether the response addresses all parts of the input prompt",
+        "Verify adherence to any format, length, or constraint requirements in the context",
+        "Penalize responses that ignore specific instructions or criteria",
+        "Reward responses that follow implicit and explicit instructions precisely",
+    ],
+}
+
+
 # Metric definitions - each returns a 0-1 score
 
 def _build_correctness_metric(model_name: str):
@@ -19,12 +45,7 @@ def _build_correctness_metric(model_name: str):
     return GEval(
         name="Correctness",
         model=model_name,
-        evaluation_steps=[
-            "Check whether the facts in 'actual output' contradict any facts in 'expected output'",
-            "Heavily penalize omission of important detail",
-            "Vague language or differing opinions are acceptable",
-            "Penalize hallucinated facts or fabricated references",
-        ],
+        evaluation_steps=METRIC_STEPS["correctness"],
         evaluation_params=[
             LLMTestCaseParams.INPUT,
             LLMTestCaseParams.ACTUAL_OUTPUT,
@@ -38,12 +59,7 @@ def _build_coherence_metric(model_name: str):
     return GEval(
         name="Coherence",
         model=model_name,
-        evaluation_steps=[
-            "Evaluate whether the response has a clear logical flow",
-            "Check that the response is well-structured and complete",
-            "Assess whether complex ideas are presented clearly",
-            "Identify any contradictions or confusing sections",
-        ],
+        evaluation_steps=METRIC_STEPS["coherence"],
         evaluation_params=[
             LLMTestCaseParams.INPUT,
             LLMTestCaseParams.ACTUAL_OUTPUT,
@@ -56,12 +72,7 @@ def _build_instruction_following_metric(model_name: str):
     return GEval(
         name="Instruction Following",
         model=model_name,
-        evaluation_steps=[
-            "Check whether the response addresses all parts of the input prompt",
-            "Verify adherence to any format, length, or constraint requirements in the context",
-            "Penalize responses that ignore specific instructions or criteria",
-            "Reward responses that follow implicit and explicit instructions precisely",
-        ],
+        evaluation_steps=METRIC_STEPS["instruction_following"],
         evaluation_params=[
             LLMTestCaseParams.INPUT,
             LLMTestCaseParams.ACTUAL_OUTPUT,
@@ -70,13 +81,25 @@ def _build_instruction_following_metric(model_name: str):
     )
 
 
-def score_with_deepeval(prompt_meta: dict, response: str, config: dict) -> dict:
+METRIC_BUILDERS = {
+    "correctness": _build_correctness_metric,
+    "coherence": _build_coherence_metric,
+    "instruction_following": _build_instruction_following_metric,
+}
+
+
+def score_with_deepeval(prompt_meta: dict, response: str, config: dict,
+                        verdicts=None, pace=None) -> dict:
     """Score a response using DeepEval G-Eval metrics.
 
     Args:
         prompt_meta: Prompt metadata from eval set JSON
         response: The model's response text
         config: Full config dict (uses deepeval and judge sections)
+        verdicts: Optional verdict store; metric scores already recorded for
+            this evaluator, metric steps, prompt and response are reused
+        pace: Optional callable, called with the number of metrics that still
+            need an API call before any are measured
 
     Returns:
         {
@@ -86,7 +109,7 @@ def score_with_deepeval(prompt_meta: dict, response: str, config: dict) -> dict:
         On error, scores are None and deepeval_avg is None.
     """
     deepeval_cfg = config.get("deepeval", {})
-    enabled_metrics = deepeval_cfg.get("metrics", ["correctness", "coherence", "instruction_following"])
+    enabled_metrics = deepeval_cfg.get("metrics", DEFAULT_METRICS)
 
     # Use first configured judge model as evaluator, fallback to gpt-4.1
     judges_cfg = config.get("judges", [])
@@ -94,6 +117,41 @@ def score_with_deepeval(prompt_meta: dict, response: str, config: dict) -> dict:
     judge_model_name = judges_cfg[0].get("model", "gpt-4.1") if judges_cfg else "gpt-4.1"
     evaluator_model = models_cfg.get(judge_model_name, {}).get("model", "gpt-4.1")
 
+    scores = {}
+    todo = []
+    keys = {}
+    for metric_name in enabled_metrics:
+        if metric_name not in METRIC_BUILDERS:
+            continue
+        if verdicts is not None:
+            keys[metric_name] = verdict_key("deepeval", evaluator_model, METRIC_STEPS[metric_name],
+                                            prompt_meta, response, metric_name)
+            cached = verdicts.get(keys[metric_name])
+            if cached is not None:
+                scores[metric_name] = cached["score"]
+                continue
+        scores[metric_name] = None
+        todo.append(metric_name)
+
+    if todo:
+        if pace:
+            pace(len(todo))
+        scores.update(_measure(todo, evaluator_model, prompt_meta, response))
+        for metric_name in todo:
+            if metric_name in keys and scores[metric_name] is not None:
+                verdicts.put(keys[metric_name], {"score": scores[metric_name]})
+
+    valid_scores = [s for s in scores.values() if s is not None]
+    avg = round(sum(valid_scores) / len(valid_scores), 4) if valid_scores else None
+
+    return {
+        "deepeval_scores": scores,
+        "deepeval_avg": avg,
+    }
+
+
+def _measure(metric_names: list, evaluator_model: str, prompt_meta: dict, response: str) -> dict:
+    """Run the named G-Eval metrics; a metric that errors scores None."""
     _, LLMTestCase, _ = _lazy_imports()
 
     # Build test case
@@ -110,30 +168,13 @@ def score_with_deepeval(prompt_meta: dict, response: str, config: dict) -> dict:
         context=context,
     )
 
-    # Build requested metrics
-    metric_builders = {
-        "correctness": _build_correctness_metric,
-        "coherence": _build_coherence_metric,
-        "instruction_following": _build_instruction_following_metric,
-    }
-
     scores = {}
-    for metric_name in enabled_metrics:
-        builder = metric_builders.get(metric_name)
-        if not builder:
-            continue
+    for metric_name in metric_names:
         try:
-            metric = builder(evaluator_model)
+            metric = METRIC_BUILDERS[metric_name](evaluator_model)
             metric.measure(test_case)
             scores[metric_name] = round(metric.score, 4) if metric.score is not None else None
         except Exception as e:
             print(f"      DeepEval {metric_name} error: {e}")
             scores[metric_name] = None
-
-    valid_scores = [s for s in scores.values() if s is not None]
-    avg = round(sum(valid_scores) / len(valid_scores), 4) if valid_scores else None
-
-    return {
-        "deepeval_scores": scores,
-        "deepeval_avg": avg,
-    }
+    return scores
@@ -0,0 +1,139 @@
+"""Append-only run journal next to each model's results snapshot.
+
+results/<model>.json stays the canonical snapshot (the format the dashboard,
+git history and every command understand). Checkpoints during a run append
+one JSON line per run entry to results/<model>.jsonl instead of rewriting
+the whole snapshot, so a checkpoint is a small append and fsync. Readers
+replay the journal on top of the snapshot; compaction folds it back in and
+removes it.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, single writer assumed
+    fcntl = None
+
+
+JOURNAL_SUFFIX = ".jsonl"
+# Fold the journal into the snapshot once it grows past this
+COMPACT_BYTES = 4 * 1024 * 1024
+
+_held = threading.local()
+
+
+def journal_path(snapshot_path: str) -> str:
+    root, _ = os.path.splitext(snapshot_path)
+    return root + JOURNAL_SUFFIX
+
+
+@contextmanager
+def locked(snapshot_path: str):
+    """Exclusive lock on one model's results (re-entrant within a thread)."""
+    held = getattr(_held, "paths", None)
+    if held is None:
+        held = _held.paths = set()
+    if snapshot_path in held:
+        yield
+        return
+    with open(snapshot_path + ".lock", "a") as fh:
+        if fcntl:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        held.add(snapshot_path)
+        try:
+            yield
+        finally:
+            held.discard(snapshot_path)
+            if fcntl:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def replay(data: dict, path: str) -> int:
+    """Apply journal records at path to data in place; returns the number applied.
+
+    A torn line (crash mid-append) is skipped.
+    """
+    if not os.path.exists(path):
+        return 0
+    applied = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if rec.get("op") == "run":
+                data.setdefault("runs", {}).setdefault(rec["pid"], []).append(rec["entry"])
+                data["updated"] = rec["ts"]
+                applied += 1
+    return applied
+
+
+def load(snapshot_path: str, default: dict | None = None) -> dict | None:
+    """Snapshot plus replayed journal; default if neither exists.
+
+    A journal without a snapshot (first run not compacted yet) replays onto
+    default, or onto an empty document.
+    """
+    jpath = journal_path(snapshot_path)
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path) as f:
+            data = json.load(f)
+    elif os.path.exists(jpath):
+        data = default if default is not None else {"runs": {}}
+    else:
+        return default
+    replay(data, jpath)
+    return data
+
+
+def append_run(snapshot_path: str, pid: str, entry: dict) -> int:
+    """Durably append one run entry; returns the journal size in bytes afterwards."""
+    rec = {"op": "run", "ts": datetime.now().isoformat(), "pid": pid, "entry": entry}
+    line = (json.dumps(rec, ensure_ascii=False) + "\n").encode("utf-8")
+    jpath = journal_path(snapshot_path)
+    with locked(snapshot_path):
+        with open(jpath, "a+b") as f:
+            # Start on a fresh line if a previous append was torn
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
+
+
+def write_snapshot(snapshot_path: str, data: dict):
+    """Atomically replace the snapshot with data and drop the journal it supersedes."""
+    tmp = snapshot_path + ".tmp"
+    with locked(snapshot_path):
+        try:
+            with open(tmp, "w") as f:
+                json.dump(data, f, indent=2)
+            # Validate before replacing
+            with open(tmp) as f:
+                json.load(f)
+            os.replace(tmp, snapshot_path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        jpath = journal_path(snapshot_path)
+        if os.path.exists(jpath):
+            os.remove(jpath)
+
+
+def compact(snapshot_path: str) -> bool:
+    """Fold the journal into the snapshot. Returns False if there was nothing to fold."""
+    with locked(snapshot_path):
+        if not os.path.exists(journal_path(snapshot_path)):
+            return False
+        write_snapshot(snapshot_path, load(snapshot_path))
+        return True
@@ -4,8 +4,13 @@ Uses a separate LLM call to score each response against the prompt's
 ideal answer and criteria, replacing manual human scoring.
 """
 
+import hashlib
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from scripts.cache import verdict_key
 
 
 JUDGE_PROMPT = """\
@@ -28,6 +33,9 @@ Return ONLY a JSON object (no markdown fences, no extra text):
 {"score": <1-5>, "rationale": "<1-2 sentence explanation>"}
 """
 
+# Bumps automatically whenever the rubric text changes, invalidating stored verdicts
+JUDGE_PROMPT_VERSION = hashlib.sha256(JUDGE_PROMPT.encode("utf-8")).hexdigest()[:12]
+
 
 def build_judge_prompt(prompt_meta: dict, response: str, auto_checks: dict) -> str:
     """Assemble the user message for the judge LLM call."""
@@ -124,17 +132,44 @@ def parse_judge_response(raw: str) -> dict:
     return {"score": score, "rationale": rationale}
 
 
+def _verdict_key(judge_model, judge_params, prompt_meta, response, auto_checks) -> str:
+    return verdict_key("judge", judge_model, JUDGE_PROMPT_VERSION, prompt_meta, response,
+                       judge_params, sorted(auto_checks.get("flags", [])))
+
+
+def _cached_verdict(verdicts, key) -> dict | None:
+    cached = verdicts.get(key) if key else None
+    if cached is None:
+        return None
+    return {"judge_score": cached["score"], "judge_rationale": cached["rationale"], "cached": True}
+
+
+def _store_verdict(verdicts, key, result: dict):
+    # Failed parses are not stored so the next rejudge tries again
+    if key and result["score"] is not None:
+        verdicts.put(key, result)
+
+
 def judge_response(judge_provider, judge_params: dict, prompt_meta: dict,
-                   response: str, auto_checks: dict) -> dict:
+                   response: str, auto_checks: dict, verdicts=None, judge_model: str | None = None) -> dict:
     """Score a response using an LLM judge.
 
-    Returns {"judge_score": int|None, "judge_rationale": str}.
+    Returns {"judge_score": int|None, "judge_rationale": str}. With a verdict
+    store (scripts.cache.get_verdict_store) and judge_model, a previous verdict
+    for the same judge, rubric, prompt and response is reused without an API
+    call and the result carries "cached": True.
     Never raises - catches all exceptions so a judge failure won't crash the eval.
     """
     try:
+        key = _verdict_key(judge_model, judge_params, prompt_meta, response, auto_checks) \
+            if verdicts is not None and judge_model else None
+        hit = _cached_verdict(verdicts, key)
+        if hit:
+            return hit
         user_msg = build_judge_prompt(prompt_meta, response, auto_checks)
         content, _usage = judge_provider.complete(user_msg, judge_params)
         result = parse_judge_response(content)
+        _store_verdict(verdicts, key, result)
         return {
             "judge_score": result["score"],
             "judge_rationale": result["rationale"],
@@ -144,3 +179,65 @@ def judge_response(judge_provider, judge_params: dict, prompt_meta: dict,
             "judge_score": None,
             "judge_rationale": f"Judge error: {e}",
         }
+
+
+async def ajudge_response(judge_provider, judge_params: dict, prompt_meta: dict,
+                          response: str, auto_checks: dict, verdicts=None, judge_model: str | None = None) -> dict:
+    """Async counterpart of judge_response(), driven by judge_provider.acomplete()."""
+    try:
+        key = _verdict_key(judge_model, judge_params, prompt_meta, response, auto_checks) \
+            if verdicts is not None and judge_model else None
+        hit = _cached_verdict(verdicts, key)
+        if hit:
+            return hit
+        user_msg = build_judge_prompt(prompt_meta, response, auto_checks)
+        content, _usage = await judge_provider.acomplete(user_msg, judge_params)
+        result = parse_judge_response(content)
+        _store_verdict(verdicts, key, result)
+        return {
+            "judge_score": result["score"],
+            "judge_rationale": result["rationale"],
+        }
+    except Exception as e:
+        return {
+            "judge_score": None,
+            "judge_rationale": f"Judge error: {e}",
+        }
+
+
+def judge_all(judges: dict, prompt_meta: dict, response: str, auto_checks: dict,
+              parallel: bool = True, verdicts=None) -> dict:
+    """Score one response with several judges, concurrently when parallel=True.
+
+    judges maps name -> {"provider", "params"} plus an optional "model" (the
+    api model id, used for verdict keys; defaults to the name). Returns a
+    judge_scores dict ({name: {"score", "rationale", "judged_at"}}) in the same
+    order as judges, so results are identical to calling judge_response() one
+    judge at a time. Verdicts reused from the store are marked "cached": True.
+    """
+    def one(name):
+        jinfo = judges[name]
+        jr = judge_response(jinfo["provider"], jinfo["params"], prompt_meta, response, auto_checks,
+                            verdicts=verdicts, judge_model=jinfo.get("model", name))
+        score = {
+            "score": jr["judge_score"],
+            "rationale": jr["judge_rationale"],
+            "judged_at": datetime.now().isoformat(),
+        }
+        if jr.get("cached"):
+            score["cached"] = True
+        return score
+
+    names = list(judges)
+    if parallel and len(names) > 1:
+        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+            results = list(pool.map(one, names))
+    else:
+        results = [one(name) for name in names]
+    return dict(zip(names, results))
+
+
+def aggregate_judge_scores(judge_scores: dict) -> tuple[float | None, int]:
+    """Returns (judge_score_avg, judge_count) over judges that produced a score."""
+    valid = [v["score"] for v in judge_scores.values() if isinstance(v, dict) and v.get("score") is not None]
+    return (round(sum(valid) / len(valid), 2) if valid else None), len(valid)
@@ -0,0 +1,103 @@
+"""Load-curve benchmark: latency and throughput of one endpoint under concurrency.
+
+run_curve() replays eval prompts against a provider at stepped concurrency
+levels. Each level keeps `concurrency` requests in flight until it has sent
+its quota, then reports latency percentiles, error rate and aggregate
+output tokens per second over the level's wall time. Stepping stops early
+once a level's error rate passes stop_error_rate: the endpoint is saturated
+and higher levels would only measure failures.
+"""
+
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from scripts.providers import sanitize_error
+
+
+DEFAULT_LEVELS = [1, 2, 4, 8, 16]
+DEFAULT_REQUESTS_PER_LEVEL = 32
+DEFAULT_STOP_ERROR_RATE = 0.5
+PERCENTILES = (50, 95, 99)
+
+
+def _percentiles(values: list[float], prefix: str, digits: int = 3) -> dict:
+    if not values:
+        return {f"{prefix}_p{q}": None for q in PERCENTILES}
+    pcts = np.percentile(values, PERCENTILES)
+    return {f"{prefix}_p{q}": round(float(v), digits) for q, v in zip(PERCENTILES, pcts)}
+
+
+def run_level(provider, prompts: list[dict], params: dict, concurrency: int, requests: int) -> dict:
+    """Send `requests` prompts (cycling through prompts) with `concurrency` in flight."""
+    source = itertools.islice(itertools.cycle(prompts), requests)
+    lock = threading.Lock()
+    latencies, ttfts, output_tokens, errors = [], [], [], []
+
+    def worker():
+        while True:
+            with lock:
+                pmeta = next(source, None)
+            if pmeta is None:
+                return
+            t0 = time.perf_counter()
+            try:
+                _, usage = provider.complete(pmeta["prompt"], params)
+            except Exception as e:
+                with lock:
+                    errors.append(sanitize_error(str(e)))
+                continue
+            elapsed = time.perf_counter() - t0
+            with lock:
+                latencies.append(elapsed)
+                output_tokens.append(usage.get("output_tokens") or 0)
+                if usage.get("ttft_s") is not None:
+                    ttfts.append(usage["ttft_s"])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    wall = time.perf_counter() - start
+
+    sent = len(latencies) + len(errors)
+    level = {
+        "concurrency": concurrency,
+        "requests": sent,
+        "errors": len(errors),
+        "error_rate": round(len(errors) / sent, 4) if sent else 0.0,
+        "wall_s": round(wall, 3),
+        "requests_per_s": round(len(latencies) / wall, 2) if wall > 0 else None,
+        "tokens_per_s": round(sum(output_tokens) / wall, 1) if wall > 0 else None,
+        **_percentiles(latencies, "latency"),
+    }
+    if ttfts:
+        level.update(_percentiles(ttfts, "ttft"))
+    if errors:
+        # One example is enough to tell a 429 wall from a crashing server
+        level["sample_error"] = errors[0][:300]
+    return level
+
+
+def run_curve(provider, prompts: list[dict], params: dict, levels: list[int] | None = None,
+              requests_per_level: int = DEFAULT_REQUESTS_PER_LEVEL,
+              stop_error_rate: float | None = DEFAULT_STOP_ERROR_RATE, log=None) -> dict:
+    """Run every level in order and return the curve as stored under results' "loadtests"."""
+    curve = {
+        "timestamp": datetime.now().isoformat(),
+        "requests_per_level": requests_per_level,
+        "levels": [],
+    }
+    for concurrency in levels or DEFAULT_LEVELS:
+        level = run_level(provider, prompts, params, concurrency, max(requests_per_level, concurrency))
+        curve["levels"].append(level)
+        if log:
+            log(level)
+        if stop_error_rate is not None and level["error_rate"] > stop_error_rate:
+            curve["stopped_early"] = True
+            break
+    return curve
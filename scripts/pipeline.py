@@ -0,0 +1,93 @@
+"""Staged worker pipeline with bounded queues between stages.
+
+Each stage has its own pool of worker threads, so a slow candidate model and
+slow judge models are busy at the same time: while prompt i is being judged,
+prompt i+1 is already generating. Bounded queues keep a fast upstream stage
+from racing arbitrarily far ahead of a slow downstream one.
+"""
+
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator
+
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+
+
+class StageError(Exception):
+    """A stage function raised; carries the stage name and original error."""
+
+    def __init__(self, stage: str, error: Exception):
+        super().__init__(f"{stage} stage failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class Pipeline:
+    """Run items through a list of Stages.
+
+    Stage functions take the item returned by the previous stage and return
+    the item for the next one. run() yields (index, result) in completion
+    order; callers that need input order keep their own reorder buffer.
+    """
+
+    def __init__(self, stages: list[Stage], maxsize: int | None = None):
+        self.stages = stages
+        self.maxsize = maxsize or 2 * max(s.workers for s in stages)
+
+    def run(self, items: Iterable[Any]) -> Iterator[tuple[int, Any]]:
+        queues = [queue.Queue(self.maxsize) for _ in self.stages] + [queue.Queue()]
+        remaining = [s.workers for s in self.stages]
+        lock = threading.Lock()
+
+        def feed():
+            for idx, item in enumerate(items):
+                queues[0].put((idx, item))
+            for _ in range(self.stages[0].workers):
+                queues[0].put(_DONE)
+
+        def work(k: int):
+            stage, inbox, outbox = self.stages[k], queues[k], queues[k + 1]
+            while True:
+                msg = inbox.get()
+                if msg is _DONE:
+                    break
+                idx, item = msg
+                if not isinstance(item, StageError):
+                    try:
+                        item = stage.fn(item)
+                    except Exception as e:
+                        item = StageError(stage.name, e)
+                outbox.put((idx, item))
+            # Last worker out closes the next stage
+            with lock:
+                remaining[k] -= 1
+                last = remaining[k] == 0
+            if last:
+                downstream = self.stages[k + 1].workers if k + 1 < len(self.stages) else 1
+                for _ in range(downstream):
+                    outbox.put(_DONE)
+
+        threads = [threading.Thread(target=feed, daemon=True)]
+        for k, stage in enumerate(self.stages):
+            threads += [threading.Thread(target=work, args=(k,), daemon=True,
+                                         name=f"{stage.name}-{w}") for w in range(stage.workers)]
+        for t in threads:
+            t.start()
+
+        while True:
+            msg = queues[-1].get()
+            if msg is _DONE:
+                return
+            idx, item = msg
+            if isinstance(item, StageError):
+                raise item
+            yield idx, item
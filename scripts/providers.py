@@ -1,13 +1,22 @@
 """API providers for different LLM services."""
 
+import asyncio
 import os
 import re
 import json
+import threading
 import time
+import weakref
 import httpx
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
+try:
+    import h2  # noqa: F401  (httpx's HTTP/2 support)
+except ImportError:  # clients fall back to HTTP/1.1 keep-alive
+    h2 = None
+
 
 def sanitize_error(error_msg: str) -> str:
     """Strip API keys and tokens from error messages."""
@@ -28,6 +37,80 @@ def sanitize_error(error_msg: str) -> str:
     return s
 
 
+# ── Shared HTTP clients ──
+#
+# Providers don't own their connection pools. Every model and judge whose
+# requests go to the same base URL with the same credentials gets the same
+# httpx.Client, so a sweep of twenty HF-router models plus judges keeps one
+# set of warm (HTTP/2 where available) connections instead of twenty.
+
+HTTP_DEFAULTS = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    # Longer than httpx's 5s so connections survive the gap while judges run
+    "keepalive_expiry": 30.0,
+    "http2": True,
+}
+_http_settings = dict(HTTP_DEFAULTS)
+_clients: dict[tuple, httpx.Client] = {}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def configure_http(settings: dict | None):
+    """Pool limits and HTTP/2 for clients created from now on (config `http` section)."""
+    _http_settings.clear()
+    _http_settings.update(HTTP_DEFAULTS, **(settings or {}))
+
+
+def _client_kwargs() -> dict:
+    return {
+        "limits": httpx.Limits(
+            max_connections=_http_settings["max_connections"],
+            max_keepalive_connections=_http_settings["max_keepalive_connections"],
+            keepalive_expiry=_http_settings["keepalive_expiry"],
+        ),
+        "http2": bool(_http_settings["http2"]) and h2 is not None,
+    }
+
+
+def _client_key(base_url: str, headers: dict, timeout: float) -> tuple:
+    # Headers carry the credentials; pool settings are part of the key so
+    # reconfiguring never hands out a client built with the old limits
+    return (str(base_url), tuple(sorted((headers or {}).items())), timeout,
+            tuple(sorted(_http_settings.items())))
+
+
+def shared_client(base_url: str = "", headers: dict | None = None, timeout: float = 120) -> httpx.Client:
+    """The process-wide httpx.Client for this base URL and headers."""
+    key = _client_key(base_url, headers, timeout)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = httpx.Client(base_url=base_url, headers=headers, timeout=timeout,
+                                         **_client_kwargs())
+        return _clients[key]
+
+
+def shared_async_client(client: httpx.Client) -> httpx.AsyncClient:
+    """AsyncClient mirroring client, shared per running event loop
+    (async connection pools can't be shared across loops)."""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        per_loop = _async_clients.setdefault(loop, {})
+        if client not in per_loop:
+            per_loop[client] = httpx.AsyncClient(base_url=client.base_url, headers=client.headers,
+                                                 timeout=client.timeout, **_client_kwargs())
+        return per_loop[client]
+
+
+def close_clients():
+    """Close and forget every shared sync client."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
 @dataclass
 class ModelResponse:
     model: str
@@ -40,17 +123,176 @@ class ModelResponse:
 
 
 class Provider(ABC):
+    # True when complete_n() asks the endpoint for all samples in one request
+    native_n = False
+
     @abstractmethod
     def complete(self, prompt: str, params: dict) -> tuple[str, dict]:
         """Returns (content, usage_dict)."""
         ...
 
+    def complete_n(self, prompt: str, params: dict, n: int) -> list[tuple[str, dict]]:
+        """n independent samples for one prompt. Default: n concurrent complete() calls."""
+        if n <= 1:
+            return [self.complete(prompt, params)]
+        with ThreadPoolExecutor(n) as pool:
+            return list(pool.map(lambda _: self.complete(prompt, params), range(n)))
+
+    async def acomplete(self, prompt: str, params: dict) -> tuple[str, dict]:
+        """Async counterpart of complete(). Default offloads the blocking call to a thread."""
+        return await asyncio.to_thread(self.complete, prompt, params)
+
+
+# ── Streaming ──
+
+# Usage keys a streamed call adds: seconds to the first generated token, mean
+# seconds between streamed tokens, and decode rate after the first token
+STREAM_TIMING_FIELDS = ("ttft_s", "itl_s", "tokens_per_s")
+
+
+def stream_timing(t0: float, stamps: list[float], output_tokens: int | None = None) -> dict:
+    """Timing fields for a stream that started at t0 and delivered deltas at stamps.
+
+    Servers send roughly one token per delta; when the reply reports its
+    output token count, the decode rate uses that instead of the delta count.
+    """
+    if not stamps:
+        return {}
+    timing = {"ttft_s": round(stamps[0] - t0, 3)}
+    span = stamps[-1] - stamps[0]
+    if len(stamps) > 1 and span > 0:
+        timing["itl_s"] = round(span / (len(stamps) - 1), 4)
+        decoded = (output_tokens or len(stamps)) - 1
+        timing["tokens_per_s"] = round(decoded / span, 1)
+    return timing
+
+
+class _StreamCollector:
+    """Accumulates one server-sent event stream into (content, usage)."""
+
+    def __init__(self, parse_event):
+        self.parse_event = parse_event
+        self.t0 = time.perf_counter()
+        self.stamps, self.text, self.reasoning = [], [], []
+        self.usage = {"input_tokens": None, "output_tokens": None}
+
+    def feed(self, line: str) -> bool:
+        """Consume one SSE line; False once the stream says it is done."""
+        if not line.startswith("data:"):
+            return True
+        payload = line[5:].strip()
+        if payload == "[DONE]":
+            return False
+        try:
+            event = json.loads(payload)
+        except json.JSONDecodeError:
+            return True
+        text, reasoning, usage = self.parse_event(event)
+        if text or reasoning:
+            self.stamps.append(time.perf_counter())
+            self.text.append(text or "")
+            self.reasoning.append(reasoning or "")
+        self.usage.update({k: v for k, v in usage.items() if v is not None})
+        return True
+
+    def result(self) -> tuple[str, dict]:
+        content = "".join(self.text)
+        # Same fallback as the non-streamed reasoning models: never return empty
+        if not content.strip() and any(self.reasoning):
+            content = "".join(self.reasoning)
+        return content, {**self.usage, **stream_timing(self.t0, self.stamps, self.usage["output_tokens"])}
+
+
+class HTTPProvider(Provider):
+    """Provider backed by an httpx client. Subclasses build the request and parse
+    the JSON reply; the sync and async paths share both halves.
+    """
+
+    client: httpx.Client
+    supports_stream = False
+    stream = False
+
+    @abstractmethod
+    def _request(self, prompt: str, params: dict) -> tuple[str, dict]:
+        """Returns (url, post kwargs)."""
+        ...
+
+    @abstractmethod
+    def _parse(self, data: dict) -> tuple[str, dict]:
+        """Returns (content, usage_dict) from a decoded response body."""
+        ...
+
+    def complete(self, prompt: str, params: dict) -> tuple[str, dict]:
+        url, kwargs = self._request(prompt, params)
+        resp = self.client.post(url, **kwargs)
+        resp.raise_for_status()
+        return self._parse(resp.json())
+
+    async def acomplete(self, prompt: str, params: dict) -> tuple[str, dict]:
+        url, kwargs = self._request(prompt, params)
+        resp = await self._async_client().post(url, **kwargs)
+        resp.raise_for_status()
+        return self._parse(resp.json())
+
+    def _async_client(self) -> httpx.AsyncClient:
+        return shared_async_client(self.client)
+
+
+class StreamingHTTPProvider(HTTPProvider):
+    """HTTPProvider that can also stream (stream = True, from the model config).
+
+    The reply is then read as server-sent events, each decoded by
+    _parse_event(), and the usage gains STREAM_TIMING_FIELDS.
+    """
+
+    supports_stream = True
+
+    @abstractmethod
+    def _parse_event(self, event: dict) -> tuple[str, str, dict]:
+        """Returns (text delta, reasoning delta, usage update) from one decoded event."""
+        ...
+
+    def _stream_request(self, prompt: str, params: dict) -> tuple[str, dict]:
+        """Returns (url, post kwargs) for the streamed variant of the request."""
+        url, kwargs = self._request(prompt, params)
+        return url, {**kwargs, "json": {**kwargs["json"], "stream": True}}
 
-class AnthropicProvider(Provider):
+    def complete(self, prompt: str, params: dict) -> tuple[str, dict]:
+        if self.stream:
+            return self._complete_stream(prompt, params)
+        return super().complete(prompt, params)
+
+    async def acomplete(self, prompt: str, params: dict) -> tuple[str, dict]:
+        if self.stream:
+            return await self._acomplete_stream(prompt, params)
+        return await super().acomplete(prompt, params)
+
+    def _complete_stream(self, prompt: str, params: dict) -> tuple[str, dict]:
+        url, kwargs = self._stream_request(prompt, params)
+        collector = _StreamCollector(self._parse_event)
+        with self.client.stream("POST", url, **kwargs) as resp:
+            resp.raise_for_status()
+            for line in resp.iter_lines():
+                if not collector.feed(line):
+                    break
+        return collector.result()
+
+    async def _acomplete_stream(self, prompt: str, params: dict) -> tuple[str, dict]:
+        url, kwargs = self._stream_request(prompt, params)
+        collector = _StreamCollector(self._parse_event)
+        async with self._async_client().stream("POST", url, **kwargs) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not collector.feed(line):
+                    break
+        return collector.result()
+
+
+class AnthropicProvider(StreamingHTTPProvider):
     def __init__(self, model: str, api_key: str):
         self.model = model
         self.api_key = api_key
-        self.client = httpx.Client(
+        self.client = shared_client(
             base_url="https://api.anthropic.com",
             headers={
                 "x-api-key": api_key,
@@ -60,7 +302,7 @@ class AnthropicProvider(Provider):
             timeout=120,
         )
 
-    def complete(self, prompt: str, params: dict) -> tuple[str, dict]:
+    def _request(self, prompt: str, params: dict) -> tuple[str, dict]:
         body = {
             "model": self.model,
             "messages": [{"role": "user", "content": prompt}],
@@ -69,9 +311,9 @@ class AnthropicProvider(Provider):
         # Opus 4.7+ deprecates temperature
         if self.model >= "claude-opus-4-7":
             body.pop("temperature", None)
-        resp = self.client.post("/v1/messages", json=body)
-        resp.raise_for_status()
-        data = resp.json()
+        return "/v1/messages", {"json": body}
+
+    def _parse(self, data: dict) -> tuple[str, dict]:
         try:
             content = "".join(b["text"] for b in data["content"] if b["type"] == "text")
         except (KeyError, IndexError, TypeError) as e:
@@ -82,11 +324,26 @@ class AnthropicProvider(Provider):
         }
         return content, usage
 
-
-class OpenAIProvider(Provider):
-    def __init__(self, model: str, api_key: str, base_url: str = "https://api.openai.com/v1"):
+    def _parse_event(self, event: dict) -> tuple[str, str, dict]:
+        kind = event.get("type")
+        if kind == "content_block_delta" and event.get("delta", {}).get("type") == "text_delta":
+            return event["delta"].get("text", ""), "", {}
+        if kind == "message_start":
+            return "", "", {"input_tokens": event.get("message", {}).get("usage", {}).get("input_tokens")}
+        if kind == "message_delta":
+            return "", "", {"output_tokens": event.get("usage", {}).get("output_tokens")}
+        if kind == "error":
+            raise ValueError(f"{self.model} stream error: {event.get('error', {}).get('message', event)}")
+        return "", "", {}
+
+
+class OpenAIProvider(StreamingHTTPProvider):
+    def __init__(self, model: str, api_key: str, base_url: str = "https://api.openai.com/v1",
+                 native_n: bool = True):
         self.model = model
-        self.client = httpx.Client(
+        # Some OpenAI-compatible hosts reject n > 1 (config: native_n: false)
+        self.native_n = native_n
+        self.client = shared_client(
             base_url=base_url,
             headers={
                 "Authorization": f"Bearer {api_key}",
@@ -95,7 +352,7 @@ class OpenAIProvider(Provider):
             timeout=300,
         )
 
-    def complete(self, prompt: str, params: dict) -> tuple[str, dict]:
+    def _request(self, prompt: str, params: dict) -> tuple[str, dict]:
         p = dict(params)
         # OpenAI reasoning models (o-series, some gpt-5 versions) only accept the default
         # temperature (1). API error for these is: "Unsupported value: 'temperature' does
@@ -110,9 +367,9 @@ class OpenAIProvider(Provider):
             "messages": [{"role": "user", "content": prompt}],
             **p,
         }
-        resp = self.client.post("/chat/completions", json=body)
-        resp.raise_for_status()
-        data = resp.json()
+        return "/chat/completions", {"json": body}
+
+    def _parse(self, data: dict) -> tuple[str, dict]:
         try:
             content = data["choices"][0]["message"]["content"]
         except (KeyError, IndexError, TypeError) as e:
@@ -123,14 +380,66 @@ class OpenAIProvider(Provider):
         }
         return content, usage
 
-
-class GoogleProvider(Provider):
+    def _stream_request(self, prompt: str, params: dict) -> tuple[str, dict]:
+        return _openai_stream_request(super()._stream_request(prompt, params))
+
+    def _parse_event(self, event: dict) -> tuple[str, str, dict]:
+        return _openai_event(event)
+
+    def complete_n(self, prompt: str, params: dict, n: int) -> list[tuple[str, dict]]:
+        """All n samples from one request via the `n` parameter.
+
+        The reply only reports total completion tokens, so each sample gets an
+        even share; input tokens are the shared prompt's. Hosts that ignore n
+        and return fewer choices are asked again for the rest.
+        """
+        if n <= 1 or not self.native_n:
+            return super().complete_n(prompt, params, n)
+        samples = []
+        while len(samples) < n:
+            want = n - len(samples)
+            url, kwargs = self._request(prompt, {**params, "n": want} if want > 1 else params)
+            resp = self.client.post(url, **kwargs)
+            resp.raise_for_status()
+            data = resp.json()
+            try:
+                choices = [c["message"]["content"] for c in data["choices"]][:want]
+            except (KeyError, IndexError, TypeError) as e:
+                raise ValueError(f"Unexpected {self.model} response structure: {e}") from e
+            if not choices:
+                raise ValueError(f"Unexpected {self.model} response structure: no choices")
+            usage = data.get("usage", {})
+            total = usage.get("completion_tokens")
+            for i, content in enumerate(choices):
+                share = None if total is None else total // len(choices) + (i < total % len(choices))
+                samples.append((content, {"input_tokens": usage.get("prompt_tokens"), "output_tokens": share}))
+        return samples
+
+
+def _openai_stream_request(request: tuple[str, dict]) -> tuple[str, dict]:
+    """Ask an OpenAI-format endpoint to end the stream with a usage chunk."""
+    url, kwargs = request
+    return url, {**kwargs, "json": {**kwargs["json"], "stream_options": {"include_usage": True}}}
+
+
+def _openai_event(event: dict) -> tuple[str, str, dict]:
+    """Chat-completions chunk: a content (or reasoning) delta, or the closing usage."""
+    usage = event.get("usage") or {}
+    usage = {"input_tokens": usage.get("prompt_tokens"), "output_tokens": usage.get("completion_tokens")}
+    choices = event.get("choices") or []
+    if not choices:
+        return "", "", usage
+    delta = choices[0].get("delta") or {}
+    return delta.get("content") or "", delta.get("reasoning") or delta.get("reasoning_content") or "", usage
+
+
+class GoogleProvider(HTTPProvider):
     def __init__(self, model: str, api_key: str):
         self.model = model
         self.api_key = api_key
-        self.client = httpx.Client(timeout=120)
+        self.client = shared_client(timeout=120)
 
-    def complete(self, prompt: str, params: dict) -> tuple[str, dict]:
+    def _request(self, prompt: str, params: dict) -> tuple[str, dict]:
         url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model}:generateContent"
         body = {
             "contents": [{"parts": [{"text": prompt}]}],
@@ -139,9 +448,9 @@ class GoogleProvider(Provider):
                 "temperature": params.get("temperature", 0),
             },
         }
-        resp = self.client.post(url, json=body, params={"key": self.api_key})
-        resp.raise_for_status()
-        data = resp.json()
+        return url, {"json": body, "params": {"key": self.api_key}}
+
+    def _parse(self, data: dict) -> tuple[str, dict]:
         try:
             content = data["candidates"][0]["content"]["parts"][0]["text"]
         except (KeyError, IndexError, TypeError) as e:
@@ -154,24 +463,24 @@ class GoogleProvider(Provider):
         return content, usage
 
 
-class OllamaProvider(Provider):
+class OllamaProvider(StreamingHTTPProvider):
     def __init__(self, model: str, base_url: str = "http://localhost:11434/v1"):
         self.model = model
-        self.client = httpx.Client(
+        self.client = shared_client(
             base_url=base_url,
             headers={"Content-Type": "application/json"},
             timeout=600,
         )
 
-    def complete(self, prompt: str, params: dict) -> tuple[str, dict]:
+    def _request(self, prompt: str, params: dict) -> tuple[str, dict]:
         body = {
             "model": self.model,
             "messages": [{"role": "user", "content": prompt}],
             **params,
         }
-        resp = self.client.post("/chat/completions", json=body)
-        resp.raise_for_status()
-        data = resp.json()
+        return "/chat/completions", {"json": body}
+
+    def _parse(self, data: dict) -> tuple[str, dict]:
         try:
             message = data["choices"][0]["message"]
             content = message.get("content") or ""
@@ -188,11 +497,17 @@ class OllamaProvider(Provider):
         }
         return content, usage
 
+    def _stream_request(self, prompt: str, params: dict) -> tuple[str, dict]:
+        return _openai_stream_request(super()._stream_request(prompt, params))
 
-class CohereProvider(Provider):
+    def _parse_event(self, event: dict) -> tuple[str, str, dict]:
+        return _openai_event(event)
+
+
+class CohereProvider(StreamingHTTPProvider):
     def __init__(self, model: str, api_key: str):
         self.model = model
-        self.client = httpx.Client(
+        self.client = shared_client(
             base_url="https://api.cohere.com",
             headers={
                 "Authorization": f"Bearer {api_key}",
@@ -201,7 +516,7 @@ class CohereProvider(Provider):
             timeout=120,
         )
 
-    def complete(self, prompt: str, params: dict) -> tuple[str, dict]:
+    def _request(self, prompt: str, params: dict) -> tuple[str, dict]:
         body = {
             "model": self.model,
             "messages": [{"role": "user", "content": prompt}],
@@ -211,9 +526,9 @@ class CohereProvider(Provider):
             body["max_tokens"] = params["max_tokens"]
         if "temperature" in params:
             body["temperature"] = params["temperature"]
-        resp = self.client.post("/v2/chat", json=body)
-        resp.raise_for_status()
-        data = resp.json()
+        return "/v2/chat", {"json": body}
+
+    def _parse(self, data: dict) -> tuple[str, dict]:
         try:
             content = data["message"]["content"][0]["text"]
         except (KeyError, IndexError, TypeError) as e:
@@ -224,8 +539,19 @@ class CohereProvider(Provider):
         }
         return content, usage
 
+    def _parse_event(self, event: dict) -> tuple[str, str, dict]:
+        kind = event.get("type")
+        if kind == "content-delta":
+            return event.get("delta", {}).get("message", {}).get("content", {}).get("text", ""), "", {}
+        if kind == "message-end":
+            tokens = event.get("delta", {}).get("usage", {}).get("tokens", {})
+            return "", "", {"input_tokens": tokens.get("input_tokens"), "output_tokens": tokens.get("output_tokens")}
+        return "", "", {}
+
 
 class BedrockProvider(Provider):
+    # boto3 has no async client; acomplete() uses the base-class thread offload.
+
     def __init__(self, model: str, region: str = None):
         import boto3
         self.model = model
@@ -255,6 +581,14 @@ class BedrockProvider(Provider):
 
 
 def get_provider(config: dict) -> Provider:
+    provider = _new_provider(config)
+    # `stream: true` on a provider without a streaming path keeps blocking calls
+    if config.get("stream") and getattr(provider, "supports_stream", False):
+        provider.stream = True
+    return provider
+
+
+def _new_provider(config: dict) -> Provider:
     provider_type = config["provider"]
 
     if provider_type == "ollama":
@@ -275,7 +609,7 @@ def get_provider(config: dict) -> Provider:
         return AnthropicProvider(config["model"], api_key)
     elif provider_type in ("openai", "openai_compatible"):
         base_url = config.get("base_url", "https://api.openai.com/v1")
-        return OpenAIProvider(config["model"], api_key, base_url)
+        return OpenAIProvider(config["model"], api_key, base_url, native_n=config.get("native_n", True))
     elif provider_type == "google":
         return GoogleProvider(config["model"], api_key)
     elif provider_type == "cohere":
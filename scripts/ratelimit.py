@@ -0,0 +1,242 @@
+"""Per-endpoint rate limiting shared across models and judges.
+
+Every model config resolves to an endpoint key (its base_url, else its
+api_key_env, else its provider type). All models and judges with the same key
+draw from one limiter, so a sweep that hits the HF router from ten models
+still respects the single HF_TOKEN quota.
+"""
+
+import asyncio
+import threading
+import time
+
+from scripts.providers import Provider
+
+
+DEFAULT_BASE_URLS = {
+    "anthropic": "https://api.anthropic.com",
+    "openai": "https://api.openai.com/v1",
+    "google": "https://generativelanguage.googleapis.com",
+    "ollama": "http://localhost:11434/v1",
+    "cohere": "https://api.cohere.com",
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations instead of blocking.
+
+    reserve() debits immediately (the level may go negative) and returns how
+    long the caller must wait, which keeps callers first-come first-served and
+    works the same from threads and from an event loop.
+    """
+
+    def __init__(self, rate_per_s: float, capacity: float):
+        self.rate = rate_per_s
+        self.capacity = capacity
+        self.level = capacity
+        self.stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            self._refill()
+            # A single oversize request waits for a full bucket rather than forever
+            self.level -= min(amount, self.capacity)
+            return max(0.0, -self.level / self.rate)
+
+    def credit(self, amount: float):
+        """Return (or, if negative, additionally charge) tokens after the fact."""
+        with self._lock:
+            self._refill()
+            self.level = min(self.capacity, self.level + amount)
+
+    def pause(self, seconds: float):
+        """Hold back every caller for at least `seconds` from now."""
+        with self._lock:
+            self._refill()
+            self.level = min(self.level, -seconds * self.rate)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute budget for one endpoint."""
+
+    # Throttle feedback: halve the request rate on each 429, recover 5% of the
+    # configured rate per success, never drop below 1/20th of it.
+    BACKOFF_FACTOR = 0.5
+    RECOVERY_STEP = 0.05
+    MIN_FRACTION = 0.05
+
+    def __init__(self, requests_per_minute: float | None = None,
+                 tokens_per_minute: float | None = None, burst: int = 1):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.requests = TokenBucket(requests_per_minute / 60, max(1, burst)) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute) if tokens_per_minute else None
+
+    def reserve(self, requests: int = 1, tokens: int = 0) -> float:
+        """Book capacity for a call and return the seconds to wait before making it."""
+        wait = 0.0
+        if self.requests:
+            wait = max(wait, self.requests.reserve(requests))
+        if self.tokens and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        return wait
+
+    def wait(self, requests: int = 1, tokens: int = 0):
+        delay = self.reserve(requests, tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    def settle(self, estimated: int, actual: int | None):
+        """Correct the token bucket once real usage is known."""
+        if self.tokens and actual is not None:
+            self.tokens.credit(estimated - actual)
+
+    @property
+    def current_rpm(self) -> float | None:
+        return self.requests.rate * 60 if self.requests else None
+
+    def throttled(self, retry_after: float | None = None):
+        """The endpoint pushed back: slow down and pause everyone for retry_after."""
+        if not self.requests:
+            return
+        base = self.requests_per_minute / 60
+        with self.requests._lock:
+            self.requests.rate = max(base * self.MIN_FRACTION, self.requests.rate * self.BACKOFF_FACTOR)
+        if retry_after:
+            self.requests.pause(retry_after)
+
+    def succeeded(self):
+        """Creep back toward the configured rate after a throttle."""
+        if not self.requests:
+            return
+        base = self.requests_per_minute / 60
+        with self.requests._lock:
+            if self.requests.rate < base:
+                self.requests.rate = min(base, self.requests.rate + base * self.RECOVERY_STEP)
+
+
+def estimate_tokens(prompt: str, params: dict) -> int:
+    """Rough pre-call token charge: ~4 chars per input token plus the output cap."""
+    return len(prompt) // 4 + int(params.get("max_tokens", 0) or 0)
+
+
+def endpoint_key(model_cfg: dict) -> str:
+    """Identify the quota a model config draws from."""
+    provider = model_cfg.get("provider", "")
+    if provider == "bedrock":
+        return f"bedrock:{model_cfg.get('region') or 'default'}"
+    base_url = model_cfg.get("base_url") or DEFAULT_BASE_URLS.get(provider, provider)
+    return f"{base_url}|{model_cfg.get('api_key_env', '')}"
+
+
+def _limits_for(model_cfg: dict, config: dict) -> dict:
+    """rate_limits entries may be keyed by base_url, api_key_env or provider type."""
+    rate_limits = config.get("rate_limits", {}) or {}
+    for key in (model_cfg.get("base_url"), model_cfg.get("api_key_env"), model_cfg.get("provider")):
+        if key and key in rate_limits:
+            return rate_limits[key] or {}
+    return {}
+
+
+def endpoint_concurrency(model_cfg: dict, config: dict, default: int = 1) -> int:
+    """Requests a sweep may keep in flight on model_cfg's endpoint (rate_limits concurrency)."""
+    return max(1, int(_limits_for(model_cfg, config).get("concurrency") or default))
+
+
+_registry: dict[tuple, RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter(model_cfg: dict, config: dict) -> RateLimiter | None:
+    """Shared limiter for the endpoint behind model_cfg, or None if unlimited.
+
+    Falls back to eval.delay_between_calls (as one request per delay seconds)
+    for endpoints without an explicit rate_limits entry.
+    """
+    limits = _limits_for(model_cfg, config)
+    rpm = limits.get("requests_per_minute")
+    tpm = limits.get("tokens_per_minute")
+    burst = limits.get("burst", 1)
+    if not limits:
+        delay = config.get("eval", {}).get("delay_between_calls", 1.0)
+        rpm = 60 / delay if delay and delay > 0 else None
+    if not rpm and not tpm:
+        return None
+    key = (endpoint_key(model_cfg), rpm, tpm, burst)
+    with _registry_lock:
+        if key not in _registry:
+            _registry[key] = RateLimiter(rpm, tpm, burst)
+        return _registry[key]
+
+
+class RateLimitedProvider(Provider):
+    """Wraps a provider so every call first books capacity on its endpoint limiter."""
+
+    def __init__(self, inner: Provider, limiter: RateLimiter):
+        self.inner = inner
+        self.limiter = limiter
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+    def complete(self, prompt: str, params: dict) -> tuple[str, dict]:
+        est = estimate_tokens(prompt, params)
+        delay = self.limiter.reserve(1, est)
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            content, usage = self.inner.complete(prompt, params)
+        except Exception:
+            self.limiter.settle(est, 0)
+            raise
+        self.limiter.settle(est, _usage_total(usage))
+        return content, usage
+
+    @property
+    def native_n(self) -> bool:
+        return getattr(self.inner, "native_n", False)
+
+    def complete_n(self, prompt: str, params: dict, n: int) -> list[tuple[str, dict]]:
+        if n <= 1 or not self.native_n:
+            # n separate requests, each booked through complete()
+            return super().complete_n(prompt, params, n)
+        # One request, but the output cap applies to every sample
+        est = estimate_tokens(prompt, params) + (n - 1) * int(params.get("max_tokens", 0) or 0)
+        delay = self.limiter.reserve(1, est)
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            samples = self.inner.complete_n(prompt, params, n)
+        except Exception:
+            self.limiter.settle(est, 0)
+            raise
+        # The prompt is billed once, however many samples came back
+        outputs = [usage.get("output_tokens") for _, usage in samples]
+        self.limiter.settle(est, _usage_total({"input_tokens": samples[0][1].get("input_tokens"),
+                                               "output_tokens": None if None in outputs else sum(outputs)}))
+        return samples
+
+    async def acomplete(self, prompt: str, params: dict) -> tuple[str, dict]:
+        est = estimate_tokens(prompt, params)
+        delay = self.limiter.reserve(1, est)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            content, usage = await self.inner.acomplete(prompt, params)
+        except Exception:
+            self.limiter.settle(est, 0)
+            raise
+        self.limiter.settle(est, _usage_total(usage))
+        return content, usage
+
+
+def _usage_total(usage: dict) -> int | None:
+    if usage.get("input_tokens") is None and usage.get("output_tokens") is None:
+        return None
+    return (usage.get("input_tokens") or 0) + (usage.get("output_tokens") or 0)
@@ -0,0 +1,166 @@
+"""Retries for transient provider failures.
+
+429s, 5xx and dropped connections are retried with jittered exponential
+backoff. A Retry-After header (or OpenAI's retry-after-ms) overrides the
+backoff (still capped at max_delay), and every throttle is reported to the endpoint's RateLimiter so
+concurrent callers slow down too instead of piling onto the same quota.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from scripts.providers import Provider
+
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+THROTTLE_STATUS = {429, 529}
+# botocore ClientError codes worth retrying (matched by name, boto3 is optional)
+RETRYABLE_AWS_CODES = {"ThrottlingException", "ServiceUnavailableException",
+                       "ModelNotReadyException", "InternalServerException"}
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+
+    @classmethod
+    def from_config(cls, config: dict) -> "RetryPolicy":
+        cfg = config.get("eval", {}).get("retries", {}) or {}
+        return cls(
+            max_attempts=cfg.get("max_attempts", cls.max_attempts),
+            base_delay=cfg.get("base_delay", cls.base_delay),
+            max_delay=cfg.get("max_delay", cls.max_delay),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given (1-based) failed attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+def parse_retry_after(headers) -> float | None:
+    """Seconds to wait from Retry-After / retry-after-ms headers, if present."""
+    ms = headers.get("retry-after-ms")
+    if ms:
+        try:
+            return max(0.0, float(ms) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def classify(error: Exception) -> tuple[bool, bool, float | None]:
+    """Returns (retryable, throttled, retry_after_seconds) for a provider exception."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return (status in RETRYABLE_STATUS, status in THROTTLE_STATUS,
+                parse_retry_after(error.response.headers))
+    if isinstance(error, httpx.TransportError):
+        return True, False, None
+    aws = getattr(error, "response", None)
+    if isinstance(aws, dict):
+        code = aws.get("Error", {}).get("Code")
+        if code in RETRYABLE_AWS_CODES:
+            return True, code == "ThrottlingException", None
+    return False, False, None
+
+
+class RetryingProvider(Provider):
+    """Wraps a provider, retrying transient failures and reporting throttles to a limiter."""
+
+    def __init__(self, inner: Provider, policy: RetryPolicy | None = None, limiter=None, log=None):
+        self.inner = inner
+        self.policy = policy or RetryPolicy()
+        self.limiter = limiter
+        self.log = log
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+    def _next_delay(self, error: Exception, attempt: int) -> float | None:
+        """Delay before the next attempt, or None to give up and re-raise."""
+        retryable, throttled, retry_after = classify(error)
+        if not retryable or attempt >= self.policy.max_attempts:
+            return None
+        if retry_after is not None:
+            retry_after = min(retry_after, self.policy.max_delay)
+        if throttled and self.limiter:
+            self.limiter.throttled(retry_after)
+        delay = retry_after if retry_after is not None else self.policy.backoff(attempt)
+        if self.log:
+            self.log(f"retry {attempt}/{self.policy.max_attempts - 1} in {delay:.1f}s: {error}")
+        return delay
+
+    def _succeeded(self):
+        if self.limiter:
+            self.limiter.succeeded()
+
+    def complete(self, prompt: str, params: dict) -> tuple[str, dict]:
+        attempt = 1
+        while True:
+            try:
+                result = self.inner.complete(prompt, params)
+            except Exception as e:
+                delay = self._next_delay(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self._succeeded()
+            return result
+
+    @property
+    def native_n(self) -> bool:
+        return getattr(self.inner, "native_n", False)
+
+    def complete_n(self, prompt: str, params: dict, n: int) -> list[tuple[str, dict]]:
+        if n <= 1 or not self.native_n:
+            # n separate requests, each retried on its own through complete()
+            return super().complete_n(prompt, params, n)
+        attempt = 1
+        while True:
+            try:
+                result = self.inner.complete_n(prompt, params, n)
+            except Exception as e:
+                delay = self._next_delay(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self._succeeded()
+            return result
+
+    async def acomplete(self, prompt: str, params: dict) -> tuple[str, dict]:
+        attempt = 1
+        while True:
+            try:
+                result = await self.inner.acomplete(prompt, params)
+            except Exception as e:
+                delay = self._next_delay(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self._succeeded()
+            return result
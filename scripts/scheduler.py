@@ -0,0 +1,74 @@
+"""Global work scheduler for multi-model sweeps.
+
+A sweep queues (model, prompt) jobs for many models at once. Jobs are keyed
+by the endpoint they call (ratelimit.endpoint_key), and each endpoint has its
+own cap on requests in flight. jobs() hands jobs out round-robin across
+endpoints, and only when that endpoint has a free slot, so a slow or tightly
+capped endpoint never holds up workers that could be calling another one.
+"""
+
+import threading
+from collections import deque
+
+
+class Scheduler:
+    """Round-robin job source with a per-key in-flight cap.
+
+    Iterate jobs() from the pipeline's feeder; call release(key) once a job
+    handed out for key has finished using its endpoint.
+    """
+
+    def __init__(self, caps: dict | None = None, default_cap: int = 1):
+        self.caps = dict(caps or {})
+        self.default_cap = max(1, default_cap)
+        self._queues: dict[str, deque] = {}
+        self._in_flight: dict[str, int] = {}
+        self._cond = threading.Condition()
+
+    def cap(self, key: str) -> int:
+        return max(1, self.caps.get(key, self.default_cap))
+
+    def add(self, key: str, job):
+        with self._cond:
+            self._queues.setdefault(key, deque()).append(job)
+            self._in_flight.setdefault(key, 0)
+            self._cond.notify_all()
+
+    @property
+    def capacity(self) -> int:
+        """Most jobs that can be in flight at once: the sum of the caps of queued keys."""
+        return sum(self.cap(key) for key in self._queues) or 1
+
+    def pending(self) -> int:
+        with self._cond:
+            return sum(len(q) for q in self._queues.values())
+
+    def _next_key(self, order: deque):
+        for _ in range(len(order)):
+            key = order[0]
+            order.rotate(-1)
+            if self._queues[key] and self._in_flight[key] < self.cap(key):
+                return key
+        return None
+
+    def jobs(self):
+        """Yield every queued job, blocking while all endpoints with work are at their cap."""
+        order = deque(self._queues)
+        while True:
+            with self._cond:
+                while True:
+                    if not any(self._queues.values()):
+                        return
+                    order.extend(k for k in self._queues if k not in order)
+                    key = self._next_key(order)
+                    if key is not None:
+                        break
+                    self._cond.wait()
+                self._in_flight[key] += 1
+                job = self._queues[key].popleft()
+            yield job
+
+    def release(self, key: str):
+        with self._cond:
+            self._in_flight[key] -= 1
+            self._cond.notify_all()
@@ -0,0 +1,131 @@
+"""Columnar snapshot of each model's latest run per prompt.
+
+Analytics (dashboard stats, run.py compare) read scores, latencies, tokens
+and flags out of dense (model, prompt[, judge | metric]) NumPy arrays built
+in one pass over the results, instead of calling latest_run() and walking
+nested dicts for every model, prompt and question asked of them. Missing
+numbers are NaN; the present / error masks say which cells hold a run.
+"""
+
+import numpy as np
+
+
+def flag_code(flag: str) -> str:
+    """Flag name without its detail text, e.g. "FAIL_TOO_LONG: 38 words" -> "FAIL_TOO_LONG"."""
+    return flag.split(":", 1)[0]
+
+
+def _latest(data: dict, pid: str) -> dict:
+    runs = data.get("runs", {}).get(pid, [])
+    return runs[-1] if runs else {}
+
+
+def _number(value) -> float:
+    return float(value) if isinstance(value, (int, float)) else np.nan
+
+
+def _request_latency(run: dict) -> float:
+    """latency_s of a run that timed a real request.
+
+    NaN for a cache hit or a batch reply: both are served locally in ~0 s.
+    """
+    if run.get("cached") or run.get("batch_id"):
+        return np.nan
+    return _number(run.get("latency_s", 0))
+
+
+class LatestRuns:
+    """Latest run per (model, prompt) as arrays.
+
+    Per-run fields have shape (M, P) in the order of models and pids;
+    judge has shape (M, P, J) in the order of judges (first seen), deepeval
+    (M, P, K) in the order of metrics. flags holds a bitmask over
+    flag_codes. The raw entries stay available through run() for detail
+    that is not numeric (rationales, full flag text).
+    """
+
+    def __init__(self, models: dict, pids: list):
+        self.models = list(models)
+        self.pids = list(pids)
+        self.runs = [[_latest(data, pid) for pid in self.pids] for data in models.values()]
+
+        judges, metrics, codes = {}, {}, {}
+        for row in self.runs:
+            for run in row:
+                for jname in run.get("judge_scores") or {}:
+                    judges.setdefault(jname, len(judges))
+                for metric in run.get("deepeval_scores") or {}:
+                    metrics.setdefault(metric, len(metrics))
+                for fl in run.get("auto_checks", {}).get("flags", []):
+                    codes.setdefault(flag_code(fl), len(codes))
+        self.judges = list(judges)
+        self.metrics = list(metrics)
+        self.flag_codes = list(codes)
+
+        shape = (len(self.models), len(self.pids))
+        self.present = np.zeros(shape, dtype=bool)
+        self.error = np.zeros(shape, dtype=bool)
+        # NaN for runs that didn't time a request (cache hits, batch replies)
+        self.latency = np.full(shape, np.nan)
+        self.output_tokens = np.zeros(shape)
+        # Streamed runs only; NaN elsewhere
+        self.ttft = np.full(shape, np.nan)
+        self.itl = np.full(shape, np.nan)
+        self.tokens_per_s = np.full(shape, np.nan)
+        self.judge_score_avg = np.full(shape, np.nan)
+        self.deepeval_avg = np.full(shape, np.nan)
+        self.judge = np.full(shape + (len(self.judges),), np.nan)
+        self.deepeval = np.full(shape + (len(self.metrics),), np.nan)
+        # More distinct codes than bits falls back to Python ints
+        self.flags = np.zeros(shape, dtype=np.uint64 if len(codes) <= 64 else object)
+
+        for m, row in enumerate(self.runs):
+            for p, run in enumerate(row):
+                if not run:
+                    continue
+                self.present[m, p] = True
+                self.error[m, p] = bool(run.get("error"))
+                self.latency[m, p] = _request_latency(run)
+                self.output_tokens[m, p] = run.get("output_tokens", 0) or 0
+                self.ttft[m, p] = _number(run.get("ttft_s"))
+                self.itl[m, p] = _number(run.get("itl_s"))
+                self.tokens_per_s[m, p] = _number(run.get("tokens_per_s"))
+                self.judge_score_avg[m, p] = _number(run.get("judge_score_avg"))
+                self.deepeval_avg[m, p] = _number(run.get("deepeval_avg"))
+                for jname, jdata in (run.get("judge_scores") or {}).items():
+                    self.judge[m, p, judges[jname]] = _number((jdata or {}).get("score"))
+                for metric, score in (run.get("deepeval_scores") or {}).items():
+                    self.deepeval[m, p, metrics[metric]] = _number(score)
+                bits = 0
+                for fl in run.get("auto_checks", {}).get("flags", []):
+                    bits |= 1 << codes[flag_code(fl)]
+                self.flags[m, p] = bits if self.flags.dtype == object else np.uint64(bits)
+
+    @property
+    def ok(self) -> np.ndarray:
+        """Cells holding a non-error run."""
+        return self.present & ~self.error
+
+    @property
+    def flagged(self) -> np.ndarray:
+        """Cells whose run raised any auto-check flag."""
+        return self.flags != 0
+
+    def run(self, m: int, p: int) -> dict:
+        """Raw latest entry for models[m], pids[p] ({} if never run)."""
+        return self.runs[m][p]
+
+    def metric(self, name: str) -> np.ndarray:
+        """(M, P) scores for one DeepEval metric, all NaN if no run has it."""
+        if name in self.metrics:
+            return self.deepeval[:, :, self.metrics.index(name)]
+        return np.full(self.present.shape, np.nan)
+
+
+def masked_mean(values: np.ndarray, mask: np.ndarray, axis=None):
+    """Mean of values where mask is set (and values are not NaN); NaN where nothing is."""
+    mask = mask & ~np.isnan(values)
+    counts = mask.sum(axis=axis)
+    sums = np.where(mask, values, 0).sum(axis=axis)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
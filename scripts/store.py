@@ -0,0 +1,231 @@
+"""Optional SQLite results backend.
+
+Selected with results.backend: sqlite in config.yaml. Each run entry is kept
+verbatim (so export reproduces the JSON layout exactly) alongside indexed
+runs, judge_scores and deepeval_scores tables, so questions like "latest run
+per prompt" or "which prompts lack a score from judge X" are index lookups
+instead of parsing every model's JSON document.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from scripts import journal
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    name TEXT PRIMARY KEY,
+    meta TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    model TEXT NOT NULL,
+    prompt_id TEXT NOT NULL,
+    timestamp TEXT,
+    error INTEGER NOT NULL DEFAULT 0,
+    judge_score_avg REAL,
+    deepeval_avg REAL,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_model_prompt_ts ON runs(model, prompt_id, timestamp);
+CREATE TABLE IF NOT EXISTS judge_scores (
+    run_id INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    prompt_id TEXT NOT NULL,
+    judge TEXT NOT NULL,
+    score INTEGER,
+    judged_at TEXT
+);
+CREATE INDEX IF NOT EXISTS judge_scores_model_prompt ON judge_scores(model, prompt_id, judge);
+CREATE INDEX IF NOT EXISTS judge_scores_run ON judge_scores(run_id);
+CREATE TABLE IF NOT EXISTS deepeval_scores (
+    run_id INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    prompt_id TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    score REAL
+);
+CREATE INDEX IF NOT EXISTS deepeval_scores_model_prompt ON deepeval_scores(model, prompt_id, metric);
+CREATE INDEX IF NOT EXISTS deepeval_scores_run ON deepeval_scores(run_id);
+"""
+
+# Latest run per (model, prompt): runs are only ever appended, so the highest id wins
+LATEST_RUN_IDS = "SELECT MAX(id) FROM runs WHERE model = ? GROUP BY prompt_id"
+
+
+class ResultsStore:
+    """SQLite store holding every model's run history."""
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # ── writes ──
+
+    def _insert_run(self, model: str, pid: str, entry: dict):
+        cur = self._db.execute(
+            "INSERT INTO runs (model, prompt_id, timestamp, error, judge_score_avg, deepeval_avg, entry)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (model, pid, entry.get("timestamp"), 1 if entry.get("error") else 0,
+             entry.get("judge_score_avg"), entry.get("deepeval_avg"), json.dumps(entry, ensure_ascii=False)),
+        )
+        run_id = cur.lastrowid
+        self._db.executemany(
+            "INSERT INTO judge_scores (run_id, model, prompt_id, judge, score, judged_at) VALUES (?, ?, ?, ?, ?, ?)",
+            [(run_id, model, pid, judge, js.get("score"), js.get("judged_at"))
+             for judge, js in (entry.get("judge_scores") or {}).items() if isinstance(js, dict)],
+        )
+        self._db.executemany(
+            "INSERT INTO deepeval_scores (run_id, model, prompt_id, metric, score) VALUES (?, ?, ?, ?, ?)",
+            [(run_id, model, pid, metric, score) for metric, score in (entry.get("deepeval_scores") or {}).items()],
+        )
+
+    def _touch(self, model: str, meta: dict):
+        self._db.execute(
+            "INSERT INTO models (name, meta, version) VALUES (?, ?, 1)"
+            " ON CONFLICT(name) DO UPDATE SET meta = excluded.meta, version = version + 1",
+            (model, json.dumps(meta, ensure_ascii=False)),
+        )
+
+    def _meta(self, model: str) -> dict | None:
+        row = self._db.execute("SELECT meta FROM models WHERE name = ?", (model,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_model(self, model: str, data: dict):
+        """Replace a model's whole history with data (the JSON results layout)."""
+        meta = {k: v for k, v in data.items() if k != "runs"}
+        with self._lock, self._db:
+            for table in ("judge_scores", "deepeval_scores", "runs"):
+                self._db.execute(f"DELETE FROM {table} WHERE model = ?", (model,))
+            for pid, runs in data.get("runs", {}).items():
+                for entry in runs:
+                    self._insert_run(model, pid, entry)
+            self._touch(model, meta)
+
+    def append_runs(self, model: str, pairs: list, meta: dict | None = None):
+        """Append (pid, entry) pairs in one transaction, creating the model if needed."""
+        with self._lock, self._db:
+            current = self._meta(model) or meta or {"model_name": model, "created": datetime.now().isoformat()}
+            current["updated"] = datetime.now().isoformat()
+            for pid, entry in pairs:
+                self._insert_run(model, pid, entry)
+            self._touch(model, current)
+
+    # ── reads ──
+
+    def list_models(self) -> list[str]:
+        with self._lock:
+            return [r[0] for r in self._db.execute("SELECT name FROM models ORDER BY name")]
+
+    def fingerprint(self, model: str) -> list:
+        with self._lock:
+            row = self._db.execute("SELECT version FROM models WHERE name = ?", (model,)).fetchone()
+        return [row[0] if row else None]
+
+    def load_model(self, model: str) -> dict | None:
+        """The model's document in the JSON results layout, or None if unknown."""
+        with self._lock:
+            meta = self._meta(model)
+            if meta is None:
+                return None
+            rows = self._db.execute(
+                "SELECT prompt_id, entry FROM runs WHERE model = ? ORDER BY id", (model,)
+            ).fetchall()
+        runs = {}
+        for pid, entry in rows:
+            runs.setdefault(pid, []).append(json.loads(entry))
+        return {**meta, "runs": runs}
+
+    def load_latest(self, model: str) -> dict | None:
+        """Like load_model() but each prompt's history holds only its latest run."""
+        with self._lock:
+            meta = self._meta(model)
+            if meta is None:
+                return None
+            rows = self._db.execute(
+                f"SELECT prompt_id, entry FROM runs WHERE id IN ({LATEST_RUN_IDS}) ORDER BY id", (model,)
+            ).fetchall()
+        return {**meta, "runs": {pid: [json.loads(entry)] for pid, entry in rows}}
+
+    def model_counts(self) -> list[dict]:
+        """Per model: prompts run, latest runs judged / DeepEval-scored, and last update."""
+        with self._lock:
+            models = self._db.execute("SELECT name, meta FROM models ORDER BY name").fetchall()
+            out = []
+            for name, meta in models:
+                total, judged = self._db.execute(
+                    f"SELECT COUNT(*), COUNT(judge_score_avg) FROM runs WHERE id IN ({LATEST_RUN_IDS})", (name,)
+                ).fetchone()
+                de_scored = self._db.execute(
+                    f"SELECT COUNT(DISTINCT run_id) FROM deepeval_scores"
+                    f" WHERE score IS NOT NULL AND run_id IN ({LATEST_RUN_IDS})", (name,)
+                ).fetchone()[0]
+                meta = json.loads(meta)
+                out.append({"name": name, "prompts": total, "judged": judged, "de_scored": de_scored,
+                            "updated": meta.get("updated", meta.get("created", "?"))})
+        return out
+
+    def missing_judge_scores(self, judge: str, models: list | None = None) -> list[tuple[str, str]]:
+        """(model, prompt_id) pairs whose latest non-error run has no score from judge."""
+        names = models if models is not None else self.list_models()
+        out = []
+        with self._lock:
+            for name in names:
+                rows = self._db.execute(
+                    f"SELECT r.prompt_id FROM runs r WHERE r.id IN ({LATEST_RUN_IDS}) AND r.error = 0"
+                    " AND NOT EXISTS (SELECT 1 FROM judge_scores j WHERE j.run_id = r.id"
+                    " AND j.judge = ? AND j.score IS NOT NULL) ORDER BY r.id",
+                    (name, judge),
+                ).fetchall()
+                out += [(name, r[0]) for r in rows]
+        return out
+
+
+def import_json(store: ResultsStore, results_dir: str, models: list | None = None) -> list[str]:
+    """Load results/<model>.json (plus any journal) into the store. Returns imported names."""
+    root = Path(results_dir)
+    stems = sorted({f.stem for f in root.glob("*.json")} | {f.stem for f in root.glob("*" + journal.JOURNAL_SUFFIX)})
+    names = [s for s in stems if s != "comparison" and ".pre-" not in s and (models is None or s in models)]
+    imported = []
+    for name in names:
+        data = journal.load(str(root / f"{name}.json"))
+        if data is not None:
+            store.save_model(name, data)
+            imported.append(name)
+    return imported
+
+
+def export_json(store: ResultsStore, results_dir: str, models: list | None = None) -> list[str]:
+    """Write each model in the store back out as results/<model>.json. Returns exported names."""
+    os.makedirs(results_dir, exist_ok=True)
+    names = [m for m in store.list_models() if models is None or m in models]
+    for name in names:
+        journal.write_snapshot(os.path.join(results_dir, f"{name}.json"), store.load_model(name))
+    return names
+
+
+_stores: dict[str, ResultsStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_results_store(path: str) -> ResultsStore:
+    """Process-wide ResultsStore for path."""
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = ResultsStore(path)
+        return _stores[path]
@@ -0,0 +1,119 @@
+"""Streaming, field-selective reader for results files.
+
+Dashboard stats only need each prompt's latest run and a handful of numeric
+fields, but results/<model>.json holds every historical run with its full
+response text and judge rationales. load_latest() walks the file as a
+stream of parser events (ijson) and builds only what a spec asks for:
+skipped values are consumed without ever becoming Python objects, and
+earlier runs of a prompt are dropped as soon as a later one is read, so
+peak memory is one run rather than one document.
+
+A spec is None (keep the whole value), a dict of key -> spec for objects
+("*" matches any key not listed, unlisted keys are skipped), or Last(spec)
+for arrays where only the final element matters.
+"""
+
+import json
+import os
+
+try:
+    import ijson
+except ImportError:  # fall back to json.load + prune
+    ijson = None
+
+from scripts import journal
+
+
+class Last:
+    """Array spec: keep only the last element, built with spec."""
+
+    def __init__(self, spec=None):
+        self.spec = spec
+
+
+def _skip(events):
+    depth = 0
+    for event, _ in events:
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+        if depth == 0:
+            return
+
+
+def _build(events, spec=None):
+    event, value = next(events)
+    return _build_from(events, event, value, spec)
+
+
+def _build_from(events, event, value, spec):
+    if event == "start_map":
+        out = {}
+        for event, key in events:
+            if event == "end_map":
+                return out
+            if spec is None:
+                out[key] = _build(events)
+            elif key in spec:
+                out[key] = _build(events, spec[key])
+            elif "*" in spec:
+                out[key] = _build(events, spec["*"])
+            else:
+                _skip(events)
+    if event == "start_array":
+        last = isinstance(spec, Last)
+        item_spec = spec.spec if last else spec
+        out = []
+        for event, item in events:
+            if event == "end_array":
+                return out
+            built = _build_from(events, event, item, item_spec)
+            if last:
+                out[:] = [built]
+            else:
+                out.append(built)
+    return value
+
+
+def prune(value, spec=None):
+    """Apply spec to an already-parsed value (same rules as the streaming reader)."""
+    if spec is None:
+        return value
+    if isinstance(spec, Last):
+        return [prune(value[-1], spec.spec)] if isinstance(value, list) and value else value
+    if isinstance(value, dict):
+        return {k: prune(v, spec[k] if k in spec else spec["*"])
+                for k, v in value.items() if k in spec or "*" in spec}
+    if isinstance(value, list):
+        return [prune(v, spec) for v in value]
+    return value
+
+
+def read(path: str, spec=None):
+    """Parse the JSON file at path keeping only what spec selects."""
+    if ijson is None:
+        with open(path) as f:
+            return prune(json.load(f), spec)
+    with open(path, "rb") as f:
+        try:
+            return _build(ijson.basic_parse(f, use_float=True), spec)
+        except ijson.JSONError as e:
+            raise ValueError(f"invalid JSON in {path}: {e}") from e
+
+
+def load_latest(snapshot_path: str, run_spec=None) -> dict | None:
+    """Like journal.load() but each prompt keeps only its latest run, pruned to run_spec.
+
+    Top-level metadata (model_name, created, updated) is kept whole.
+    """
+    jpath = journal.journal_path(snapshot_path)
+    if os.path.exists(snapshot_path):
+        data = read(snapshot_path, {"runs": {"*": Last(run_spec)}, "*": None})
+    elif os.path.exists(jpath):
+        data = {"runs": {}}
+    else:
+        return None
+    if journal.replay(data, jpath):
+        data["runs"] = {pid: prune(runs, Last(run_spec)) for pid, runs in data["runs"].items()}
+    return data
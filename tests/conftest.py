@@ -2,7 +2,9 @@
 
 import json
 import os
+import re
 import pytest
+import httpx
 from datetime import datetime
 from scripts.providers import Provider
 
@@ -23,6 +25,114 @@ class MockProvider(Provider):
         return self.response, self.usage
 
 
+class BatchServer:
+    """Local stand-in for the Anthropic Message Batches and OpenAI Batch APIs.
+
+    Use as an httpx.MockTransport handler (client() builds one). Each job
+    reports in progress for its first `polls` status checks, then ends. Replies come
+    from reply(prompt); prompts listed in fail end in a per-request error.
+    """
+
+    def __init__(self, reply=None, polls=1, fail=()):
+        self.reply = reply or (lambda prompt: f"reply to {prompt}")
+        self.polls = polls
+        self.fail = set(fail)
+        self.batches = {}
+        self.files = {}
+        self.log = []
+
+    def client(self, base_url: str) -> httpx.Client:
+        return httpx.Client(base_url=base_url, transport=httpx.MockTransport(self))
+
+    def prompts(self) -> list[str]:
+        """Every prompt submitted so far, across all batches."""
+        return [body["messages"][0]["content"] for b in self.batches.values() for _, body in b["requests"]]
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.log.append((request.method, path))
+        if request.method == "POST" and path == "/v1/messages/batches":
+            requests = [(r["custom_id"], r["params"]) for r in json.loads(request.content)["requests"]]
+            return httpx.Response(200, json=self._anthropic_status(self._create("msgbatch", requests)))
+        if m := re.fullmatch(r"/v1/messages/batches/([^/]+)/results", path):
+            lines = [self._anthropic_result(cid, body) for cid, body in self.batches[m[1]]["requests"]]
+            return httpx.Response(200, text="\n".join(json.dumps(line) for line in lines))
+        if m := re.fullmatch(r"/v1/messages/batches/([^/]+)", path):
+            return httpx.Response(200, json=self._anthropic_status(self._poll(m[1])))
+        if request.method == "POST" and path == "/v1/files":
+            assert b'name="purpose"' in request.content and b"batch" in request.content
+            file_id = f"file-{len(self.files)}"
+            self.files[file_id] = [json.loads(line) for line in request.content.split(b"\n")
+                                   if line.startswith(b'{"custom_id"')]
+            return httpx.Response(200, json={"id": file_id, "purpose": "batch"})
+        if request.method == "POST" and path == "/v1/batches":
+            spec = json.loads(request.content)
+            lines = self.files[spec["input_file_id"]]
+            assert all(line["url"] == spec["endpoint"] == "/v1/chat/completions" for line in lines)
+            return httpx.Response(200, json=self._openai_status(
+                self._create("batch", [(line["custom_id"], line["body"]) for line in lines])))
+        if m := re.fullmatch(r"/v1/batches/([^/]+)", path):
+            return httpx.Response(200, json=self._openai_status(self._poll(m[1])))
+        if m := re.fullmatch(r"/v1/files/([^/]+)/content", path):
+            return httpx.Response(200, text="\n".join(json.dumps(line) for line in self.files[m[1]]))
+        return httpx.Response(404, json={"error": {"message": f"no route {request.method} {path}"}})
+
+    def _create(self, prefix, requests):
+        batch_id = f"{prefix}_{len(self.batches)}"
+        self.batches[batch_id] = {"id": batch_id, "requests": requests, "polls": self.polls}
+        return self.batches[batch_id]
+
+    def _poll(self, batch_id):
+        batch = self.batches[batch_id]
+        batch["polls"] -= 1
+        return batch
+
+    def _failed(self, body):
+        return body["messages"][0]["content"] in self.fail
+
+    def _anthropic_status(self, batch):
+        ended = batch["polls"] < 0
+        status = {"id": batch["id"], "processing_status": "ended" if ended else "in_progress",
+                  "request_counts": {"processing": 0 if ended else len(batch["requests"]),
+                                     "succeeded": len(batch["requests"]) if ended else 0}}
+        if ended:
+            status["results_url"] = f"https://api.anthropic.com/v1/messages/batches/{batch['id']}/results"
+        return status
+
+    def _anthropic_result(self, cid, body):
+        if self._failed(body):
+            return {"custom_id": cid, "result": {"type": "errored", "error": {
+                "type": "error", "error": {"type": "invalid_request_error", "message": "prompt rejected"}}}}
+        return {"custom_id": cid, "result": {"type": "succeeded", "message": {
+            "model": body["model"], "content": [{"type": "text", "text": self.reply(body["messages"][0]["content"])}],
+            "usage": {"input_tokens": 5, "output_tokens": 7}}}}
+
+    def _openai_status(self, batch):
+        done = batch["polls"] < 0
+        status = {"id": batch["id"], "status": "completed" if done else "in_progress",
+                  "request_counts": {"total": len(batch["requests"]), "completed": 0, "failed": 0}}
+        if done and "output_file_id" not in batch:
+            ok = [(cid, body) for cid, body in batch["requests"] if not self._failed(body)]
+            bad = [(cid, body) for cid, body in batch["requests"] if self._failed(body)]
+            batch["output_file_id"] = self._file([{"custom_id": cid, "error": None, "response": {
+                "status_code": 200, "body": {"choices": [{"message": {"content": self.reply(body["messages"][0]["content"])}}],
+                                             "usage": {"prompt_tokens": 5, "completion_tokens": 7}}}} for cid, body in ok])
+            if bad:
+                batch["error_file_id"] = self._file([{"custom_id": cid, "error": None, "response": {
+                    "status_code": 400, "body": {"error": {"message": "prompt rejected"}}}} for cid, _ in bad])
+        if done:
+            failed = sum(self._failed(body) for _, body in batch["requests"])
+            status["request_counts"].update(completed=len(batch["requests"]) - failed, failed=failed)
+            status["output_file_id"] = batch["output_file_id"]
+            status["error_file_id"] = batch.get("error_file_id")
+        return status
+
+    def _file(self, lines):
+        file_id = f"file-{len(self.files)}"
+        self.files[file_id] = lines
+        return file_id
+
+
 @pytest.fixture
 def tmp_results_dir(tmp_path, monkeypatch):
     """Temporary results directory - patches RESULTS_DIR in run.py."""
@@ -0,0 +1,72 @@
+"""Tests for scripts/assets.py - content-hashed, precompressed static assets."""
+
+import gzip
+import os
+import pytest
+from scripts import assets
+
+
+class TestWriteAsset:
+    def test_plain_asset_with_variants(self, tmp_path):
+        rel = assets.write_asset(str(tmp_path), "page.html", b"<html>hi</html>")
+        assert rel == "page.html"
+        assert (tmp_path / "page.html").read_bytes() == b"<html>hi</html>"
+        assert gzip.decompress((tmp_path / "page.html.gz").read_bytes()) == b"<html>hi</html>"
+
+    @pytest.mark.skipif(assets.brotli is None, reason="brotli not installed")
+    def test_brotli_variant(self, tmp_path):
+        assets.write_asset(str(tmp_path), "page.html", b"<html>hi</html>")
+        assert assets.brotli.decompress((tmp_path / "page.html.br").read_bytes()) == b"<html>hi</html>"
+
+    def test_hashed_name_follows_content(self, tmp_path):
+        a = assets.write_asset(str(tmp_path), "data/x.json", b"{}", hashed=True)
+        b = assets.write_asset(str(tmp_path), "data/x.json", b"{}", hashed=True)
+        c = assets.write_asset(str(tmp_path), "data/x.json", b"[]", hashed=True)
+        assert a == b != c
+        assert a.startswith("data/x.") and a.endswith(".json")
+        assert (tmp_path / a).read_bytes() == b"{}"
+
+    def test_gzip_is_deterministic(self, tmp_path):
+        assets.write_asset(str(tmp_path / "one"), "a.json", b"same")
+        assets.write_asset(str(tmp_path / "two"), "a.json", b"same")
+        assert (tmp_path / "one" / "a.json.gz").read_bytes() == (tmp_path / "two" / "a.json.gz").read_bytes()
+
+    def test_existing_hashed_asset_not_rewritten(self, tmp_path):
+        rel = assets.write_asset(str(tmp_path), "a.json", b"{}", hashed=True)
+        os.utime(tmp_path / rel, (1, 1))
+        assets.write_asset(str(tmp_path), "a.json", b"{}", hashed=True)
+        assert os.stat(tmp_path / rel).st_mtime == 1
+
+
+class TestPruneHashed:
+    def test_drops_old_generations_only(self, tmp_path):
+        old = assets.write_asset(str(tmp_path), "data.json", b"old", hashed=True)
+        new = assets.write_asset(str(tmp_path), "data.json", b"new", hashed=True)
+        assets.write_asset(str(tmp_path), "data.json", b"new")
+        other = assets.write_asset(str(tmp_path), "causal-data.json", b"c", hashed=True)
+        assets.prune_hashed(str(tmp_path), "data.json", keep=new)
+        names = set(os.listdir(tmp_path))
+        assert not any(n.startswith(old) for n in names)
+        assert {new, new + ".gz", "data.json", other} <= names
+
+    def test_without_keep_drops_every_generation(self, tmp_path):
+        rel = assets.write_asset(str(tmp_path), "data/flags.json", b"f", hashed=True)
+        assets.prune_hashed(str(tmp_path), "data/flags.json")
+        assert not os.path.exists(tmp_path / rel) and not os.path.exists(tmp_path / (rel + ".gz"))
+
+
+class TestWriteIfChanged:
+    def test_same_bytes_not_rewritten(self, tmp_path):
+        path = str(tmp_path / "a.txt")
+        assert assets.write_if_changed(path, b"x") is True
+        os.utime(path, (1, 1))
+        assert assets.write_if_changed(path, b"x") is False
+        assert os.stat(path).st_mtime == 1
+        assert assets.write_if_changed(path, b"y") is True
+        assert open(path, "rb").read() == b"y"
+
+    def test_unchanged_asset_keeps_variants(self, tmp_path):
+        assets.write_asset(str(tmp_path), "p.html", b"<p>")
+        os.utime(tmp_path / "p.html.gz", (1, 1))
+        assets.write_asset(str(tmp_path), "p.html", b"<p>")
+        assert os.stat(tmp_path / "p.html.gz").st_mtime == 1
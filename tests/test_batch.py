@@ -0,0 +1,167 @@
+"""Tests for scripts/batch.py - batch submission, polling and replay against a local stand-in server."""
+
+import pytest
+
+from scripts.batch import (BatchError, ReplayProvider, batch_api, batch_generate, batch_judges,
+                           run_batches)
+from scripts.cache import ResponseCache
+from scripts.judge import judge_all
+from scripts.providers import AnthropicProvider, OpenAIProvider
+from scripts.retry import RetryingProvider, RetryPolicy
+from tests.conftest import BatchServer, MockProvider
+
+
+def _anthropic(server, model="claude-test"):
+    p = AnthropicProvider(model, "k")
+    p.client = server.client("https://api.anthropic.com")
+    return p
+
+
+def _openai(server, model="gpt-test"):
+    p = OpenAIProvider(model, "k")
+    p.client = server.client("https://api.openai.com/v1")
+    return p
+
+
+def _no_sleep(sleeps):
+    return {"poll_s": 5, "sleep": sleeps.append}
+
+
+@pytest.mark.parametrize("make", [_anthropic, _openai], ids=["anthropic", "openai"])
+class TestRunBatches:
+    def test_replies_in_request_order_after_polling(self, make):
+        server, sleeps = BatchServer(polls=2), []
+        api = batch_api(make(server))
+
+        [(batch_id, replies)] = run_batches([(api, [("a", {"max_tokens": 9}), ("b", {"max_tokens": 9})])],
+                                            **_no_sleep(sleeps))
+
+        assert batch_id in server.batches
+        assert replies == [("reply to a", {"input_tokens": 5, "output_tokens": 7}),
+                           ("reply to b", {"input_tokens": 5, "output_tokens": 7})]
+        assert sleeps == [5, 5]
+        # Bodies are the provider's own request bodies
+        body = server.batches[batch_id]["requests"][0][1]
+        assert body["model"] == api.provider.model and body["max_tokens"] == 9
+
+    def test_failed_request_becomes_its_exception(self, make):
+        server = BatchServer(polls=0, fail={"bad"})
+
+        [(_, replies)] = run_batches([(batch_api(make(server)), [("bad", {}), ("ok", {})])], poll_s=0)
+
+        assert isinstance(replies[0], RuntimeError) and "prompt rejected" in str(replies[0])
+        assert replies[1][0] == "reply to ok"
+
+    def test_timeout_names_the_batch(self, make):
+        server = BatchServer(polls=100)
+        with pytest.raises(BatchError, match="still running"):
+            run_batches([(batch_api(make(server)), [("a", {})])], poll_s=0, timeout_s=0)
+
+    def test_submit_failure(self, make):
+        server = BatchServer()
+        api = batch_api(make(server))
+        api.client = server.client("https://elsewhere.example/none")
+        with pytest.raises(BatchError, match="could not submit"):
+            run_batches([(api, [("a", {})])], poll_s=0)
+
+
+class TestRunBatchesAcrossProviders:
+    def test_all_jobs_polled_together(self):
+        server, sleeps = BatchServer(polls=1), []
+
+        results = run_batches([(batch_api(_anthropic(server)), [("a", {})]),
+                               (batch_api(_openai(server)), [("b", {})])], **_no_sleep(sleeps))
+
+        assert [replies[0][0] for _, replies in results] == ["reply to a", "reply to b"]
+        # One wait covers both jobs
+        assert sleeps == [5]
+
+    def test_openai_job_failed_outright(self):
+        api = batch_api(_openai(BatchServer()))
+        with pytest.raises(BatchError, match="batch_x failed: bad jsonl"):
+            api.results({"id": "batch_x", "status": "failed", "errors": {"data": [{"message": "bad jsonl"}]}})
+
+    def test_openai_upload_is_jsonl(self):
+        server = BatchServer(polls=0)
+        run_batches([(batch_api(_openai(server)), [("a", {}), ("b", {})])], poll_s=0)
+        lines = server.files["file-0"]
+        assert [line["custom_id"] for line in lines] == ["req-0", "req-1"]
+        assert {line["method"] for line in lines} == {"POST"}
+        assert ("POST", "/v1/chat/completions") not in server.log
+
+
+class TestBatchApi:
+    def test_unwraps_provider_wrappers(self):
+        provider = _anthropic(BatchServer())
+        api = batch_api(RetryingProvider(provider, RetryPolicy()))
+        assert api.provider is provider
+
+    def test_none_for_openai_compatible_hosts(self):
+        provider = OpenAIProvider("llama-test", "k", base_url="http://localhost:8000/v1")
+        assert batch_api(provider) is None
+        assert batch_api(OpenAIProvider("gpt-test", "k")) is not None
+
+    def test_none_without_batch_endpoints(self):
+        assert batch_api(MockProvider()) is None
+        with pytest.raises(BatchError, match="no batch API"):
+            batch_generate(MockProvider(), [{"prompt": "a"}], {})
+
+
+class TestBatchGenerate:
+    def test_replay_serves_each_prompt(self):
+        server = BatchServer(polls=0, fail={"q2"})
+        prompts = [{"id": "P1", "prompt": "q1"}, {"id": "P2", "prompt": "q2"}, {"id": "P3", "prompt": "q1"}]
+
+        replay = batch_generate(_anthropic(server), prompts, {}, poll_s=0)
+
+        # Identical prompt text is sent once
+        assert server.prompts() == ["q1", "q2"]
+        content, usage = replay.complete("q1", {})
+        assert content == "reply to q1" and usage["batch_id"] == "msgbatch_0"
+        with pytest.raises(RuntimeError, match="prompt rejected"):
+            replay.complete("q2", {})
+        assert replay.contents("q2") == []
+        with pytest.raises(RuntimeError, match="not part of"):
+            replay.complete("q9", {})
+
+    def test_runs_per_prompt(self):
+        server = BatchServer(polls=0)
+        replay = batch_generate(_openai(server), [{"prompt": "q"}], {}, runs=3, poll_s=0)
+        assert server.prompts() == ["q"] * 3
+        assert len(replay.complete_n("q", {}, 3)) == 3
+        assert replay.contents("q") == ["reply to q"] * 3
+
+
+class TestBatchJudges:
+    PMETA = {"id": "P1", "prompt": "q", "ideal": "i", "criteria": []}
+    VERDICT = '{"score": 4, "rationale": "ok"}'
+
+    def test_replayed_verdicts_match_live_scoring(self):
+        server = BatchServer(polls=0, reply=lambda prompt: self.VERDICT)
+        live = MockProvider(response='{"score": 2, "rationale": "meh"}')
+        judges = {"j-batch": {"provider": _anthropic(server), "params": {"max_tokens": 50}, "model": "claude-test"},
+                  "j-live": {"provider": live, "params": {}, "model": "mock"}}
+        checks = {"flags": []}
+
+        batched = batch_judges(judges, [(self.PMETA, "answer", checks, ["j-batch", "j-live"])], poll_s=0)
+
+        assert isinstance(batched["j-batch"]["provider"], ReplayProvider)
+        assert batched["j-live"]["provider"] is live
+        assert judges["j-batch"]["provider"] is not batched["j-batch"]["provider"]
+        scores = judge_all(batched, self.PMETA, "answer", checks)
+        assert (scores["j-batch"]["score"], scores["j-live"]["score"]) == (4, 2)
+        body = server.batches["msgbatch_0"]["requests"][0][1]
+        assert body["max_tokens"] == 50 and "answer" in body["messages"][0]["content"]
+
+    def test_stored_verdicts_not_resubmitted(self, tmp_path):
+        server = BatchServer(polls=0, reply=lambda prompt: self.VERDICT)
+        verdicts = ResponseCache(str(tmp_path / "v.sqlite"))
+        judges = {"j": {"provider": _openai(server), "params": {}, "model": "gpt-test"}}
+        items = [(self.PMETA, "answer", {"flags": []}, ["j"])]
+
+        judge_all(batch_judges(judges, items, verdicts, poll_s=0), self.PMETA, "answer", {"flags": []},
+                  verdicts=verdicts)
+        again = batch_judges(judges, items, verdicts, poll_s=0)
+
+        assert len(server.batches) == 1
+        assert again is judges
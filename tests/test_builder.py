@@ -0,0 +1,70 @@
+"""Tests for scripts/builder.py - debounced background dashboard rebuilds."""
+
+import os
+import time
+import pytest
+from scripts import builder
+
+
+@pytest.fixture
+def in_tmp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    spawned = []
+    monkeypatch.setattr(builder, "spawn_builder", lambda debounce: spawned.append(debounce))
+    return spawned
+
+
+class TestNotify:
+    def test_records_change_and_spawns_builder(self, in_tmp):
+        assert builder.notify(5) == "queued"
+        assert os.path.exists(builder.PENDING_FILE)
+        assert in_tmp == [5]
+
+    def test_no_spawn_while_builder_holds_lock(self, in_tmp):
+        import fcntl
+        os.makedirs(".cache", exist_ok=True)
+        with open(builder.LOCK_FILE, "a") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            builder.notify(5)
+        assert in_tmp == []
+
+    def test_builds_inline_without_locking(self, in_tmp, monkeypatch):
+        monkeypatch.setattr(builder, "fcntl", None)
+        built = []
+        assert builder.notify(5, build=lambda: built.append(1)) == "built"
+        assert built == [1]
+
+
+class TestRunBuilder:
+    def test_many_notifications_one_build(self, in_tmp):
+        for _ in range(40):
+            builder.notify(0)
+        built = []
+        assert builder.run_builder(0, build=lambda: built.append(1)) == 1
+        assert not os.path.exists(builder.PENDING_FILE)
+
+    def test_waits_for_quiet_window(self, in_tmp):
+        builder.notify(10)
+        slept = []
+
+        def sleep(s):
+            slept.append(s)
+            past = time.time() - 11
+            os.utime(builder.PENDING_FILE, (past, past))
+
+        assert builder.run_builder(10, build=lambda: None, sleep=sleep) == 1
+        assert len(slept) == 1 and 0 < slept[0] <= 10
+
+    def test_change_during_build_queues_another(self, in_tmp):
+        builder.notify(0)
+        built = []
+
+        def build():
+            built.append(1)
+            if len(built) == 1:
+                builder.notify(0)
+
+        assert builder.run_builder(0, build=build) == 2
+
+    def test_nothing_pending(self, in_tmp):
+        assert builder.run_builder(0, build=lambda: pytest.fail("should not build")) == 0
@@ -0,0 +1,139 @@
+"""Tests for scripts/cache.py - response cache keys, TTL, LRU eviction, provider wrapper."""
+
+import time
+import pytest
+from scripts.cache import CachingProvider, ResponseCache, response_key
+from tests.conftest import MockProvider
+
+
+MODEL_CFG = {"provider": "openai", "model": "gpt-test", "base_url": "http://local/v1"}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ResponseCache(str(tmp_path / "cache.sqlite"))
+    yield c
+    c.close()
+
+
+class TestResponseKey:
+    def test_stable(self):
+        assert response_key(MODEL_CFG, {"temperature": 0}, "p") == response_key(MODEL_CFG, {"temperature": 0}, "p")
+
+    def test_param_order_irrelevant(self):
+        a = response_key(MODEL_CFG, {"temperature": 0, "max_tokens": 5}, "p")
+        b = response_key(MODEL_CFG, {"max_tokens": 5, "temperature": 0}, "p")
+        assert a == b
+
+    @pytest.mark.parametrize("change", [
+        {"model": "other"}, {"provider": "anthropic"}, {"base_url": "http://elsewhere/v1"},
+    ])
+    def test_config_changes_key(self, change):
+        assert response_key(MODEL_CFG, {}, "p") != response_key({**MODEL_CFG, **change}, {}, "p")
+
+    def test_prompt_and_params_change_key(self):
+        base = response_key(MODEL_CFG, {"temperature": 0}, "p")
+        assert base != response_key(MODEL_CFG, {"temperature": 0}, "q")
+        assert base != response_key(MODEL_CFG, {"temperature": 0, "max_tokens": 9}, "p")
+
+
+class TestResponseCache:
+    def test_roundtrip(self, cache):
+        cache.put("k", {"content": "c", "usage": {}})
+        assert cache.get("k") == {"content": "c", "usage": {}}
+        assert cache.get("missing") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "c.sqlite")
+        ResponseCache(path).put("k", {"v": 1})
+        assert ResponseCache(path).get("k") == {"v": 1}
+
+    def test_ttl_expiry(self, tmp_path):
+        c = ResponseCache(str(tmp_path / "c.sqlite"), ttl_s=0.05)
+        c.put("k", {"v": 1})
+        time.sleep(0.1)
+        assert c.get("k") is None
+        assert len(c) == 0
+
+    def test_lru_eviction_by_entries(self, tmp_path):
+        c = ResponseCache(str(tmp_path / "c.sqlite"), max_entries=2)
+        c.put("a", 1)
+        time.sleep(0.01)
+        c.put("b", 2)
+        time.sleep(0.01)
+        c.get("a")  # a is now most recently used
+        time.sleep(0.01)
+        c.put("c", 3)
+        assert c.get("a") == 1
+        assert c.get("b") is None
+        assert c.get("c") == 3
+
+    def test_eviction_by_size(self, tmp_path):
+        c = ResponseCache(str(tmp_path / "c.sqlite"), max_bytes=250)
+        for i in range(5):
+            c.put(f"k{i}", "x" * 100)
+            time.sleep(0.01)
+        assert len(c) == 2
+        assert c.get("k4") is not None
+
+
+class TestCachingProvider:
+    def test_second_call_served_from_cache(self, cache):
+        inner = MockProvider(response="fresh", usage={"input_tokens": 1, "output_tokens": 2})
+        p = CachingProvider(inner, cache, MODEL_CFG)
+        assert p.complete("q", {"temperature": 0}) == ("fresh", {"input_tokens": 1, "output_tokens": 2})
+        content, usage = p.complete("q", {"temperature": 0})
+        assert content == "fresh"
+        assert usage["cached"] is True
+        assert len(inner.calls) == 1
+
+    def test_hit_drops_stream_timings(self, cache):
+        inner = MockProvider(usage={"input_tokens": 1, "output_tokens": 2, "ttft_s": 0.3, "tokens_per_s": 40.0})
+        p = CachingProvider(inner, cache, MODEL_CFG)
+        assert p.complete("q", {"temperature": 0})[1]["ttft_s"] == 0.3
+        assert p.complete("q", {"temperature": 0})[1] == {"input_tokens": 1, "output_tokens": 2, "cached": True}
+
+    def test_sampled_calls_bypass_cache(self, cache):
+        inner = MockProvider()
+        p = CachingProvider(inner, cache, MODEL_CFG)
+        p.complete("q", {"temperature": 0.7})
+        p.complete("q", {"temperature": 0.7})
+        assert len(inner.calls) == 2
+        assert len(cache) == 0
+
+    def test_sampled_opt_in(self, cache):
+        inner = MockProvider()
+        p = CachingProvider(inner, cache, MODEL_CFG, sampled=True)
+        p.complete("q", {"temperature": 0.7})
+        p.complete("q", {"temperature": 0.7})
+        assert len(inner.calls) == 1
+
+    def test_errors_not_cached(self, cache):
+        p = CachingProvider(MockProvider(error=RuntimeError("down")), cache, MODEL_CFG)
+        with pytest.raises(RuntimeError):
+            p.complete("q", {"temperature": 0})
+        assert len(cache) == 0
+
+    def test_samples_cached_per_index(self, cache):
+        inner = MockProvider(response="fresh")
+        p = CachingProvider(inner, cache, MODEL_CFG)
+        p.complete("q", {"temperature": 0})
+        samples = p.complete_n("q", {"temperature": 0}, 3)
+        # Sample 0 is the single-run reply; the other two were fetched
+        assert samples[0][1]["cached"] is True
+        assert len(inner.calls) == 3 and len(cache) == 3
+        assert all(u.get("cached") for _, u in p.complete_n("q", {"temperature": 0}, 3))
+
+    def test_uncacheable_samples_pass_through(self, cache):
+        inner = MockProvider()
+        CachingProvider(inner, cache, MODEL_CFG).complete_n("q", {"temperature": 0.7}, 2)
+        assert len(inner.calls) == 2 and len(cache) == 0
+
+    def test_async_hit(self, cache):
+        import asyncio
+        inner = MockProvider(response="a")
+        p = CachingProvider(inner, cache, MODEL_CFG)
+        asyncio.run(p.acomplete("q", {"temperature": 0}))
+        assert asyncio.run(p.acomplete("q", {"temperature": 0}))[1]["cached"] is True
+        assert len(inner.calls) == 1
@@ -76,6 +76,12 @@ class TestComputeStats:
         assert lb[0]["avg_score"] > 0
         assert lb[0]["total"] == 2
 
+    def test_cache_hits_left_out_of_latency(self, basic_prompts):
+        hit = {**_make_run(), "latency_s": 0.0, "cached": True}
+        models = {"model-a": {"runs": {"C01": [{**_make_run(), "latency_s": 3.0}], "R01": [hit]}}}
+        row = compute_stats(models, basic_prompts)["leaderboard"][0]
+        assert (row["avg_latency"], row["median_latency"]) == (3.0, 3.0)
+
     def test_only_complete_judges_counted(self, basic_prompts):
         """A judge that scored only 1 of 2 prompts should be excluded from avg."""
         models = {
@@ -124,6 +130,36 @@ class TestComputeStats:
         lb = stats["leaderboard"]
         assert lb[0]["errors"] == 1
 
+    def test_streaming_speed(self, basic_prompts):
+        fast = {**_make_run(), "ttft_s": 0.2, "itl_s": 0.02, "tokens_per_s": 50.0}
+        slow = {**_make_run(), "ttft_s": 0.6, "itl_s": 0.04, "tokens_per_s": 25.0}
+        models = {
+            "streamed": {"runs": {"C01": [fast], "R01": [slow]}},
+            "blocking": {"runs": {"C01": [_make_run()]}},
+        }
+        lb = {m["name"]: m for m in compute_stats(models, basic_prompts)["leaderboard"]}
+        row = lb["streamed"]
+        assert (row["avg_ttft"], row["avg_itl_ms"], row["avg_tps"], row["streamed"]) == (0.4, 30.0, 37.5, 2)
+        assert lb["blocking"]["avg_ttft"] is None and lb["blocking"]["streamed"] == 0
+
+    def test_latest_loadtest_on_row(self, basic_prompts):
+        level = {"concurrency": 4, "latency_p50": 1.0, "latency_p95": 2.0, "latency_p99": 3.0,
+                 "error_rate": 0.0, "tokens_per_s": 90.0, "requests": 32, "sample_error": None}
+        models = {
+            "tested": {"runs": {"C01": [_make_run()]},
+                       "loadtests": [{"timestamp": "old", "levels": []}, {"timestamp": "new", "levels": [level]}]},
+            "untested": {"runs": {"C01": [_make_run()]}},
+        }
+        lb = {m["name"]: m for m in compute_stats(models, basic_prompts)["leaderboard"]}
+        curve = lb["tested"]["loadtest"]
+        assert curve["timestamp"] == "new"
+        assert curve["levels"][0]["tokens_per_s"] == 90.0 and "requests" not in curve["levels"][0]
+        assert lb["untested"]["loadtest"] is None
+
+        from scripts.dashboard import _loadtest_card
+        assert "loadLatencyChart" in _loadtest_card([lb["tested"], lb["untested"]])
+        assert _loadtest_card([lb["untested"]]) == ""
+
     def test_category_breakdown(self, basic_prompts):
         models = {
             "model-a": {
@@ -185,6 +221,70 @@ class TestComputeStats:
         assert lb[0]["name"] == "high-model"
 
 
+class TestJudgePairwise:
+    def test_agreement_over_shared_prompts(self, basic_prompts):
+        models = {
+            "model-a": {"runs": {
+                "C01": [_make_run(judge_scores={"j1": _make_judge(5), "j2": _make_judge(2), "j3": _make_judge(4)})],
+                "R01": [_make_run(judge_scores={"j1": _make_judge(3), "j2": _make_judge(3)})],
+            }},
+            "model-b": {"runs": {
+                "C01": [_make_run(judge_scores={"j1": _make_judge(4), "j3": _make_judge(1)})],
+            }},
+        }
+        stats = compute_stats(models, basic_prompts)
+        pw = stats["judge_pairwise"]
+        assert pw["j1 vs j2"] == {"avg_diff": 1.5, "agree_pct": 50, "n": 2, "self": False}
+        assert pw["j1 vs j3"] == {"avg_diff": 2.0, "agree_pct": 50, "n": 2, "self": False}
+        # Only one prompt scored by both
+        assert pw["j2 vs j3"]["n"] == 1
+        matrix = stats["judge_pairwise_matrix"]
+        assert matrix["j2|j1"] == matrix["j1|j2"]
+        assert matrix["j1|j1"] == {"avg_diff": 0, "agree_pct": 100, "n": 0, "self": True}
+        assert list(matrix) == [f"{a}|{b}" for a in ("j1", "j2", "j3") for b in ("j1", "j2", "j3")]
+
+    def test_no_overlap_omits_pair(self, basic_prompts):
+        models = {"model-a": {"runs": {
+            "C01": [_make_run(judge_scores={"j1": _make_judge(5)})],
+            "R01": [_make_run(judge_scores={"j2": _make_judge(3)})],
+        }}}
+        stats = compute_stats(models, basic_prompts)
+        assert stats["judge_pairwise"] == {}
+        assert set(stats["judge_pairwise_matrix"]) == {"j1|j1", "j2|j2"}
+
+
+class TestSplitStats:
+    def test_every_key_lands_once(self, basic_prompts):
+        from scripts.dashboard import DATA_SHARDS, SERVER_ONLY_KEYS, split_stats
+        stats = compute_stats({"m": {"runs": {"C01": [_make_run(judge_scores={"j1": _make_judge(4)})]}}}, basic_prompts)
+        summary, shards = split_stats(stats)
+        assert set(shards) == set(DATA_SHARDS)
+        assert summary["shards"] == {"judges": "data/judges.json"}
+        merged = {k: v for k, v in summary.items() if k != "shards"}
+        for payload in shards.values():
+            assert not set(payload) & set(merged)
+            merged.update(payload)
+        assert merged == {k: v for k, v in stats.items() if k not in SERVER_ONLY_KEYS}
+
+    def test_every_shard_is_fetched_by_a_page(self, basic_prompts):
+        from scripts.dashboard import DATA_SHARDS, render_pages
+        stats = compute_stats({"m": {"runs": {"C01": [_make_run(judge_scores={"j1": _make_judge(4)})]}}},
+                              basic_prompts, judge_models=["j1"])
+        pages = "".join(render_pages(stats).values())
+        for name in DATA_SHARDS:
+            assert f"DATA.shards.{name}" in pages
+
+
+class TestRenderPages:
+    def test_pool_matches_in_process(self, basic_prompts):
+        from scripts.dashboard import PAGES, render_pages
+        models = {"m": {"runs": {"C01": [_make_run(judge_scores={"j1": _make_judge(4)})]}}}
+        stats = compute_stats(models, basic_prompts, judge_models=["j1"])
+        pages = render_pages(stats)
+        assert list(pages) == list(PAGES)
+        assert render_pages(stats, workers=2) == pages
+
+
 class TestLeaderboardRowEscaping:
     """Model names and companies with HTML special chars must be escaped."""
 
@@ -210,9 +310,99 @@ class TestLeaderboardRowEscaping:
             "cat_scores": {},
         }
         html = _leaderboard_row(0, model_entry)
+        assert 'data-ttft="0"' in html
         # Raw script tag should NOT appear
         assert "<script>" not in html
         # Escaped versions should appear
         assert "&lt;script&gt;" in html
         assert "&amp;" in html
         assert "&quot;" in html
+
+
+class TestResultFiles:
+    def test_sorted_by_file_name(self, tmp_path, monkeypatch):
+        import scripts.dashboard as dashboard
+        monkeypatch.setattr(dashboard, "RESULTS_DIR", str(tmp_path))
+        for name in ("claude-opus-4.json", "claude-opus-4.5.json", "comparison.json", "m.pre-v2.json"):
+            (tmp_path / name).write_text("{}")
+        (tmp_path / "claude-opus-4.1.jsonl").write_text("")
+        assert [f.name for f in dashboard._result_files()] == [
+            "claude-opus-4.1.json", "claude-opus-4.5.json", "claude-opus-4.json"]
+
+
+class TestModelSummaryCache:
+    """load_model_summaries only reloads result files that changed."""
+
+    @pytest.fixture
+    def results(self, tmp_path, monkeypatch):
+        import scripts.dashboard as dashboard
+        monkeypatch.setattr(dashboard, "RESULTS_DIR", str(tmp_path))
+        for name, score in (("model-a", 4), ("model-b", 2)):
+            (tmp_path / f"{name}.json").write_text(json.dumps({"runs": {
+                "C01": [_make_run(judge_scores={"j1": _make_judge(score), "j2": _make_judge(score - 1)})],
+                "R01": [_make_run(judge_scores={"j1": _make_judge(score)}, flags=["VERY_SHORT_RESPONSE"])],
+            }}))
+        loads = []
+        real_load = dashboard._load_result_file
+        monkeypatch.setattr(dashboard, "_load_result_file", lambda f: loads.append(f.stem) or real_load(f))
+        return tmp_path, loads
+
+    def _stats(self, prompts, **kw):
+        from scripts.dashboard import aggregate_stats, load_model_summaries
+        entries = load_model_summaries(prompts, **kw)
+        stats = aggregate_stats({n: e["summary"] for n, e in entries.items()}, prompts)
+        stats.pop("generated")
+        return stats
+
+    def test_matches_compute_stats(self, results, basic_prompts):
+        from scripts.dashboard import load_all_results
+        expected = compute_stats(load_all_results(), basic_prompts)
+        expected.pop("generated")
+        self._stats(basic_prompts)
+        # Second pass is served from the on-disk cache (JSON round trip)
+        assert self._stats(basic_prompts) == expected
+
+    def test_only_changed_model_reloaded(self, results, basic_prompts):
+        tmp_path, loads = results
+        self._stats(basic_prompts)
+        assert sorted(loads) == ["model-a", "model-b"]
+        loads.clear()
+        assert self._stats(basic_prompts)["leaderboard"]
+        assert loads == []
+
+        data = json.loads((tmp_path / "model-b.json").read_text())
+        data["runs"]["C01"].append(_make_run(judge_scores={"j1": _make_judge(5), "j2": _make_judge(5)}))
+        (tmp_path / "model-b.json").write_text(json.dumps(data))
+        stats = self._stats(basic_prompts)
+        assert loads == ["model-b"]
+        assert stats["judge_by_model"]["j1"]["model-b"] == 3.5
+
+    def test_inputs_change_invalidates(self, results, basic_prompts):
+        _, loads = results
+        self._stats(basic_prompts)
+        loads.clear()
+        self._stats(basic_prompts, composite_config={"judge_weight": 1.0, "deepeval_weight": 0.0})
+        assert sorted(loads) == ["model-a", "model-b"]
+        loads.clear()
+        self._stats(basic_prompts, composite_config={"judge_weight": 1.0, "deepeval_weight": 0.0},
+                    models_cfg={"model-a": {"company": "Acme"}})
+        assert loads == ["model-a"]
+
+    def test_removed_model_dropped(self, results, basic_prompts):
+        tmp_path, _ = results
+        self._stats(basic_prompts)
+        (tmp_path / "model-a.json").unlink()
+        assert [m["name"] for m in self._stats(basic_prompts)["leaderboard"]] == ["model-b"]
+
+    def test_journal_entries_picked_up(self, results, basic_prompts):
+        from scripts import journal
+        tmp_path, loads = results
+        self._stats(basic_prompts)
+        loads.clear()
+        journal.append_run(str(tmp_path / "model-a.json"), "C01",
+                           _make_run(judge_scores={"j1": _make_judge(1), "j2": _make_judge(1)}))
+        journal.append_run(str(tmp_path / "model-c.json"), "C01", _make_run(judge_scores={"j1": _make_judge(3)}))
+        stats = self._stats(basic_prompts)
+        assert sorted(loads) == ["model-a", "model-c"]
+        assert stats["judge_by_model"]["j1"]["model-a"] == 2.5
+        assert "model-c" in stats["judge_by_model"]["j1"]
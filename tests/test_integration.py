@@ -182,8 +182,8 @@ class TestDeepEvalModelSelection:
 class TestDashboardGeneration:
     """Dashboard generates valid HTML from result files."""
 
-    def test_generates_html(self, tmp_results_dir, tmp_path, monkeypatch):
-        import run
+    @staticmethod
+    def _setup(tmp_results_dir, tmp_path, monkeypatch):
         from scripts import dashboard
 
         # Patch dashboard module's paths too
@@ -235,9 +235,84 @@ class TestDashboardGeneration:
         }
         (tmp_results_dir / "test-model.json").write_text(json.dumps(model_data))
 
+        return dashboard, docs_dir, model_data
+
+    def test_generates_html(self, tmp_results_dir, tmp_path, monkeypatch):
+        dashboard, docs_dir, _ = self._setup(tmp_results_dir, tmp_path, monkeypatch)
+
+        # A shard from a build that still published per-prompt results
+        (docs_dir / "data").mkdir(parents=True, exist_ok=True)
+        (docs_dir / "data" / "prompt_results.0123456789.json").write_text("{}")
+        (docs_dir / "causal-data.0123456789.json").write_text("{}")
+
         result = dashboard.generate_dashboard()
         assert result is not None
         index_path = docs_dir / "index.html"
         assert index_path.exists()
         html_content = index_path.read_text()
         assert "<html" in html_content or "<!DOCTYPE" in html_content.upper() or "<table" in html_content
+
+        # data.json is the summary; judge tables are a shard it points to, and
+        # server-rendered sections (per-prompt results) aren't published at all
+        summary = json.loads((docs_dir / "data.json").read_text())
+        assert "leaderboard" in summary and "prompt_results" not in summary
+        assert list(summary["shards"]) == ["judges"]
+        assert not any(n.startswith("prompt_results") for n in os.listdir(docs_dir / "data"))
+        judges = json.loads((docs_dir / summary["shards"]["judges"]).read_text())
+        assert judges["judge_global"] == {"j1": 4.0}
+
+        # Pages fetch the content-hashed summary, and every page has a gzip twin
+        hashed = [n for n in os.listdir(docs_dir) if n.startswith("data.") and n.endswith(".json") and n != "data.json"]
+        assert len(hashed) == 1
+        assert f"fetch('./{hashed[0]}')" in (docs_dir / "judges.html").read_text()
+        # No page fetches causal data: plain name only, older hashed copies removed
+        assert (docs_dir / "causal-data.json").exists()
+        assert not any(n.startswith("causal-data.") and n.split(".")[1] != "json" for n in os.listdir(docs_dir))
+        assert (docs_dir / "index.html.gz").exists()
+
+    def test_regeneration_without_changes_touches_nothing(self, tmp_results_dir, tmp_path, monkeypatch):
+        dashboard, docs_dir, model_data = self._setup(tmp_results_dir, tmp_path, monkeypatch)
+        dashboard.generate_dashboard()
+        files = sorted(p for p in docs_dir.rglob("*") if p.is_file())
+        for p in files:
+            os.utime(p, (1, 1))
+
+        dashboard.generate_dashboard()
+        assert sorted(p for p in docs_dir.rglob("*") if p.is_file()) == files
+        assert all(p.stat().st_mtime == 1 for p in files)
+
+        # A changed score moves the timestamp and rewrites what depends on it
+        model_data["runs"]["T01"][0]["judge_scores"]["j1"]["score"] = 2
+        (tmp_results_dir / "test-model.json").write_text(json.dumps(model_data))
+        dashboard.generate_dashboard()
+        assert (docs_dir / "index.html").stat().st_mtime != 1
+        assert (docs_dir / "favicon.svg").stat().st_mtime == 1
+
+
+class TestDeepEvalVerdicts:
+    """Stored DeepEval verdicts are reused without loading deepeval."""
+
+    CONFIG = {"judges": [{"model": "j"}], "models": {"j": {"model": "api-j"}},
+              "deepeval": {"metrics": ["correctness", "coherence"]}}
+
+    def test_only_missing_metrics_measured(self, tmp_path, sample_prompt, monkeypatch):
+        import scripts.deepeval_scorer as de
+        from scripts.cache import ResponseCache
+        store = ResponseCache(str(tmp_path / "v.sqlite"))
+        measured, paced = [], []
+
+        def fake_measure(names, evaluator, pmeta, response):
+            measured.append(list(names))
+            return {n: 0.5 for n in names}
+
+        monkeypatch.setattr(de, "_measure", fake_measure)
+        first = de.score_with_deepeval(sample_prompt, "resp", self.CONFIG, verdicts=store, pace=paced.append)
+        second = de.score_with_deepeval(sample_prompt, "resp", self.CONFIG, verdicts=store, pace=paced.append)
+
+        assert first == second == {"deepeval_scores": {"correctness": 0.5, "coherence": 0.5}, "deepeval_avg": 0.5}
+        assert measured == [["correctness", "coherence"]]
+        assert paced == [2]
+
+        # A new response still costs a call
+        de.score_with_deepeval(sample_prompt, "new resp", self.CONFIG, verdicts=store)
+        assert len(measured) == 2
@@ -0,0 +1,70 @@
+"""Tests for scripts/journal.py - append-only run journal and compaction."""
+
+import json
+import os
+import pytest
+from scripts import journal
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    path = tmp_path / "model.json"
+    path.write_text(json.dumps({"model_name": "model", "runs": {"P01": [{"content": "old"}]}}))
+    return str(path)
+
+
+class TestJournal:
+    def test_journal_path(self):
+        assert journal.journal_path("results/gpt-4.1.json") == "results/gpt-4.1.jsonl"
+
+    def test_append_then_load_replays(self, snapshot):
+        journal.append_run(snapshot, "P01", {"content": "new"})
+        journal.append_run(snapshot, "P02", {"content": "first"})
+        data = journal.load(snapshot)
+        assert [r["content"] for r in data["runs"]["P01"]] == ["old", "new"]
+        assert data["runs"]["P02"] == [{"content": "first"}]
+        assert "updated" in data
+        # The snapshot itself is untouched until compaction
+        assert json.loads(open(snapshot).read())["runs"].keys() == {"P01"}
+
+    def test_append_returns_journal_size(self, snapshot):
+        size = journal.append_run(snapshot, "P01", {"content": "x"})
+        assert size == os.path.getsize(journal.journal_path(snapshot))
+
+    def test_compact_folds_and_removes_journal(self, snapshot):
+        journal.append_run(snapshot, "P01", {"content": "new"})
+        assert journal.compact(snapshot) is True
+        assert not os.path.exists(journal.journal_path(snapshot))
+        on_disk = json.loads(open(snapshot).read())
+        assert [r["content"] for r in on_disk["runs"]["P01"]] == ["old", "new"]
+        assert journal.compact(snapshot) is False
+
+    def test_write_snapshot_supersedes_journal(self, snapshot):
+        journal.append_run(snapshot, "P01", {"content": "new"})
+        data = journal.load(snapshot)
+        journal.write_snapshot(snapshot, data)
+        assert not os.path.exists(journal.journal_path(snapshot))
+        assert len(journal.load(snapshot)["runs"]["P01"]) == 2
+
+    def test_torn_line_skipped(self, snapshot):
+        journal.append_run(snapshot, "P01", {"content": "a"})
+        with open(journal.journal_path(snapshot), "a") as f:
+            f.write('{"op": "run", "pid": "P01", "ent')
+        journal.append_run(snapshot, "P01", {"content": "b"})
+        assert [r["content"] for r in journal.load(snapshot)["runs"]["P01"]] == ["old", "a", "b"]
+
+    def test_journal_without_snapshot(self, tmp_path):
+        path = str(tmp_path / "fresh.json")
+        assert journal.load(path, default={"runs": {}, "model_name": "fresh"}) == {"runs": {}, "model_name": "fresh"}
+        journal.append_run(path, "P01", {"content": "a"})
+        data = journal.load(path, default={"runs": {}, "model_name": "fresh"})
+        assert data["model_name"] == "fresh"
+        assert data["runs"]["P01"] == [{"content": "a"}]
+        journal.compact(path)
+        assert json.loads(open(path).read())["runs"]["P01"] == [{"content": "a"}]
+
+    def test_lock_is_reentrant(self, snapshot):
+        with journal.locked(snapshot):
+            journal.append_run(snapshot, "P01", {"content": "x"})
+            journal.compact(snapshot)
+        assert len(journal.load(snapshot)["runs"]["P01"]) == 2
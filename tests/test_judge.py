@@ -8,6 +8,7 @@ from scripts.judge import (
     judge_response,
     JUDGE_PROMPT,
 )
+from tests.conftest import MockProvider
 
 
 # ── _extract_json_object ──
@@ -155,3 +156,130 @@ class TestJudgeResponse:
         # Should not raise
         result = judge_response(provider, {}, meta, "Response", {"flags": []})
         assert result["judge_score"] is None
+
+
+class TestAsyncJudgeResponse:
+    def test_successful_scoring(self, mock_judge_provider, sample_prompt):
+        import asyncio
+        from scripts.judge import ajudge_response
+        result = asyncio.run(ajudge_response(mock_judge_provider, {}, sample_prompt, "resp", {"flags": []}))
+        assert result["judge_score"] == 4
+
+    def test_provider_error_returns_none(self, sample_prompt):
+        import asyncio
+        from scripts.judge import ajudge_response
+        from tests.conftest import MockProvider
+        result = asyncio.run(ajudge_response(MockProvider(error=RuntimeError("down")), {}, sample_prompt, "r", {}))
+        assert result["judge_score"] is None
+        assert "down" in result["judge_rationale"]
+
+
+class TestJudgeAll:
+    def _judges(self, *scores, delay=0.0):
+        import time
+
+        class Slow(MockProvider):
+            def complete(self, prompt, params):
+                time.sleep(delay)
+                return super().complete(prompt, params)
+
+        return {f"j{i}": {"provider": Slow(response=f'{{"score": {s}, "rationale": "r"}}'), "params": {}}
+                for i, s in enumerate(scores)}
+
+    def test_keeps_judge_order(self, sample_prompt):
+        from scripts.judge import judge_all
+        scores = judge_all(self._judges(3, 5, 4), sample_prompt, "resp", {"flags": []})
+        assert list(scores) == ["j0", "j1", "j2"]
+        assert [v["score"] for v in scores.values()] == [3, 5, 4]
+        assert all(v["judged_at"] for v in scores.values())
+
+    def test_parallel_matches_sequential(self, sample_prompt):
+        from scripts.judge import judge_all
+        judges = self._judges(2, 4)
+        par = judge_all(judges, sample_prompt, "resp", {})
+        seq = judge_all(judges, sample_prompt, "resp", {}, parallel=False)
+        assert {k: v["score"] for k, v in par.items()} == {k: v["score"] for k, v in seq.items()}
+
+    def test_latency_is_max_not_sum(self, sample_prompt):
+        import time
+        from scripts.judge import judge_all
+        t0 = time.time()
+        judge_all(self._judges(4, 4, 4, 4, delay=0.1), sample_prompt, "resp", {})
+        assert time.time() - t0 < 0.3
+
+    def test_failed_judge_does_not_block_others(self, sample_prompt):
+        from scripts.judge import judge_all
+        judges = self._judges(5)
+        judges["broken"] = {"provider": MockProvider(error=RuntimeError("down")), "params": {}}
+        scores = judge_all(judges, sample_prompt, "resp", {})
+        assert scores["j0"]["score"] == 5
+        assert scores["broken"]["score"] is None
+
+
+class TestJudgeVerdictCache:
+    @pytest.fixture
+    def store(self, tmp_path):
+        from scripts.cache import ResponseCache
+        return ResponseCache(str(tmp_path / "verdicts.sqlite"))
+
+    def _judge(self, store, provider, prompt_meta, response="resp", params=None, flags=None):
+        return judge_response(provider, params or {}, prompt_meta, response, {"flags": flags or []},
+                              verdicts=store, judge_model="judge-x")
+
+    def test_unchanged_pair_reuses_verdict(self, store, sample_prompt):
+        provider = MockProvider(response='{"score": 4, "rationale": "ok"}')
+        first = self._judge(store, provider, sample_prompt)
+        second = self._judge(store, provider, sample_prompt)
+        assert len(provider.calls) == 1
+        assert "cached" not in first
+        assert second == {"judge_score": 4, "judge_rationale": "ok", "cached": True}
+
+    @pytest.mark.parametrize("change", [
+        {"response": "other response"},
+        {"params": {"temperature": 0.5}},
+        {"flags": ["VERY_SHORT_RESPONSE"]},
+    ])
+    def test_changed_inputs_miss(self, store, sample_prompt, change):
+        provider = MockProvider(response='{"score": 4, "rationale": "ok"}')
+        self._judge(store, provider, sample_prompt)
+        self._judge(store, provider, sample_prompt, **change)
+        assert len(provider.calls) == 2
+
+    def test_prompt_metadata_change_misses(self, store, sample_prompt):
+        provider = MockProvider(response='{"score": 4, "rationale": "ok"}')
+        self._judge(store, provider, sample_prompt)
+        self._judge(store, provider, {**sample_prompt, "ideal": "A better ideal answer."})
+        assert len(provider.calls) == 2
+
+    def test_rubric_change_misses(self, store, sample_prompt, monkeypatch):
+        import scripts.judge
+        provider = MockProvider(response='{"score": 4, "rationale": "ok"}')
+        self._judge(store, provider, sample_prompt)
+        monkeypatch.setattr(scripts.judge, "JUDGE_PROMPT_VERSION", "bumped")
+        self._judge(store, provider, sample_prompt)
+        assert len(provider.calls) == 2
+
+    def test_failures_not_stored(self, store, sample_prompt):
+        self._judge(store, MockProvider(response="garbage"), sample_prompt)
+        self._judge(store, MockProvider(error=RuntimeError("down")), sample_prompt)
+        assert len(store) == 0
+
+    def test_judge_all_marks_cached(self, store, sample_prompt):
+        from scripts.judge import judge_all
+        provider = MockProvider(response='{"score": 5, "rationale": "r"}')
+        judges = {"j": {"provider": provider, "params": {}, "model": "api-j"}}
+        judge_all(judges, sample_prompt, "resp", {}, verdicts=store)
+        scores = judge_all(judges, sample_prompt, "resp", {}, verdicts=store)
+        assert scores["j"]["score"] == 5
+        assert scores["j"]["cached"] is True
+        assert len(provider.calls) == 1
+
+
+class TestAggregateJudgeScores:
+    def test_ignores_failed(self):
+        from scripts.judge import aggregate_judge_scores
+        assert aggregate_judge_scores({"a": {"score": 4}, "b": {"score": None}, "c": {"score": 5}}) == (4.5, 2)
+
+    def test_empty(self):
+        from scripts.judge import aggregate_judge_scores
+        assert aggregate_judge_scores({}) == (None, 0)
@@ -0,0 +1,78 @@
+"""Tests for scripts/loadtest.py - stepped concurrency, percentiles, early stop."""
+
+import threading
+import time
+
+import pytest
+
+from scripts.loadtest import run_curve, run_level
+from tests.conftest import MockProvider
+
+
+PROMPTS = [{"id": f"P{i}", "prompt": f"prompt {i}"} for i in range(3)]
+
+
+class CountingProvider(MockProvider):
+    """Sleeps per call and records the most calls seen in flight at once."""
+
+    def __init__(self, delay=0.01, fail_above=None, **kw):
+        super().__init__(**kw)
+        self.delay = delay
+        self.fail_above = fail_above
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def complete(self, prompt, params):
+        with self.lock:
+            self.calls.append(prompt)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            overloaded = self.fail_above is not None and self.in_flight > self.fail_above
+        try:
+            time.sleep(self.delay)
+            if overloaded:
+                raise RuntimeError("429 Too Many Requests")
+            return self.response, self.usage
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class TestRunLevel:
+    def test_cycles_prompts_and_holds_concurrency(self):
+        provider = CountingProvider(usage={"input_tokens": 1, "output_tokens": 10})
+        level = run_level(provider, PROMPTS, {}, concurrency=4, requests=10)
+        assert level["requests"] == 10 and level["errors"] == 0
+        assert sorted(provider.calls) == sorted(["prompt 0", "prompt 1", "prompt 2"] * 3 + ["prompt 0"])
+        assert provider.max_in_flight == 4
+        assert level["latency_p50"] <= level["latency_p95"] <= level["latency_p99"]
+        assert level["tokens_per_s"] == pytest.approx(100 / level["wall_s"], rel=0.05)
+        assert "ttft_p50" not in level
+
+    def test_errors_counted(self):
+        level = run_level(MockProvider(error=RuntimeError("boom")), PROMPTS, {}, concurrency=2, requests=4)
+        assert (level["errors"], level["error_rate"]) == (4, 1.0)
+        assert level["latency_p50"] is None
+        assert level["sample_error"] == "boom"
+
+    def test_streamed_ttft_percentiles(self):
+        provider = MockProvider(usage={"output_tokens": 5, "ttft_s": 0.2})
+        assert run_level(provider, PROMPTS, {}, concurrency=1, requests=3)["ttft_p95"] == 0.2
+
+
+class TestRunCurve:
+    def test_levels_in_order(self):
+        curve = run_curve(CountingProvider(delay=0), PROMPTS, {}, levels=[1, 2], requests_per_level=4)
+        assert [lvl["concurrency"] for lvl in curve["levels"]] == [1, 2]
+        assert "stopped_early" not in curve
+
+    def test_stops_once_saturated(self):
+        provider = CountingProvider(delay=0.02, fail_above=1)
+        curve = run_curve(provider, PROMPTS, {}, levels=[1, 8, 16], requests_per_level=8)
+        assert [lvl["concurrency"] for lvl in curve["levels"]] == [1, 8]
+        assert curve["stopped_early"] is True
+
+    def test_level_sends_at_least_its_concurrency(self):
+        curve = run_curve(CountingProvider(delay=0), PROMPTS, {}, levels=[6], requests_per_level=2)
+        assert curve["levels"][0]["requests"] == 6
@@ -0,0 +1,72 @@
+"""Tests for scripts/pipeline.py - staged worker pipeline."""
+
+import threading
+import time
+import pytest
+from scripts.pipeline import Pipeline, Stage, StageError
+
+
+class TestPipeline:
+    def test_applies_stages_in_order(self):
+        stages = [Stage("double", lambda x: x * 2), Stage("inc", lambda x: x + 1)]
+        results = dict(Pipeline(stages).run(range(5)))
+        assert results == {i: i * 2 + 1 for i in range(5)}
+
+    def test_empty_input(self):
+        assert list(Pipeline([Stage("noop", lambda x: x)]).run([])) == []
+
+    def test_stages_overlap(self):
+        """Total time tracks the slowest stage, not the sum of stages."""
+        def slow(x):
+            time.sleep(0.05)
+            return x
+
+        stages = [Stage("a", slow), Stage("b", slow), Stage("c", slow)]
+        t0 = time.time()
+        assert len(list(Pipeline(stages).run(range(6)))) == 6
+        # Serial would be 6 * 3 * 0.05 = 0.9s; pipelined ~ (6 + 2) * 0.05 = 0.4s
+        assert time.time() - t0 < 0.7
+
+    def test_stage_workers_run_concurrently(self):
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def track(x):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return x
+
+        list(Pipeline([Stage("t", track, workers=4)]).run(range(12)))
+        assert peak[0] > 1
+
+    def test_bounded_queue_limits_run_ahead(self):
+        generated = []
+        gate = threading.Event()
+
+        def gen(x):
+            generated.append(x)
+            return x
+
+        def blocked(x):
+            gate.wait(1)
+            return x
+
+        pipe = Pipeline([Stage("gen", gen), Stage("slow", blocked)], maxsize=2)
+        it = pipe.run(range(50))
+        threading.Timer(0.1, gate.set).start()
+        time.sleep(0.05)
+        # gen can only get a couple of queues' worth ahead of the stalled stage
+        assert len(generated) < 10
+        assert len(list(it)) == 50
+
+    def test_stage_error_raised_to_caller(self):
+        def boom(x):
+            if x == 3:
+                raise ValueError("bad item")
+            return x
+
+        with pytest.raises(StageError, match="bad item"):
+            list(Pipeline([Stage("boom", boom)]).run(range(5)))
@@ -159,3 +159,314 @@ class TestGetProvider:
         cfg = {"provider": "openai", "model": "gpt-test", "api_key_env": "none"}
         p = get_provider(cfg)
         assert isinstance(p, OpenAIProvider)
+
+
+# ── Async providers ──
+
+def _mock_async_client(monkeypatch, handler):
+    """Route every AsyncClient the providers build through a MockTransport."""
+    import functools
+    import httpx
+    monkeypatch.setattr(
+        httpx, "AsyncClient",
+        functools.partial(httpx.AsyncClient, transport=httpx.MockTransport(handler)),
+    )
+
+
+class TestAsyncComplete:
+    def test_openai_acomplete(self, monkeypatch):
+        import asyncio
+        import httpx
+        seen = {}
+
+        def handler(request):
+            seen["url"] = str(request.url)
+            seen["auth"] = request.headers["Authorization"]
+            return httpx.Response(200, json={
+                "choices": [{"message": {"content": "hi"}}],
+                "usage": {"prompt_tokens": 3, "completion_tokens": 1},
+            })
+
+        _mock_async_client(monkeypatch, handler)
+        p = OpenAIProvider("gpt-test", "secret", "http://local/v1")
+        content, usage = asyncio.run(p.acomplete("hello", {"temperature": 0}))
+        assert content == "hi"
+        assert usage == {"input_tokens": 3, "output_tokens": 1}
+        assert seen["url"] == "http://local/v1/chat/completions"
+        assert seen["auth"] == "Bearer secret"
+
+    def test_anthropic_acomplete(self, monkeypatch):
+        import asyncio
+        import httpx
+
+        def handler(request):
+            assert request.headers["x-api-key"] == "k"
+            return httpx.Response(200, json={
+                "content": [{"type": "text", "text": "yo"}],
+                "usage": {"input_tokens": 5, "output_tokens": 2},
+            })
+
+        _mock_async_client(monkeypatch, handler)
+        p = AnthropicProvider("claude-test", "k")
+        assert asyncio.run(p.acomplete("hello", {}))[0] == "yo"
+
+    def test_acomplete_raises_on_http_error(self, monkeypatch):
+        import asyncio
+        import httpx
+        _mock_async_client(monkeypatch, lambda request: httpx.Response(500, json={}))
+        p = CohereProvider("command", "k")
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(p.acomplete("hello", {}))
+
+    def test_many_concurrent_calls_share_one_loop(self, monkeypatch):
+        import asyncio
+        import httpx
+        _mock_async_client(monkeypatch, lambda request: httpx.Response(200, json={
+            "choices": [{"message": {"content": "ok"}}], "usage": {},
+        }))
+        p = OllamaProvider("llama3")
+
+        async def main():
+            return await asyncio.gather(*(p.acomplete(f"q{i}", {}) for i in range(50)))
+
+        results = asyncio.run(main())
+        assert len(results) == 50
+        assert all(c == "ok" for c, _ in results)
+
+    def test_base_class_offloads_sync_complete(self):
+        import asyncio
+        from tests.conftest import MockProvider
+        p = MockProvider(response="threaded")
+        assert asyncio.run(p.acomplete("x", {}))[0] == "threaded"
+        assert len(p.calls) == 1
+
+
+# ── Multiple samples ──
+
+def _openai_with(handler, **kw):
+    import httpx
+    p = OpenAIProvider("gpt-test", "secret", "http://local/v1", **kw)
+    p.client = httpx.Client(base_url="http://local/v1", transport=httpx.MockTransport(handler))
+    return p
+
+
+class TestCompleteN:
+    def test_openai_asks_for_all_samples_in_one_request(self):
+        import json
+        import httpx
+        bodies = []
+
+        def handler(request):
+            bodies.append(json.loads(request.content))
+            return httpx.Response(200, json={
+                "choices": [{"message": {"content": f"s{i}"}} for i in range(3)],
+                "usage": {"prompt_tokens": 7, "completion_tokens": 10},
+            })
+
+        samples = _openai_with(handler).complete_n("q", {"temperature": 1}, 3)
+        assert [c for c, _ in samples] == ["s0", "s1", "s2"]
+        assert [u["output_tokens"] for _, u in samples] == [4, 3, 3]
+        assert all(u["input_tokens"] == 7 for _, u in samples)
+        assert len(bodies) == 1 and bodies[0]["n"] == 3
+
+    def test_host_ignoring_n_is_asked_again(self):
+        import httpx
+        calls = []
+
+        def handler(request):
+            calls.append(1)
+            return httpx.Response(200, json={"choices": [{"message": {"content": "one"}}], "usage": {}})
+
+        samples = _openai_with(handler).complete_n("q", {}, 3)
+        assert len(samples) == 3 and len(calls) == 3
+        assert samples[0][1] == {"input_tokens": None, "output_tokens": None}
+
+    def test_native_n_off_fans_out_without_n(self):
+        import json
+        import httpx
+        bodies = []
+
+        def handler(request):
+            bodies.append(json.loads(request.content))
+            return httpx.Response(200, json={"choices": [{"message": {"content": "x"}}], "usage": {}})
+
+        p = _openai_with(handler, native_n=False)
+        assert len(p.complete_n("q", {}, 2)) == 2
+        assert len(bodies) == 2 and all("n" not in b for b in bodies)
+
+    def test_base_class_fans_out(self):
+        from tests.conftest import MockProvider
+        p = MockProvider(response="r")
+        assert p.complete_n("q", {}, 4) == [("r", p.usage)] * 4
+        assert len(p.calls) == 4
+        assert not p.native_n
+
+    def test_get_provider_native_n_flag(self):
+        cfg = {"provider": "openai_compatible", "model": "m", "api_key_env": "none",
+               "base_url": "http://x/v1", "native_n": False}
+        assert get_provider(cfg).native_n is False
+
+
+# ── Shared HTTP clients ──
+
+@pytest.fixture
+def fresh_clients():
+    from scripts import providers
+    providers.close_clients()
+    yield providers
+    providers.configure_http(None)
+    providers.close_clients()
+
+
+class TestSharedClients:
+    HF = {"provider": "openai_compatible", "base_url": "https://router.example/v1", "api_key_env": "HF_TOKEN"}
+
+    def test_same_endpoint_and_key_share_one_client(self, fresh_clients, monkeypatch):
+        monkeypatch.setenv("HF_TOKEN", "hf_a")
+        a = get_provider({**self.HF, "model": "llama"})
+        b = get_provider({**self.HF, "model": "qwen"})
+        assert a.client is b.client
+
+    def test_different_credentials_get_separate_clients(self, fresh_clients, monkeypatch):
+        monkeypatch.setenv("HF_TOKEN", "hf_a")
+        monkeypatch.setenv("OTHER_TOKEN", "hf_b")
+        a = get_provider({**self.HF, "model": "llama"})
+        b = get_provider({**self.HF, "model": "llama", "api_key_env": "OTHER_TOKEN"})
+        c = get_provider({**self.HF, "model": "llama", "base_url": "https://other.example/v1"})
+        assert len({id(a.client), id(b.client), id(c.client)}) == 3
+
+    def test_pool_limits_from_config(self, fresh_clients):
+        fresh_clients.configure_http({"max_connections": 7, "http2": False})
+        before = OllamaProvider("m").client
+        pool = before._transport._pool
+        assert pool._max_connections == 7
+        assert pool._http2 is False
+        fresh_clients.configure_http(None)
+        assert OllamaProvider("m").client is not before
+
+    def test_http2_only_when_h2_installed(self, fresh_clients, monkeypatch):
+        monkeypatch.setattr(fresh_clients, "h2", None)
+        assert fresh_clients._client_kwargs()["http2"] is False
+        monkeypatch.setattr(fresh_clients, "h2", object())
+        assert fresh_clients._client_kwargs()["http2"] is True
+
+    def test_async_client_shared_within_a_loop(self, fresh_clients):
+        import asyncio
+        a, b = OllamaProvider("m1"), OllamaProvider("m2")
+
+        async def main():
+            return a._async_client(), b._async_client()
+
+        first, second = asyncio.run(main())
+        assert first is second
+
+
+# ── Streaming ──
+
+def _sse(*events, done=False):
+    import json
+    body = "".join(f"data: {json.dumps(e)}\n\n" for e in events)
+    return body + ("data: [DONE]\n\n" if done else "")
+
+
+def _streaming(provider, body, seen=None):
+    import json
+    import httpx
+
+    def handler(request):
+        if seen is not None:
+            seen.append(json.loads(request.content))
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    provider.client = httpx.Client(base_url="http://local", transport=httpx.MockTransport(handler))
+    provider.stream = True
+    return provider
+
+
+class TestStreamTiming:
+    def test_fields(self):
+        from scripts.providers import stream_timing
+        timing = stream_timing(10.0, [10.5, 10.6, 10.7, 10.9], output_tokens=9)
+        assert timing == {"ttft_s": 0.5, "itl_s": pytest.approx(0.1333, abs=1e-4), "tokens_per_s": 20.0}
+
+    def test_single_delta_has_no_rate(self):
+        from scripts.providers import stream_timing
+        assert stream_timing(0.0, [0.3]) == {"ttft_s": 0.3}
+        assert stream_timing(0.0, []) == {}
+
+
+class TestStreamingProviders:
+    def test_openai(self):
+        seen = []
+        body = _sse({"choices": [{"delta": {"role": "assistant"}}]},
+                    {"choices": [{"delta": {"content": "Hel"}}]},
+                    {"choices": [{"delta": {"content": "lo"}}]},
+                    {"choices": [], "usage": {"prompt_tokens": 4, "completion_tokens": 2}}, done=True)
+        p = _streaming(OpenAIProvider("gpt-test", "k", "http://local/v1"), body, seen)
+        content, usage = p.complete("hi", {"temperature": 0})
+        assert content == "Hello"
+        assert (usage["input_tokens"], usage["output_tokens"]) == (4, 2)
+        assert usage["ttft_s"] >= 0 and "tokens_per_s" in usage
+        assert seen[0]["stream"] is True and seen[0]["stream_options"] == {"include_usage": True}
+
+    def test_anthropic(self):
+        body = _sse({"type": "message_start", "message": {"usage": {"input_tokens": 6}}},
+                    {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Yo"}},
+                    {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "!"}},
+                    {"type": "message_delta", "usage": {"output_tokens": 2}},
+                    {"type": "message_stop"})
+        content, usage = _streaming(AnthropicProvider("claude-test", "k"), body).complete("hi", {})
+        assert content == "Yo!"
+        assert (usage["input_tokens"], usage["output_tokens"]) == (6, 2)
+        assert "ttft_s" in usage
+
+    def test_anthropic_error_event_raises(self):
+        body = _sse({"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}})
+        with pytest.raises(ValueError, match="Overloaded"):
+            _streaming(AnthropicProvider("claude-test", "k"), body).complete("hi", {})
+
+    def test_ollama_falls_back_to_reasoning(self):
+        body = _sse({"choices": [{"delta": {"reasoning": "thinking"}}]},
+                    {"choices": [{"delta": {"content": ""}}]}, done=True)
+        content, usage = _streaming(OllamaProvider("glm"), body).complete("hi", {})
+        assert content == "thinking"
+        assert "ttft_s" in usage
+
+    def test_cohere(self):
+        seen = []
+        body = _sse({"type": "message-start"},
+                    {"type": "content-delta", "delta": {"message": {"content": {"text": "Bon"}}}},
+                    {"type": "content-delta", "delta": {"message": {"content": {"text": "jour"}}}},
+                    {"type": "message-end", "delta": {"usage": {"tokens": {"input_tokens": 3, "output_tokens": 2}}}})
+        content, usage = _streaming(CohereProvider("command", "k"), body, seen).complete("hi", {})
+        assert content == "Bonjour"
+        assert (usage["input_tokens"], usage["output_tokens"]) == (3, 2)
+        assert seen[0]["stream"] is True
+
+    def test_async_stream(self, monkeypatch):
+        import asyncio
+        import httpx
+        body = _sse({"choices": [{"delta": {"content": "a"}}]}, {"choices": [{"delta": {"content": "b"}}]}, done=True)
+        _mock_async_client(monkeypatch, lambda request: httpx.Response(200, text=body))
+        p = OllamaProvider("m", "http://async-stream/v1")
+        p.stream = True
+        content, usage = asyncio.run(p.acomplete("hi", {}))
+        assert content == "ab" and "ttft_s" in usage
+
+    def test_streaming_provider_must_parse_events(self):
+        from scripts.providers import StreamingHTTPProvider
+
+        class NoEvents(StreamingHTTPProvider):
+            def _request(self, prompt, params):
+                return "/", {"json": {}}
+
+            def _parse(self, data):
+                return "", {}
+
+        with pytest.raises(TypeError, match="_parse_event"):
+            NoEvents()
+
+    def test_get_provider_stream_flag(self):
+        assert get_provider({"provider": "ollama", "model": "m", "stream": True}).stream is True
+        google = get_provider({"provider": "google", "model": "g", "api_key_env": "none", "stream": True})
+        assert google.stream is False
@@ -0,0 +1,128 @@
+"""Tests for scripts/ratelimit.py - token buckets, endpoint keys, shared limiters."""
+
+import asyncio
+import pytest
+from scripts.ratelimit import (
+    TokenBucket,
+    RateLimiter,
+    RateLimitedProvider,
+    endpoint_key,
+    estimate_tokens,
+    get_rate_limiter,
+)
+from tests.conftest import MockProvider
+
+
+HF_A = {"provider": "openai_compatible", "model": "a", "api_key_env": "HF_TOKEN",
+        "base_url": "https://router.huggingface.co/v1"}
+HF_B = {**HF_A, "model": "b"}
+ANTHROPIC = {"provider": "anthropic", "model": "claude", "api_key_env": "ANTHROPIC_API_KEY"}
+
+
+class TestTokenBucket:
+    def test_first_reservation_is_free(self):
+        bucket = TokenBucket(rate_per_s=1, capacity=1)
+        assert bucket.reserve(1) == 0
+
+    def test_queued_reservations_wait_in_turn(self):
+        bucket = TokenBucket(rate_per_s=2, capacity=1)
+        bucket.reserve(1)
+        assert bucket.reserve(1) == pytest.approx(0.5, abs=0.05)
+        assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+
+    def test_oversize_request_capped_at_capacity(self):
+        bucket = TokenBucket(rate_per_s=10, capacity=10)
+        assert bucket.reserve(1000) == 0
+
+    def test_credit_refunds(self):
+        bucket = TokenBucket(rate_per_s=1, capacity=10)
+        bucket.reserve(10)
+        bucket.credit(10)
+        assert bucket.reserve(10) == 0
+
+
+class TestRateLimiter:
+    def test_tokens_gate_independently(self):
+        limiter = RateLimiter(tokens_per_minute=600)  # 10 tok/s
+        assert limiter.reserve(tokens=600) == 0
+        assert limiter.reserve(tokens=100) == pytest.approx(10, abs=0.1)
+
+    def test_settle_refunds_overestimate(self):
+        limiter = RateLimiter(tokens_per_minute=600)
+        limiter.reserve(tokens=600)
+        limiter.settle(600, 0)
+        assert limiter.reserve(tokens=600) == 0
+
+
+class TestEndpointKey:
+    def test_same_router_same_key(self):
+        assert endpoint_key(HF_A) == endpoint_key(HF_B)
+
+    def test_default_base_url(self):
+        assert endpoint_key(ANTHROPIC).startswith("https://api.anthropic.com")
+
+    def test_different_keys_differ(self):
+        assert endpoint_key(HF_A) != endpoint_key(ANTHROPIC)
+
+
+class TestGetRateLimiter:
+    def test_shared_across_models_on_one_endpoint(self):
+        config = {"rate_limits": {"HF_TOKEN": {"requests_per_minute": 300}}}
+        assert get_rate_limiter(HF_A, config) is get_rate_limiter(HF_B, config)
+
+    def test_lookup_by_base_url(self):
+        config = {"rate_limits": {"https://router.huggingface.co/v1": {"tokens_per_minute": 9000}}}
+        assert get_rate_limiter(HF_A, config).tokens_per_minute == 9000
+
+    def test_falls_back_to_delay(self):
+        limiter = get_rate_limiter(ANTHROPIC, {"eval": {"delay_between_calls": 2}})
+        assert limiter.requests_per_minute == 30
+
+    def test_no_limit_when_delay_zero(self):
+        assert get_rate_limiter(ANTHROPIC, {"eval": {"delay_between_calls": 0}}) is None
+
+
+class TestRateLimitedProvider:
+    def test_passes_through_and_settles(self):
+        inner = MockProvider(response="ok", usage={"input_tokens": 5, "output_tokens": 5})
+        limiter = RateLimiter(tokens_per_minute=6000)
+        p = RateLimitedProvider(inner, limiter)
+        assert p.complete("hello", {"max_tokens": 1000}) == ("ok", {"input_tokens": 5, "output_tokens": 5})
+        # Only the 10 real tokens stay charged
+        assert limiter.tokens.level == pytest.approx(5990, abs=5)
+
+    def test_async_path(self):
+        p = RateLimitedProvider(MockProvider(response="async ok"), RateLimiter(requests_per_minute=600))
+        assert asyncio.run(p.acomplete("x", {}))[0] == "async ok"
+
+    def test_delegates_attributes(self):
+        inner = MockProvider()
+        p = RateLimitedProvider(inner, RateLimiter(requests_per_minute=60))
+        assert p.calls is inner.calls
+
+    def test_native_samples_book_one_request(self):
+        class NativeN(MockProvider):
+            native_n = True
+
+            def complete_n(self, prompt, params, n):
+                self.calls.append({"prompt": prompt, "n": n})
+                return [("s", {"input_tokens": 5, "output_tokens": 5})] * n
+
+        inner = NativeN()
+        limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=6000, burst=5)
+        p = RateLimitedProvider(inner, limiter)
+        assert len(p.complete_n("hello", {"max_tokens": 100}, 3)) == 3
+        assert inner.calls == [{"prompt": "hello", "n": 3}]
+        assert limiter.requests.level == pytest.approx(4, abs=0.1)
+        # Prompt charged once plus three outputs
+        assert limiter.tokens.level == pytest.approx(5980, abs=5)
+
+    def test_non_native_samples_book_each_request(self):
+        inner = MockProvider()
+        limiter = RateLimiter(requests_per_minute=60, burst=5)
+        RateLimitedProvider(inner, limiter).complete_n("hello", {}, 3)
+        assert len(inner.calls) == 3
+        assert limiter.requests.level == pytest.approx(2, abs=0.1)
+
+    def test_estimate_includes_output_cap(self):
+        assert estimate_tokens("x" * 400, {"max_tokens": 50}) == 150
@@ -0,0 +1,122 @@
+"""Tests for scripts/retry.py - retry classification, Retry-After, throttle feedback."""
+
+import asyncio
+import httpx
+import pytest
+from scripts import retry
+from scripts.ratelimit import RateLimiter
+from scripts.retry import RetryingProvider, RetryPolicy, classify, parse_retry_after
+from tests.conftest import MockProvider
+
+
+def _status_error(status, headers=None):
+    request = httpx.Request("POST", "https://api.example.com/v1/chat/completions")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return httpx.HTTPStatusError(f"{status}", request=request, response=response)
+
+
+class FlakyProvider(MockProvider):
+    """Raises the queued errors first, then succeeds."""
+
+    def __init__(self, errors):
+        super().__init__(response="ok")
+        self.errors = list(errors)
+
+    def complete(self, prompt, params):
+        self.calls.append({"prompt": prompt, "params": params})
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.response, self.usage
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(retry.time, "sleep", recorded.append)
+    return recorded
+
+
+class TestParseRetryAfter:
+    def test_seconds(self):
+        assert parse_retry_after({"retry-after": "7"}) == 7
+
+    def test_milliseconds_preferred(self):
+        assert parse_retry_after({"retry-after-ms": "250", "retry-after": "1"}) == 0.25
+
+    def test_http_date_in_past(self):
+        assert parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0
+
+    def test_missing(self):
+        assert parse_retry_after({}) is None
+
+
+class TestClassify:
+    def test_429_is_throttle(self):
+        assert classify(_status_error(429, {"retry-after": "3"})) == (True, True, 3)
+
+    def test_503_retryable_not_throttle(self):
+        assert classify(_status_error(503))[:2] == (True, False)
+
+    def test_400_not_retryable(self):
+        assert classify(_status_error(400))[0] is False
+
+    def test_transport_error(self):
+        assert classify(httpx.ConnectTimeout("slow"))[0] is True
+
+    def test_aws_throttling(self):
+        err = Exception("boom")
+        err.response = {"Error": {"Code": "ThrottlingException"}}
+        assert classify(err)[:2] == (True, True)
+
+    def test_plain_error(self):
+        assert classify(ValueError("bad json"))[0] is False
+
+
+class TestRetryingProvider:
+    def test_recovers_after_transient_errors(self, sleeps):
+        inner = FlakyProvider([_status_error(502), httpx.ReadTimeout("t")])
+        p = RetryingProvider(inner, RetryPolicy(max_attempts=5, base_delay=1))
+        assert p.complete("x", {})[0] == "ok"
+        assert len(inner.calls) == 3
+        assert len(sleeps) == 2
+        assert sleeps[1] <= 2
+
+    def test_honours_retry_after(self, sleeps):
+        inner = FlakyProvider([_status_error(429, {"retry-after": "12"})])
+        RetryingProvider(inner, RetryPolicy()).complete("x", {})
+        assert sleeps == [12]
+
+    def test_retry_after_capped_at_max_delay(self, sleeps):
+        inner = FlakyProvider([_status_error(429, {"retry-after": "3600"})])
+        RetryingProvider(inner, RetryPolicy(max_delay=30)).complete("x", {})
+        assert sleeps == [30]
+
+    def test_gives_up_after_max_attempts(self, sleeps):
+        inner = FlakyProvider([_status_error(500)] * 5)
+        with pytest.raises(httpx.HTTPStatusError):
+            RetryingProvider(inner, RetryPolicy(max_attempts=3)).complete("x", {})
+        assert len(inner.calls) == 3
+
+    def test_non_retryable_raises_immediately(self, sleeps):
+        inner = FlakyProvider([_status_error(401)])
+        with pytest.raises(httpx.HTTPStatusError):
+            RetryingProvider(inner).complete("x", {})
+        assert sleeps == []
+
+    def test_throttle_slows_limiter_and_success_recovers(self, sleeps):
+        limiter = RateLimiter(requests_per_minute=600)
+        inner = FlakyProvider([_status_error(429, {"retry-after": "0"})])
+        p = RetryingProvider(inner, RetryPolicy(), limiter)
+        p.complete("x", {})
+        assert limiter.current_rpm == pytest.approx(330)  # halved to 300, then +5% of 600
+        for _ in range(20):
+            p.complete("x", {})
+        assert limiter.current_rpm == pytest.approx(600)
+
+    def test_async_path(self, monkeypatch):
+        async def no_sleep(_):
+            return None
+        monkeypatch.setattr(retry.asyncio, "sleep", no_sleep)
+        inner = FlakyProvider([_status_error(503)])
+        assert asyncio.run(RetryingProvider(inner).acomplete("x", {}))[0] == "ok"
+        assert len(inner.calls) == 2
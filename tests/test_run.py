@@ -491,3 +491,641 @@ class TestCmdCompareConfig:
         )
         # Should not raise - previously it called load_config() with no args
         run.cmd_compare(args)
+
+
+# ── cmd_eval concurrency ──
+
+class SlowProvider:
+    """Provider whose latency varies by prompt so completions arrive out of order."""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.lock = __import__("threading").Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def complete(self, prompt, params):
+        import time
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delays.get(prompt, 0))
+        with self.lock:
+            self.in_flight -= 1
+        return f"answer to {prompt}", {"input_tokens": 1, "output_tokens": 2}
+
+
+@pytest.fixture
+def eval_env(tmp_path, tmp_results_dir, monkeypatch):
+    """Config + eval file on disk for driving cmd_eval end to end."""
+    import run
+    prompts = [
+        {"id": f"P{i:02d}", "category": "reasoning", "subcategory": "s", "difficulty": "easy",
+         "prompt": f"prompt {i}", "ideal": "i", "criteria": [], "check_type": "reasoning"}
+        for i in range(1, 7)
+    ]
+    eval_file = tmp_path / "eval.json"
+    eval_file.write_text(json.dumps({"prompts": prompts}))
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        "models:\n"
+        "  test-model: {provider: openai, model: gpt-test, api_key_env: none}\n"
+        "judges: []\n"
+        f"eval: {{eval_file: '{eval_file}', delay_between_calls: 0}}\n"
+    )
+    monkeypatch.setattr(run, "generate_dashboard", lambda *a, **k: None)
+    return str(config_file)
+
+
+def _eval_args(config, **kw):
+    defaults = dict(config=config, model="test-model", ids=None, category=None,
+                    difficulty=None, benchmark=None, rerun=False, concurrency=None)
+    defaults.update(kw)
+    return argparse.Namespace(**defaults)
+
+
+class TestCmdEvalConcurrency:
+    def test_results_saved_in_prompt_order(self, eval_env, monkeypatch):
+        import run
+        # Early prompts are slowest, so they finish last
+        provider = SlowProvider({"prompt 1": 0.15, "prompt 2": 0.1, "prompt 3": 0.05})
+        monkeypatch.setattr(run, "get_provider", lambda cfg: provider)
+
+        run.cmd_eval(_eval_args(eval_env, concurrency=4))
+
+        data = run.load_model_results("test-model")
+        assert list(data["runs"]) == [f"P{i:02d}" for i in range(1, 7)]
+        assert data["runs"]["P01"][-1]["content"] == "answer to prompt 1"
+        assert provider.max_in_flight > 1
+
+    def test_default_is_sequential(self, eval_env, monkeypatch):
+        import run
+        provider = SlowProvider({})
+        monkeypatch.setattr(run, "get_provider", lambda cfg: provider)
+
+        run.cmd_eval(_eval_args(eval_env))
+
+        assert provider.max_in_flight == 1
+        assert len(run.load_model_results("test-model")["runs"]) == 6
+
+    def test_errors_recorded_per_prompt(self, eval_env, monkeypatch):
+        import run
+        from tests.conftest import MockProvider
+        monkeypatch.setattr(run, "get_provider", lambda cfg: MockProvider(error=RuntimeError("boom")))
+
+        run.cmd_eval(_eval_args(eval_env, concurrency=3))
+
+        data = run.load_model_results("test-model")
+        assert all(r[-1]["auto_checks"]["flags"] == ["API_ERROR"] for r in data["runs"].values())
+
+
+class TestCmdEvalFailures:
+    def test_check_crash_recorded_and_run_continues(self, eval_env, monkeypatch):
+        import run
+        real_check = run.check_response
+
+        def check(pmeta, content):
+            if pmeta["id"] == "P02":
+                raise KeyError("boom")
+            return real_check(pmeta, content)
+
+        monkeypatch.setattr(run, "get_provider", lambda cfg: SlowProvider({}))
+        monkeypatch.setattr(run, "check_response", check)
+
+        run.cmd_eval(_eval_args(eval_env, ids=["P01", "P02", "P03"]))
+
+        data = run.load_model_results("test-model")
+        assert list(data["runs"]) == ["P01", "P02", "P03"]
+        failed = data["runs"]["P02"][-1]
+        assert failed["auto_checks"]["flags"] == ["API_ERROR"] and "auto-check failed" in failed["error"]
+        assert not data["runs"]["P03"][-1].get("error")
+
+    def test_interrupt_keeps_only_contiguous_prefix(self, eval_env, monkeypatch):
+        import run
+
+        class Interrupted:
+            """Finishes prompts 1 and 3, then Ctrl-C while prompt 2 is still running."""
+            def __init__(self, stages):
+                self.stages = stages
+
+            def run(self, jobs):
+                done = []
+                for job in jobs:
+                    for stage in self.stages:
+                        job = stage.fn(job)
+                    done.append(job)
+                yield 0, done[0]
+                yield 2, done[2]
+                raise KeyboardInterrupt
+
+        monkeypatch.setattr(run, "get_provider", lambda cfg: SlowProvider({}))
+        monkeypatch.setattr(run, "Pipeline", Interrupted)
+
+        with pytest.raises(KeyboardInterrupt):
+            run.cmd_eval(_eval_args(eval_env, ids=["P01", "P02", "P03"]))
+
+        assert list(run.load_model_results("test-model")["runs"]) == ["P01"]
+
+
+class TestCmdEvalPipeline:
+    def test_judging_overlaps_generation(self, eval_env, monkeypatch):
+        """Prompt i+1 generates while prompt i is still being judged."""
+        import threading
+        import time
+        import run
+        events = []
+        lock = threading.Lock()
+
+        class Timed:
+            def __init__(self, kind, reply):
+                self.kind, self.reply = kind, reply
+
+            def complete(self, prompt, params):
+                with lock:
+                    events.append((self.kind, "start", time.monotonic()))
+                time.sleep(0.03)
+                with lock:
+                    events.append((self.kind, "end", time.monotonic()))
+                return self.reply, {}
+
+        providers = {"gpt-test": Timed("gen", "answer"),
+                     "gpt-judge": Timed("judge", '{"score": 4, "rationale": "ok"}')}
+        monkeypatch.setattr(run, "get_provider", lambda cfg: providers[cfg["model"]])
+        config = open(eval_env).read().replace(
+            "judges: []",
+            "  judge-model: {provider: openai, model: gpt-judge, api_key_env: none}\n"
+            "judges: [{model: judge-model}]",
+        )
+        open(eval_env, "w").write(config)
+
+        run.cmd_eval(_eval_args(eval_env))
+
+        data = run.load_model_results("test-model")
+        assert list(data["runs"]) == [f"P{i:02d}" for i in range(1, 7)]
+        assert all(r[-1]["judge_score_avg"] == 4 for r in data["runs"].values())
+        # Some generation started before an earlier judge call finished
+        judge_ends = [t for k, e, t in events if k == "judge" and e == "end"]
+        gen_starts = [t for k, e, t in events if k == "gen" and e == "start"]
+        assert any(g < judge_ends[0] for g in gen_starts[1:])
+
+
+@pytest.fixture
+def sweep_env(tmp_path, tmp_results_dir, monkeypatch):
+    """Three models on two endpoints, one of them also the judge."""
+    import run
+    prompts = [
+        {"id": f"P{i:02d}", "category": "reasoning", "subcategory": "s", "difficulty": "easy",
+         "prompt": f"prompt {i}", "ideal": "i", "criteria": [], "check_type": "reasoning"}
+        for i in range(1, 5)
+    ]
+    eval_file = tmp_path / "eval.json"
+    eval_file.write_text(json.dumps({"prompts": prompts}))
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        "models:\n"
+        "  alpha-1: {provider: openai, model: a1, api_key_env: KEY_A}\n"
+        "  alpha-2: {provider: openai, model: a2, api_key_env: KEY_A}\n"
+        "  beta: {provider: openai, model: b, api_key_env: KEY_B}\n"
+        "judges: [{model: beta}]\n"
+        f"eval: {{eval_file: '{eval_file}', delay_between_calls: 0}}\n"
+        "rate_limits: {KEY_A: {concurrency: 1}}\n"
+    )
+    dashboards = []
+    monkeypatch.setattr(run, "generate_dashboard", lambda *a, **k: dashboards.append(1))
+    return str(config_file), dashboards
+
+
+def _sweep_args(config, models, **kw):
+    defaults = dict(config=config, models=models, ids=None, category=None, difficulty=None,
+                    benchmark=None, rerun=False, concurrency=4)
+    defaults.update(kw)
+    return argparse.Namespace(**defaults)
+
+
+class TestCmdSweep:
+    def _providers(self, monkeypatch):
+        import run
+        from tests.conftest import MockProvider
+        built = {}
+        # Both alpha models share one instance, so in-flight counts span the endpoint
+        alpha = SlowProvider({f"prompt {i}": 0.02 for i in range(1, 5)})
+
+        def get_provider(cfg):
+            if cfg["model"] == "b":
+                prov = MockProvider(response='{"score": 4, "rationale": "ok"}')
+            else:
+                prov = alpha
+            built.setdefault(cfg["model"], []).append(prov)
+            return prov
+        monkeypatch.setattr(run, "get_provider", get_provider)
+        return built
+
+    def test_resolve_models_globs(self):
+        import run
+        cfg = {"alpha-1": {}, "beta": {}, "alpha-2": {}}
+        assert run.resolve_models(["alpha-*"], cfg) == ["alpha-1", "alpha-2"]
+        assert run.resolve_models(["beta", "alpha-2"], cfg) == ["beta", "alpha-2"]
+
+    def test_sweeps_all_matches_with_shared_judge(self, sweep_env, monkeypatch):
+        import run
+        config, dashboards = sweep_env
+        built = self._providers(monkeypatch)
+
+        run.cmd_sweep(_sweep_args(config, ["alpha-*", "beta"]))
+
+        for name in ("alpha-1", "alpha-2", "beta"):
+            data = run.load_model_results(name)
+            assert list(data["runs"]) == ["P01", "P02", "P03", "P04"]
+        assert run.load_model_results("alpha-1")["runs"]["P02"][-1]["content"] == "answer to prompt 2"
+        assert run.load_model_results("alpha-1")["runs"]["P01"][-1]["judge_count"] == 1
+        # beta cannot judge itself
+        assert run.load_model_results("beta")["runs"]["P01"][-1]["judge_scores"] == {}
+        # One judge provider for the whole sweep (plus beta as a candidate), one dashboard build
+        assert len(built["b"]) == 2
+        assert dashboards == [1]
+
+    def test_endpoint_cap_is_shared_across_models(self, sweep_env, monkeypatch):
+        import run
+        config, _ = sweep_env
+        built = self._providers(monkeypatch)
+
+        run.cmd_sweep(_sweep_args(config, ["alpha-1", "alpha-2"]))
+
+        # KEY_A allows one request in flight across both alpha models
+        assert built["a1"][0].max_in_flight == 1
+
+    def test_skips_prompts_already_run(self, sweep_env, monkeypatch):
+        import run
+        config, _ = sweep_env
+        self._providers(monkeypatch)
+        run.cmd_sweep(_sweep_args(config, ["alpha-1"], ids=["P01"]))
+        run.cmd_sweep(_sweep_args(config, ["alpha-1"]))
+        assert all(len(runs) == 1 for runs in run.load_model_results("alpha-1")["runs"].values())
+
+
+class TestRunsPerPrompt:
+    def test_samples_stored_as_sibling_runs(self, eval_env, monkeypatch):
+        import run
+        from tests.conftest import MockProvider
+        provider = MockProvider(response="sample")
+        monkeypatch.setattr(run, "get_provider", lambda cfg: provider)
+
+        run.cmd_eval(_eval_args(eval_env, ids=["P01", "P02"], runs=3))
+
+        data = run.load_model_results("test-model")
+        assert [len(data["runs"][pid]) for pid in ("P01", "P02")] == [3, 3]
+        assert [e["sample"] for e in data["runs"]["P01"]] == [0, 1, 2]
+        assert all(e["samples"] == 3 and e["auto_checks"] for e in data["runs"]["P01"])
+        assert len(provider.calls) == 6
+
+    def test_config_default_and_single_run_unchanged(self, eval_env, monkeypatch):
+        import run
+        from tests.conftest import MockProvider
+        monkeypatch.setattr(run, "get_provider", lambda cfg: MockProvider(response="one"))
+        run.cmd_eval(_eval_args(eval_env, ids=["P01"]))
+        assert "sample" not in run.load_model_results("test-model")["runs"]["P01"][0]
+        assert run.runs_per_prompt({"eval": {"runs_per_prompt": 4}}, argparse.Namespace()) == 4
+        assert run.runs_per_prompt({"eval": {"runs_per_prompt": 4}}, argparse.Namespace(runs=2)) == 2
+
+    def test_failed_request_marks_every_sample(self, eval_env, monkeypatch):
+        import run
+        from tests.conftest import MockProvider
+        monkeypatch.setattr(run, "get_provider", lambda cfg: MockProvider(error=ValueError("bad")))
+        run.cmd_eval(_eval_args(eval_env, ids=["P01"], runs=2))
+        runs = run.load_model_results("test-model")["runs"]["P01"]
+        assert len(runs) == 2 and all(e["error"] for e in runs)
+
+
+class TestStreamTimings:
+    def test_timings_recorded_on_run_entry(self, eval_env, monkeypatch):
+        import run
+        from tests.conftest import MockProvider
+        seen = []
+        usage = {"input_tokens": 3, "output_tokens": 9, "ttft_s": 0.25, "itl_s": 0.01, "tokens_per_s": 80.0}
+        monkeypatch.setattr(run, "get_provider", lambda cfg: seen.append(cfg) or MockProvider(usage=usage))
+
+        run.cmd_eval(_eval_args(eval_env, ids=["P01"], stream=True))
+
+        entry = run.load_model_results("test-model")["runs"]["P01"][-1]
+        assert (entry["ttft_s"], entry["itl_s"], entry["tokens_per_s"]) == (0.25, 0.01, 80.0)
+        assert seen[0]["stream"] is True
+
+    def test_model_stream_key_wins_over_eval_stream(self):
+        import run
+        from unittest.mock import patch
+        with patch.object(run, "get_provider") as gp:
+            run.build_provider({"provider": "openai", "model": "m", "stream": False},
+                               {"eval": {"stream": True, "delay_between_calls": 0}})
+        assert gp.call_args[0][0]["stream"] is False
+
+
+def _batch_providers(server):
+    """get_provider stand-in: real Anthropic/OpenAI providers talking to a BatchServer."""
+    from scripts.providers import AnthropicProvider, OpenAIProvider
+
+    def make(cfg):
+        if cfg["provider"] == "anthropic":
+            p = AnthropicProvider(cfg["model"], "k")
+            p.client = server.client("https://api.anthropic.com")
+        else:
+            p = OpenAIProvider(cfg["model"], "k")
+            p.client = server.client("https://api.openai.com/v1")
+        return p
+    return make
+
+
+def _batch_config(config_file):
+    config = open(config_file).read().replace(
+        "  test-model: {provider: openai, model: gpt-test, api_key_env: none}\n",
+        "  test-model: {provider: anthropic, model: claude-test, api_key_env: none}\n"
+        "  judge-model: {provider: openai, model: gpt-judge, api_key_env: none}\n",
+    ).replace("judges: []", "judges: [{model: judge-model}]")
+    open(config_file, "w").write(config + "batch: {poll_interval_s: 0}\n")
+
+
+class TestCmdEvalBatch:
+    @staticmethod
+    def _reply(prompt):
+        return '{"score": 4, "rationale": "ok"}' if "ORIGINAL PROMPT" in prompt else f"answer to {prompt}"
+
+    def test_generation_and_judging_batched(self, eval_env, monkeypatch):
+        import run
+        from tests.conftest import BatchServer
+        server = BatchServer(reply=self._reply, fail={"prompt 2"})
+        monkeypatch.setattr(run, "get_provider", _batch_providers(server))
+        _batch_config(eval_env)
+
+        run.cmd_eval(_eval_args(eval_env, ids=["P01", "P02", "P03"], batch=True))
+
+        data = run.load_model_results("test-model")
+        assert list(data["runs"]) == ["P01", "P02", "P03"]
+        entry = data["runs"]["P01"][-1]
+        assert entry["content"] == "answer to prompt 1" and entry["batch_id"] == "msgbatch_0"
+        assert (entry["input_tokens"], entry["output_tokens"]) == (5, 7)
+        assert entry["auto_checks"] is not None
+        assert entry["judge_scores"]["judge-model"]["score"] == 4 and entry["judge_score_avg"] == 4
+        failed = data["runs"]["P02"][-1]
+        assert failed["auto_checks"]["flags"] == ["API_ERROR"] and "prompt rejected" in failed["error"]
+        # One generation job, one judge job (failed generations aren't judged), no live calls
+        assert sorted(server.batches) == ["batch_1", "msgbatch_0"]
+        assert len(server.batches["batch_1"]["requests"]) == 2
+        assert not any(path.endswith(("/messages", "/chat/completions")) for _, path in server.log)
+
+    def test_check_crash_recorded_and_rest_judged(self, eval_env, monkeypatch):
+        import run
+        from tests.conftest import BatchServer
+        server = BatchServer(reply=self._reply)
+        monkeypatch.setattr(run, "get_provider", _batch_providers(server))
+        _batch_config(eval_env)
+        check_response = run.check_response
+
+        def flaky_check(pmeta, content):
+            if pmeta["id"] == "P02":
+                raise ValueError("boom")
+            return check_response(pmeta, content)
+        monkeypatch.setattr(run, "check_response", flaky_check)
+
+        run.cmd_eval(_eval_args(eval_env, ids=["P01", "P02", "P03"], batch=True))
+
+        runs = run.load_model_results("test-model")["runs"]
+        crashed = runs["P02"][-1]
+        assert crashed["auto_checks"]["flags"] == ["API_ERROR"] and "auto-check failed: boom" in crashed["error"]
+        assert runs["P03"][-1]["judge_scores"]["judge-model"]["score"] == 4
+        assert len(server.batches["batch_1"]["requests"]) == 2
+
+    def test_provider_without_batch_api(self, eval_env, monkeypatch):
+        import run
+        from tests.conftest import MockProvider
+        monkeypatch.setattr(run, "get_provider", lambda cfg: MockProvider())
+        with pytest.raises(SystemExit):
+            run.cmd_eval(_eval_args(eval_env, ids=["P01"], batch=True))
+        assert run.load_model_results("test-model")["runs"] == {}
+
+
+class TestCmdRejudgeBatch:
+    def test_pending_pairs_across_models_in_one_job(self, eval_env, monkeypatch):
+        import run
+        from tests.conftest import BatchServer
+        server = BatchServer(reply=lambda prompt: '{"score": 3, "rationale": "ok"}')
+        monkeypatch.setattr(run, "get_provider", _batch_providers(server))
+        _batch_config(eval_env)
+        done = {"score": 5, "rationale": "x", "judged_at": "t"}
+        for name, scores in (("m1", {}), ("m2", {}), ("m3", {"judge-model": done})):
+            run.save_model_results(name, {"model_name": name, "runs": {"P01": [{
+                "timestamp": "t", "content": f"{name} answer", "auto_checks": {"flags": []},
+                "judge_scores": dict(scores)}]}})
+
+        run.cmd_rejudge(argparse.Namespace(config=eval_env, models=["m1", "m2", "m3"], judge=None,
+                                           force=False, benchmark=None, batch=True))
+
+        assert list(server.batches) == ["batch_0"]
+        assert len(server.batches["batch_0"]["requests"]) == 2
+        for name, score in (("m1", 3), ("m2", 3), ("m3", 5)):
+            latest = run.load_model_results(name)["runs"]["P01"][-1]
+            assert latest["judge_scores"]["judge-model"]["score"] == score
+        assert run.load_model_results("m1")["runs"]["P01"][-1]["judge_score_avg"] == 3
+
+
+class TestCmdLoadtest:
+    def test_curve_stored_with_results(self, eval_env, monkeypatch):
+        import run
+        from tests.conftest import MockProvider
+        provider = MockProvider(response="ok")
+        monkeypatch.setattr(run, "get_provider", lambda cfg: provider)
+        args = argparse.Namespace(config=eval_env, model="test-model", levels=[1, 2], requests=4,
+                                  ids=None, category=None, difficulty=None, benchmark=None, stream=False)
+
+        run.cmd_loadtest(args)
+        run.cmd_loadtest(args)
+
+        data = run.load_model_results("test-model")
+        assert len(data["loadtests"]) == 2
+        curve = data["loadtests"][-1]
+        assert [lvl["concurrency"] for lvl in curve["levels"]] == [1, 2]
+        assert curve["api_model"] == "gpt-test" and curve["streamed"] is False
+        # Straight to the endpoint: 4 + 4 requests per run, none cached or retried
+        assert len(provider.calls) == 16
+        assert data["runs"] == {}
+
+    def test_saved_under_model_lock(self, eval_env, monkeypatch):
+        import run
+        from scripts import journal
+        from tests.conftest import MockProvider
+        monkeypatch.setattr(run, "get_provider", lambda cfg: MockProvider(response="ok"))
+        held = []
+        save = run.save_model_results
+        monkeypatch.setattr(run, "save_model_results", lambda name, data: held.append(
+            run.model_path(name) in getattr(journal._held, "paths", ())) or save(name, data))
+
+        run.cmd_loadtest(argparse.Namespace(config=eval_env, model="test-model", levels=[1], requests=1,
+                                            ids=None, category=None, difficulty=None, benchmark=None,
+                                            stream=False))
+
+        assert held == [True]
+
+
+class TestDashboardRefresh:
+    def _run(self, eval_env, monkeypatch, **kw):
+        import run
+        from tests.conftest import MockProvider
+        calls = {"built": 0, "notified": []}
+        monkeypatch.setattr(run, "get_provider", lambda cfg: MockProvider(response="ok"))
+        monkeypatch.setattr(run, "generate_dashboard", lambda *a, **k: calls.__setitem__("built", calls["built"] + 1))
+        monkeypatch.setattr(run.builder, "notify", lambda debounce, build=None: calls["notified"].append(debounce) or "queued")
+        run.cmd_eval(_eval_args(eval_env, ids=["P01"], **kw))
+        return calls
+
+    def test_sync_by_default(self, eval_env, monkeypatch):
+        assert self._run(eval_env, monkeypatch) == {"built": 1, "notified": []}
+
+    def test_no_dashboard(self, eval_env, monkeypatch):
+        assert self._run(eval_env, monkeypatch, no_dashboard=True) == {"built": 0, "notified": []}
+
+    def test_deferred_queues_rebuild(self, eval_env, monkeypatch):
+        calls = self._run(eval_env, monkeypatch, defer_dashboard=True)
+        assert calls == {"built": 0, "notified": [30]}
+
+
+class TestCmdEvalCache:
+    def test_rerun_replays_from_cache(self, eval_env, tmp_path, monkeypatch):
+        import run
+        from tests.conftest import MockProvider
+        provider = MockProvider(response="deterministic")
+        monkeypatch.setattr(run, "get_provider", lambda cfg: provider)
+        config = open(eval_env).read().replace(
+            "test-model: {provider: openai, model: gpt-test, api_key_env: none}",
+            "test-model: {provider: openai, model: gpt-test, api_key_env: none, params: {temperature: 0}}",
+        ) + f"cache: {{path: '{tmp_path / 'c.sqlite'}'}}\n"
+        open(eval_env, "w").write(config)
+
+        run.cmd_eval(_eval_args(eval_env, cache=True))
+        run.cmd_eval(_eval_args(eval_env, cache=True, rerun=True))
+
+        assert len(provider.calls) == 6
+        runs = run.load_model_results("test-model")["runs"]["P01"]
+        assert len(runs) == 2
+        assert "cached" not in runs[0] and runs[1]["cached"] is True
+        assert runs[1]["content"] == "deterministic"
+
+
+class TestRejudgeVerdictCache:
+    def test_force_rejudge_skips_unchanged_pairs(self, tmp_path, tmp_results_dir, monkeypatch):
+        import run
+        from tests.conftest import MockProvider
+        eval_file = tmp_path / "eval.json"
+        eval_file.write_text(json.dumps({"prompts": [
+            {"id": "P01", "category": "c", "subcategory": "s", "difficulty": "easy",
+             "prompt": "q", "ideal": "i", "criteria": []}]}))
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(
+            "models:\n  judge-a: {provider: openai, model: gpt-judge, api_key_env: none}\n"
+            "judges: [{model: judge-a}]\n"
+            f"eval: {{eval_file: '{eval_file}', delay_between_calls: 0}}\n"
+            f"cache: {{path: '{tmp_path / 'r.sqlite'}', verdict_path: '{tmp_path / 'v.sqlite'}'}}\n"
+        )
+        run.save_model_results("m", {"model_name": "m", "runs": {"P01": [{
+            "timestamp": "t", "content": "answer", "auto_checks": {"flags": []}, "judge_scores": {}}]}})
+        judge = MockProvider(response='{"score": 3, "rationale": "ok"}')
+        monkeypatch.setattr(run, "get_provider", lambda cfg: judge)
+        monkeypatch.setattr(run, "generate_dashboard", lambda *a, **k: None)
+        args = argparse.Namespace(config=str(config_file), models=["m"], judge=None, force=True,
+                                  cache=True, benchmark=None)
+
+        run.cmd_rejudge(args)
+        run.cmd_rejudge(args)
+
+        assert len(judge.calls) == 1
+        latest = run.load_model_results("m")["runs"]["P01"][-1]
+        assert latest["judge_scores"]["judge-a"]["score"] == 3
+        assert latest["judge_scores"]["judge-a"]["cached"] is True
+
+
+class TestRunJournal:
+    def test_eval_checkpoints_by_append_and_compacts_once(self, eval_env, monkeypatch):
+        import run
+        from scripts import journal
+        from tests.conftest import MockProvider
+        monkeypatch.setattr(run, "get_provider", lambda cfg: MockProvider())
+        appends, snapshots = [], []
+        real_append, real_write = journal.append_run, journal.write_snapshot
+        monkeypatch.setattr(journal, "append_run", lambda *a: appends.append(a[1]) or real_append(*a))
+        monkeypatch.setattr(journal, "write_snapshot", lambda *a: snapshots.append(a[0]) or real_write(*a))
+
+        run.cmd_eval(_eval_args(eval_env))
+
+        assert appends == [f"P{i:02d}" for i in range(1, 7)]
+        assert len(snapshots) == 1
+        path = run.model_path("test-model")
+        assert not os.path.exists(journal.journal_path(path))
+        with open(path) as f:
+            assert len(json.load(f)["runs"]) == 6
+
+    def test_journal_only_model_is_listed_and_loaded(self, tmp_results_dir):
+        import run
+        from scripts import journal
+        journal.append_run(run.model_path("fresh"), "P01", {"content": "a"})
+        assert run.list_evaluated_models() == ["fresh"]
+        data = run.load_model_results("fresh")
+        assert data["model_name"] == "fresh"
+        assert data["runs"]["P01"] == [{"content": "a"}]
+
+
+class TestSQLiteBackend:
+    @pytest.fixture
+    def sqlite_env(self, eval_env, tmp_path, monkeypatch):
+        import run
+        monkeypatch.setattr(run, "RESULTS_STORE", None)
+        with open(eval_env, "a") as f:
+            f.write(f"results: {{backend: sqlite, path: '{tmp_path / 'results.sqlite'}'}}\n")
+        return eval_env
+
+    def test_eval_writes_to_store_not_files(self, sqlite_env, tmp_results_dir, monkeypatch):
+        import run
+        from tests.conftest import MockProvider
+        monkeypatch.setattr(run, "get_provider", lambda cfg: MockProvider())
+
+        run.cmd_eval(_eval_args(sqlite_env))
+
+        assert run.RESULTS_STORE is not None
+        assert list(tmp_results_dir.glob("*.json*")) == []
+        assert run.list_evaluated_models() == ["test-model"]
+        assert len(run.load_model_results("test-model")["runs"]) == 6
+
+    def test_db_import_export(self, sqlite_env, tmp_results_dir, sample_model_data):
+        import run
+        run.save_model_results("test-model", sample_model_data)
+        original = run.load_model_results("test-model")
+
+        run.cmd_db(argparse.Namespace(config=sqlite_env, action="import", models=[], path=None))
+        assert run.RESULTS_STORE.load_model("test-model") == original
+
+        (tmp_results_dir / "test-model.json").unlink()
+        run.cmd_db(argparse.Namespace(config=sqlite_env, action="export", models=[], path=None))
+        with open(tmp_results_dir / "test-model.json") as f:
+            assert json.load(f) == original
+
+    def test_rejudge_picks_targets_from_index(self, sqlite_env, monkeypatch):
+        import run
+        from tests.conftest import MockProvider
+        _batch_config(sqlite_env)
+        run.load_config(sqlite_env)
+        done = {"score": 5, "rationale": "x", "judged_at": "t"}
+        for name, scores in (("m1", {}), ("m2", {"judge-model": done})):
+            run.save_model_results(name, {"model_name": name, "runs": {"P01": [{
+                "timestamp": "t", "content": f"{name} answer", "auto_checks": {"flags": []},
+                "judge_scores": dict(scores)}]}})
+        judge = MockProvider(response='{"score": 3, "rationale": "ok"}')
+        monkeypatch.setattr(run, "get_provider", lambda cfg: judge)
+        monkeypatch.setattr(run, "generate_dashboard", lambda *a, **k: None)
+        full_loads = []
+        load_model = run.RESULTS_STORE.load_model
+        monkeypatch.setattr(run.RESULTS_STORE, "load_model", lambda m: full_loads.append(m) or load_model(m))
+
+        run.cmd_rejudge(argparse.Namespace(config=sqlite_env, models=["m1", "m2"], judge=None,
+                                           force=False, benchmark=None))
+
+        assert len(judge.calls) == 1
+        # Only m1 had a score missing; only the merge-save read its full document
+        assert full_loads == ["m1"]
+        assert run.load_model_results("m1")["runs"]["P01"][-1]["judge_scores"]["judge-model"]["score"] == 3
+        assert run.load_model_results("m2")["runs"]["P01"][-1]["judge_scores"]["judge-model"]["score"] == 5
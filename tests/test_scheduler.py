@@ -0,0 +1,70 @@
+"""Tests for scripts/scheduler.py - per-endpoint caps and round-robin hand-out."""
+
+import threading
+import time
+
+from scripts.scheduler import Scheduler
+
+
+class TestScheduler:
+    def test_round_robin_across_keys(self):
+        sched = Scheduler(default_cap=10)
+        for i in range(3):
+            sched.add("a", f"a{i}")
+        sched.add("b", "b0")
+        assert list(sched.jobs()) == ["a0", "b0", "a1", "a2"]
+
+    def test_empty(self):
+        assert list(Scheduler().jobs()) == []
+
+    def test_capacity_sums_caps_of_queued_keys(self):
+        sched = Scheduler({"a": 3}, default_cap=2)
+        sched.add("a", 1)
+        sched.add("b", 2)
+        assert sched.capacity == 5
+        assert sched.pending() == 2
+
+    def test_capped_key_waits_for_release_while_others_proceed(self):
+        sched = Scheduler({"slow": 1, "fast": 5})
+        sched.add("slow", "s0")
+        sched.add("slow", "s1")
+        for i in range(3):
+            sched.add("fast", f"f{i}")
+        handed = []
+
+        def feed():
+            for job in sched.jobs():
+                handed.append(job)
+
+        t = threading.Thread(target=feed, daemon=True)
+        t.start()
+        time.sleep(0.05)
+        # s1 is held back until s0's slot comes free; fast jobs are not
+        assert handed == ["s0", "f0", "f1", "f2"]
+        sched.release("slow")
+        t.join(1)
+        assert handed[-1] == "s1" and not t.is_alive()
+
+    def test_in_flight_never_exceeds_cap(self):
+        sched = Scheduler({"a": 2})
+        for i in range(8):
+            sched.add("a", i)
+        lock = threading.Lock()
+        state = {"now": 0, "max": 0}
+
+        def work():
+            with lock:
+                state["now"] += 1
+                state["max"] = max(state["max"], state["now"])
+            time.sleep(0.01)
+            with lock:
+                state["now"] -= 1
+            sched.release("a")
+
+        threads = []
+        for _ in sched.jobs():
+            threads.append(threading.Thread(target=work))
+            threads[-1].start()
+        for t in threads:
+            t.join()
+        assert state["max"] == 2
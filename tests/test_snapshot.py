@@ -0,0 +1,91 @@
+"""Tests for scripts/snapshot.py - columnar latest-run snapshot."""
+
+import numpy as np
+import pytest
+from scripts.snapshot import LatestRuns, flag_code, masked_mean
+
+
+def _run(score=None, de=None, error=None, flags=None, latency=1.0, tokens=30):
+    run = {
+        "latency_s": latency,
+        "output_tokens": tokens,
+        "auto_checks": {"flags": flags or []},
+        "judge_scores": {j: {"score": s} for j, s in (score or {}).items()},
+        "judge_score_avg": sum(score.values()) / len(score) if score else None,
+    }
+    if de:
+        run["deepeval_scores"] = de
+        run["deepeval_avg"] = sum(de.values()) / len(de)
+    if error:
+        run["error"] = error
+    return run
+
+
+@pytest.fixture
+def snap():
+    models = {
+        "a": {"runs": {
+            "P1": [_run({"j1": 1}), _run({"j1": 4, "j2": 5}, de={"correctness": 0.8})],
+            "P2": [_run(error="boom", flags=["API_ERROR"])],
+        }},
+        "b": {"runs": {
+            "P1": [_run({"j2": 3}, flags=["FAIL_TOO_LONG: 40 words (max: 30)", "VERY_SHORT_RESPONSE"])],
+        }},
+    }
+    return LatestRuns(models, ["P1", "P2", "P3"])
+
+
+class TestLatestRuns:
+    def test_shapes_and_order(self, snap):
+        assert snap.models == ["a", "b"]
+        assert snap.judges == ["j1", "j2"]
+        assert snap.present.shape == (2, 3)
+        assert snap.judge.shape == (2, 3, 2)
+        assert snap.deepeval.shape == (2, 3, 1)
+
+    def test_uses_latest_run_only(self, snap):
+        assert snap.judge[0, 0].tolist() == [4, 5]
+        assert snap.judge_score_avg[0, 0] == 4.5
+
+    def test_masks(self, snap):
+        assert snap.present.tolist() == [[True, True, False], [True, False, False]]
+        assert snap.ok.tolist() == [[True, False, False], [True, False, False]]
+        assert snap.flagged.tolist() == [[False, True, False], [True, False, False]]
+
+    def test_cache_hits_and_batch_replies_have_no_latency(self):
+        hit = {**_run(latency=0.01), "cached": True}
+        batched = {**_run(latency=0.0), "batch_id": "msgbatch_1"}
+        snap = LatestRuns({"a": {"runs": {"P1": [_run(latency=2.0)], "P2": [hit], "P3": [batched]}}},
+                          ["P1", "P2", "P3"])
+        assert snap.latency[0, 0] == 2.0 and np.isnan(snap.latency[0, 1:]).all()
+        assert masked_mean(snap.latency, snap.present, axis=1).tolist() == [2.0]
+
+    def test_missing_values_are_nan(self, snap):
+        assert np.isnan(snap.judge[1, 0, 0])
+        assert np.isnan(snap.deepeval_avg[1, 0])
+        assert np.isnan(snap.metric("coherence")).all()
+        assert snap.metric("correctness")[0, 0] == 0.8
+
+    def test_flag_bitmask_by_code(self, snap):
+        assert snap.flag_codes == ["API_ERROR", "FAIL_TOO_LONG", "VERY_SHORT_RESPONSE"]
+        assert int(snap.flags[1, 0]) == 0b110
+        # Full flag text is still on the raw entry
+        assert snap.run(1, 0)["auto_checks"]["flags"][0].startswith("FAIL_TOO_LONG: 40")
+
+    def test_empty(self):
+        snap = LatestRuns({}, ["P1"])
+        assert snap.present.shape == (0, 1)
+        assert snap.judges == []
+
+
+class TestHelpers:
+    def test_flag_code(self):
+        assert flag_code("WRONG_ANSWER: got B, expected C") == "WRONG_ANSWER"
+        assert flag_code("EMPTY_RESPONSE") == "EMPTY_RESPONSE"
+
+    def test_masked_mean(self):
+        values = np.array([[1.0, np.nan, 3.0], [np.nan, np.nan, 2.0]])
+        mask = np.array([[True, True, True], [True, True, False]])
+        means = masked_mean(values, mask, axis=1)
+        assert means[0] == 2.0
+        assert np.isnan(means[1])
@@ -0,0 +1,120 @@
+"""Tests for scripts/store.py - SQLite results backend, indexed queries, JSON import/export."""
+
+import json
+import pytest
+from scripts.store import ResultsStore, export_json, import_json
+
+
+def _run(ts, judges=None, error=None, deepeval=None):
+    run = {"timestamp": ts, "content": f"answer {ts}", "latency_s": 1.0,
+           "judge_scores": {j: {"score": s, "rationale": "r", "judged_at": ts} for j, s in (judges or {}).items()}}
+    scores = [s for s in (judges or {}).values() if s is not None]
+    run["judge_score_avg"] = sum(scores) / len(scores) if scores else None
+    if error:
+        run["error"] = error
+    if deepeval:
+        run["deepeval_scores"] = deepeval
+    return run
+
+
+@pytest.fixture
+def doc():
+    return {
+        "model_name": "m",
+        "created": "2026-01-01",
+        "updated": "2026-01-02",
+        "runs": {
+            "P01": [_run("t1", {"j1": 3}), _run("t2", {"j1": 4, "j2": 5}, deepeval={"correctness": 0.8})],
+            "P02": [_run("t3", {"j2": None})],
+            "P03": [_run("t4", error="boom")],
+        },
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ResultsStore(str(tmp_path / "results.sqlite"))
+    yield s
+    s.close()
+
+
+class TestResultsStore:
+    def test_roundtrip_is_lossless(self, store, doc):
+        store.save_model("m", doc)
+        assert store.load_model("m") == doc
+        assert list(store.load_model("m")["runs"]) == ["P01", "P02", "P03"]
+
+    def test_unknown_model(self, store):
+        assert store.load_model("nope") is None
+        assert store.load_latest("nope") is None
+
+    def test_save_replaces_history(self, store, doc):
+        store.save_model("m", doc)
+        doc["runs"] = {"P09": [_run("t9")]}
+        store.save_model("m", doc)
+        assert list(store.load_model("m")["runs"]) == ["P09"]
+        assert store.missing_judge_scores("j1") == [("m", "P09")]
+
+    def test_load_latest(self, store, doc):
+        store.save_model("m", doc)
+        latest = store.load_latest("m")
+        assert latest["updated"] == "2026-01-02"
+        assert {pid: [r["timestamp"] for r in runs] for pid, runs in latest["runs"].items()} == {
+            "P01": ["t2"], "P02": ["t3"], "P03": ["t4"]}
+
+    def test_append_runs(self, store, doc):
+        store.save_model("m", doc)
+        store.append_runs("m", [("P02", _run("t5", {"j1": 2})), ("P04", _run("t6"))])
+        data = store.load_model("m")
+        assert [r["timestamp"] for r in data["runs"]["P02"]] == ["t3", "t5"]
+        assert data["runs"]["P04"][0]["timestamp"] == "t6"
+        assert data["created"] == "2026-01-01" and data["updated"] != "2026-01-02"
+
+    def test_append_creates_model(self, store):
+        store.append_runs("new", [("P01", _run("t1"))])
+        assert store.list_models() == ["new"]
+        assert store.load_model("new")["model_name"] == "new"
+
+    def test_fingerprint_changes_on_write(self, store, doc):
+        assert store.fingerprint("m") == [None]
+        store.save_model("m", doc)
+        first = store.fingerprint("m")
+        store.append_runs("m", [("P01", _run("t9"))])
+        assert store.fingerprint("m") != first
+
+    def test_model_counts_use_latest_runs(self, store, doc):
+        store.save_model("m", doc)
+        [counts] = store.model_counts()
+        assert counts == {"name": "m", "prompts": 3, "judged": 1, "de_scored": 1, "updated": "2026-01-02"}
+
+    def test_missing_judge_scores(self, store, doc):
+        store.save_model("m", doc)
+        # P01's latest run has j1; P02 has no j1; failed j2 score counts as missing; errors are skipped
+        assert store.missing_judge_scores("j1") == [("m", "P02")]
+        assert store.missing_judge_scores("j2") == [("m", "P02")]
+        assert store.missing_judge_scores("j3", models=["m"]) == [("m", "P01"), ("m", "P02")]
+
+
+class TestImportExport:
+    def test_json_roundtrip(self, tmp_path, store, doc):
+        src, dst = tmp_path / "src", tmp_path / "dst"
+        src.mkdir()
+        (src / "m.json").write_text(json.dumps(doc))
+        (src / "comparison.json").write_text("{}")
+        (src / "m.pre-v2.json").write_text("{}")
+        assert import_json(store, str(src)) == ["m"]
+        assert export_json(store, str(dst)) == ["m"]
+        assert json.loads((dst / "m.json").read_text()) == doc
+
+    def test_import_replays_journal(self, tmp_path, store, doc):
+        from scripts import journal
+        (tmp_path / "m.json").write_text(json.dumps(doc))
+        journal.append_run(str(tmp_path / "m.json"), "P05", _run("t7"))
+        import_json(store, str(tmp_path))
+        assert "P05" in store.load_model("m")["runs"]
+
+    def test_filter_models(self, tmp_path, store, doc):
+        for name in ("a", "b"):
+            (tmp_path / f"{name}.json").write_text(json.dumps({**doc, "model_name": name}))
+        assert import_json(store, str(tmp_path), ["b"]) == ["b"]
+        assert store.list_models() == ["b"]
@@ -0,0 +1,77 @@
+"""Tests for scripts/stream.py - streaming, field-selective results reader."""
+
+import json
+import pytest
+from scripts import journal, stream
+from scripts.stream import Last
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    data = {
+        "model_name": "m",
+        "created": "2026-01-01",
+        "runs": {
+            "P01": [
+                {"content": "old", "latency_s": 1.0, "judge_scores": {"j1": {"score": 2, "rationale": "meh"}}},
+                {"content": "new", "latency_s": 2.5, "judge_scores": {"j1": {"score": 4, "rationale": "good"}},
+                 "auto_checks": {"flags": ["VERY_SHORT_RESPONSE"], "auto_scores": {}}},
+            ],
+            "P02": [{"content": "x", "error": "boom", "latency_s": 0}],
+        },
+        "updated": "2026-01-02",
+    }
+    path = tmp_path / "m.json"
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+RUN_SPEC = {"latency_s": None, "error": None, "auto_checks": None, "judge_scores": {"*": {"score": None}}}
+
+
+class TestRead:
+    def test_keeps_only_selected_fields(self, snapshot):
+        data = stream.load_latest(snapshot, RUN_SPEC)
+        assert data["runs"]["P01"] == [{
+            "latency_s": 2.5,
+            "judge_scores": {"j1": {"score": 4}},
+            "auto_checks": {"flags": ["VERY_SHORT_RESPONSE"], "auto_scores": {}},
+        }]
+        assert data["runs"]["P02"] == [{"error": "boom", "latency_s": 0}]
+
+    def test_metadata_kept_whole(self, snapshot):
+        data = stream.load_latest(snapshot, RUN_SPEC)
+        assert (data["model_name"], data["created"], data["updated"]) == ("m", "2026-01-01", "2026-01-02")
+
+    def test_none_spec_is_full_latest_run(self, snapshot):
+        data = stream.load_latest(snapshot)
+        assert data["runs"]["P01"][0]["content"] == "new"
+        assert data["runs"]["P01"][0]["judge_scores"]["j1"]["rationale"] == "good"
+
+    def test_matches_prune_fallback(self, snapshot, monkeypatch):
+        streamed = stream.load_latest(snapshot, RUN_SPEC)
+        monkeypatch.setattr(stream, "ijson", None)
+        assert stream.load_latest(snapshot, RUN_SPEC) == streamed
+
+    def test_journal_entries_replayed(self, snapshot):
+        journal.append_run(snapshot, "P02", {"content": "retry", "latency_s": 3.0})
+        journal.append_run(snapshot, "P03", {"content": "first", "latency_s": 1.5})
+        data = stream.load_latest(snapshot, RUN_SPEC)
+        assert data["runs"]["P02"] == [{"latency_s": 3.0}]
+        assert data["runs"]["P03"] == [{"latency_s": 1.5}]
+
+    def test_missing_file(self, tmp_path):
+        assert stream.load_latest(str(tmp_path / "none.json")) is None
+
+    def test_corrupt_file_raises_value_error(self, tmp_path):
+        path = tmp_path / "bad.json"
+        path.write_text('{"runs": {"P01": [')
+        with pytest.raises(ValueError):
+            stream.load_latest(str(path))
+
+
+class TestPrune:
+    def test_wildcard_and_last(self):
+        value = {"a": 1, "b": {"x": 1, "y": 2}, "c": [1, 2, 3]}
+        assert stream.prune(value, {"b": {"x": None}, "c": Last()}) == {"b": {"x": 1}, "c": [3]}
+        assert stream.prune(value, {"*": None}) == value